@@ -10,6 +10,8 @@ from .configuration_base import BaseConfig
 
 from .request import Request, UploadedFile
 from .response import Response
+from .sse import ServerSentEvent, Broadcaster
+from .websocket_hub import WebSocketHub, WebSocketConnection
 
 from .utilities import run_sync_or_async, run_in_background
 from .media_types import MediaType
@@ -23,4 +25,5 @@ __all__ = ['PyJolt', 'abort', 'Request', 'Response',
            'HttpStatus', 'html_abort',
            'app', 'app_path', 'on_shutdown',
            'on_startup', 'BaseExtension', 'BaseConfig',
-           'LogLevel', 'MiddlewareBase']
+           'LogLevel', 'MiddlewareBase', 'ServerSentEvent',
+           'Broadcaster', 'WebSocketHub', 'WebSocketConnection']
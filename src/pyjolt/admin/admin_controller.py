@@ -5,7 +5,6 @@ Handles login and static files
 # pylint: disable=W0719,W0212
 from __future__ import annotations
 
-import mimetypes
 import os
 from typing import TYPE_CHECKING, Any, Optional
 
@@ -18,7 +17,6 @@ from ..auth.authentication import login_required
 from ..exceptions.http_exceptions import StaticAssetNotFound
 from ..request import Request
 from ..response import Response
-from ..utilities import get_file, get_range_file
 from .common_controller import CommonAdminController
 from ..caching import Cache
 
@@ -37,8 +35,8 @@ class AdminController(CommonAdminController):
         if not (await self.can_enter(req)):
             return await self.cant_enter_response(req)
         level: str = req.query_params.get("logs", "all")
-        logs: list[dict[str, Any]] = self.app.log_buffer.get_all() if level == "all" else self.app.log_buffer.get_severe()
-        logs.reverse()
+        logs: list[dict[str, Any]] = self.app.log_buffer.query(None, severe=level != "all",
+                                                               newest_first=True)
         caches: Optional[dict[str, Cache]] = self.dashboard.get_cache_interfaces()
         cache_permissions: dict[str, bool] = {}
         if caches is not None:
@@ -103,20 +101,10 @@ class AdminController(CommonAdminController):
         """Serves static assets for the dashboard"""
         file_path = None
         candidate = safe_join(self.dashboard.root_path, "static", filename)
-        if candidate and os.path.exists(candidate):
+        if candidate and os.path.isfile(candidate):
             file_path = candidate
         if not file_path:
             raise StaticAssetNotFound()
 
-        # checks/guesses mimetype
-        guessed, _ = mimetypes.guess_type(file_path)
-        content_type = guessed or "application/octet-stream"
-
-        # Checks range header and returns range if header is present
-        range_header = req.headers.get("range")
-        if not range_header:
-            status, headers, body = await get_file(file_path, content_type=content_type)
-            headers["Accept-Ranges"] = "bytes"
-            return req.res.send_file(body, headers).status(status)
-
-        return await get_range_file(req.res, file_path, range_header, content_type)
+        # mimetype is guessed, Range headers are handled by send_file
+        return req.res.send_file(file_path)
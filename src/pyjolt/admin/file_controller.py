@@ -5,7 +5,7 @@ import os
 import io
 import zipfile
 import uuid
-from typing import Any, Optional
+from typing import Any, Mapping, Optional
 import mimetypes
 from pathlib import Path
 import shutil
@@ -15,7 +15,7 @@ from .common_controller import CommonAdminController
 from ..auth import login_required
 from ..request import Request
 from ..response import Response
-from ..utilities import get_file, fs_safe_join
+from ..utilities import fs_safe_join
 
 class AdminFileController(CommonAdminController):
 
@@ -54,7 +54,7 @@ class AdminFileController(CommonAdminController):
         await self.can_enter(req)
         if not await self.dashboard.has_files_permission(req):
             return await self.missing_files_permission(req)
-        req_items: Optional[dict[str, Any]] = await req.get_data()
+        req_items: Optional[Mapping[str, Any]] = await req.get_data()
         if req_items is None:
             return req.res.json({
                 "message": "Please provide a valid list of files for download",
@@ -114,11 +114,7 @@ class AdminFileController(CommonAdminController):
                 "message": "File does not exist",
                 "status": "danger"
             }).status(HttpStatus.BAD_REQUEST)
-        guessed, _ = mimetypes.guess_type(full_path)
-        content_type = guessed or "application/octet-stream"
-        status, headers, body = await get_file(full_path, content_type=content_type)
-        headers["Accept-Ranges"] = "bytes"
-        return req.res.send_file(body, headers).status(status)
+        return req.res.send_file(full_path)
     
     @get("/files/rename")
     @login_required
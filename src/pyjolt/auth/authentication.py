@@ -223,6 +223,14 @@ class Authentication(MiddlewareBase, ABC):
         #user is authenticated and authorized - calls next middleware in chain
         return await self.next(req)
 
+    def applies_to(self, route_handler: Callable) -> bool:
+        """
+        Handlers without authentication attributes (on the method
+        or the controller) skip the authentication middleware
+        """
+        return (getattr(route_handler, "_authentication", None) is not None
+                or getattr(getattr(route_handler, "__self__", None), "_authentication", None) is not None)
+
     @abstractmethod
     async def user_loader(self, req: "Request") -> Any:
         """
@@ -0,0 +1,47 @@
+"""
+Backplane module.
+Carries websocket hub and SSE broadcaster messages between worker processes.
+"""
+from __future__ import annotations
+
+from typing import Any, TYPE_CHECKING
+
+from .base_backplane import BaseBackplane, MessageHandler, app_namespace
+from .memory_backplane import MemoryBackplane
+from .unix_backplane import UnixSocketBackplane
+from .redis_backplane import RedisBackplane
+
+if TYPE_CHECKING:
+    from ..pyjolt import PyJolt
+
+_BACKPLANES: dict[str, type[BaseBackplane]] = {
+    "memory": MemoryBackplane,
+    "unix": UnixSocketBackplane,
+    "redis": RedisBackplane,
+}
+
+def get_backplane(app: PyJolt, backplane: Any = "memory") -> BaseBackplane:
+    """
+    Resolves the BACKPLANE configuration value. Accepts a backplane name
+    ("memory", "unix" or "redis"), a BaseBackplane subclass (configured
+    from the app configs) or a backplane instance.
+    """
+    if backplane is None:
+        backplane = "memory"
+    if isinstance(backplane, str):
+        backplane_cls = _BACKPLANES.get(backplane)
+        if backplane_cls is None:
+            raise ValueError(f"Unknown BACKPLANE '{backplane}'. Use one of: {', '.join(_BACKPLANES)}")
+        try:
+            return backplane_cls.configure_from_app(app)
+        except ImportError as exc:
+            raise ImportError(f"BACKPLANE '{backplane}' requires the {backplane} package. "
+                              f"Install it with: pip install {backplane}") from exc
+    if isinstance(backplane, type) and issubclass(backplane, BaseBackplane):
+        return backplane.configure_from_app(app)
+    if not isinstance(backplane, BaseBackplane):
+        raise TypeError("BACKPLANE must be a backplane name, a BaseBackplane subclass or instance")
+    return backplane
+
+__all__ = ["BaseBackplane", "MessageHandler", "MemoryBackplane",
+           "UnixSocketBackplane", "RedisBackplane", "get_backplane", "app_namespace"]
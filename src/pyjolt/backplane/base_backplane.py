@@ -0,0 +1,204 @@
+"""
+Base/Blueprint class for backplane implementations.
+A backplane carries broadcast messages (websocket hub, SSE broadcasters)
+between the worker processes of an application. Messages published in one
+event loop tick are delivered to the local subscribers of the channel and
+sent to the other workers as a single frame (one round trip per tick).
+"""
+import asyncio
+import os
+import re
+import struct
+from abc import ABC, abstractmethod
+from typing import Callable, Iterator, Optional, TYPE_CHECKING
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from ..pyjolt import PyJolt
+
+#: receives the payload of a message published to the subscribed channel
+MessageHandler = Callable[[bytes], None]
+
+# frame: origin (16 bytes), number of messages, then per message
+# channel length, payload length, channel (utf-8) and payload
+_FRAME_HEADER = struct.Struct("!16sI")
+_MESSAGE_HEADER = struct.Struct("!HI")
+
+_NAMESPACE_CHARS = re.compile(r"[^a-z0-9_.-]+")
+
+def app_namespace(app: "PyJolt") -> str:
+    """
+    Namespace of the application (APP_NAME as a slug), used for default channels
+    and socket directories so that applications sharing a host or Redis server
+    don't receive each other's messages
+    """
+    return _NAMESPACE_CHARS.sub("-", str(app.app_name or "").lower()).strip("-.") or "pyjolt"
+
+def encode_frame(origin: bytes, messages: list[tuple[str, bytes]]) -> bytes:
+    """Frame of messages ((channel, payload) pairs) published by origin"""
+    parts: list[bytes] = [_FRAME_HEADER.pack(origin, len(messages))]
+    for channel, payload in messages:
+        encoded_channel = channel.encode("utf-8")
+        parts.append(_MESSAGE_HEADER.pack(len(encoded_channel), len(payload)))
+        parts.append(encoded_channel)
+        parts.append(payload)
+    return b"".join(parts)
+
+def decode_frame(frame: bytes) -> tuple[bytes, Iterator[tuple[str, bytes]]]:
+    """Origin and messages ((channel, payload) pairs) of a frame"""
+    origin, count = _FRAME_HEADER.unpack_from(frame)
+
+    def messages() -> Iterator[tuple[str, bytes]]:
+        view = memoryview(frame)
+        offset = _FRAME_HEADER.size
+        for _ in range(count):
+            channel_length, payload_length = _MESSAGE_HEADER.unpack_from(frame, offset)
+            offset += _MESSAGE_HEADER.size
+            channel = str(view[offset:offset + channel_length], "utf-8")
+            offset += channel_length
+            yield channel, bytes(view[offset:offset + payload_length])
+            offset += payload_length
+    return origin, messages()
+
+class BaseBackplane(ABC):
+    """
+    Abstract backplane blueprint.
+
+    publish queues messages, they are delivered to local subscribers (except
+    the publishing handler) and handed to _send_frame as one frame at the end
+    of the event loop tick. Frames from other workers are passed to
+    _receive_frame, which delivers their messages to local subscribers.
+
+    Subclasses should implement:
+    - configure_from_app(cls, app) -> BaseBackplane
+    - connect / disconnect
+    - _send_frame
+    Must be used from the event loop thread.
+    """
+    #: messages of a tick are split into frames of about this many bytes (None: one frame)
+    max_frame_size: Optional[int] = None
+
+    def __init__(self) -> None:
+        #: identifies the frames of this worker (skipped if they come back)
+        self._origin: bytes = os.urandom(16)
+        self._handlers: dict[str, list[MessageHandler]] = {}
+        self._pending: list[tuple[str, bytes, Optional[MessageHandler]]] = []
+        self._flush_scheduled: bool = False
+        self._published: int = 0
+        self._received: int = 0
+        self._frames_sent: int = 0
+        self._frames_received: int = 0
+
+    @classmethod
+    @abstractmethod
+    def configure_from_app(cls, app: "PyJolt") -> "BaseBackplane":
+        """Create a configured backplane instance using app config."""
+
+    @abstractmethod
+    async def connect(self) -> None:
+        """Establish any required connections (no-op for memory)."""
+
+    @abstractmethod
+    async def disconnect(self) -> None:
+        """Tear down connections (no-op for memory)."""
+
+    @abstractmethod
+    def _send_frame(self, frame: bytes) -> None:
+        """Sends a frame to the other workers. Must not block."""
+
+    def subscribe(self, channel: str, handler: MessageHandler) -> None:
+        """Calls handler with the payload of every message published to channel"""
+        self._handlers.setdefault(channel, []).append(handler)
+
+    def unsubscribe(self, channel: str, handler: MessageHandler) -> None:
+        handlers = self._handlers.get(channel)
+        if handlers is None or handler not in handlers:
+            return
+        handlers.remove(handler)
+        if not handlers:
+            del self._handlers[channel]
+
+    def publish(self, channel: str, payload: bytes, *,
+                source: Optional[MessageHandler] = None) -> None:
+        """
+        Publishes the payload to the channel in all workers. Never waits,
+        messages are sent at the end of the event loop tick. The source
+        handler (the publisher, which already delivered the message
+        locally) doesn't receive the message.
+        """
+        self._pending.append((channel, payload, source))
+        self._published += 1
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+
+    def stats(self) -> dict[str, int]:
+        """Published/received messages and sent/received frames of this worker"""
+        return {
+            "published_messages": self._published,
+            "received_messages": self._received,
+            "sent_frames": self._frames_sent,
+            "received_frames": self._frames_received,
+            "pending_messages": len(self._pending),
+        }
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        for channel, payload, source in pending:
+            self._dispatch(channel, payload, source)
+        for messages in self._split(pending):
+            try:
+                self._send_frame(encode_frame(self._origin, messages))
+                self._frames_sent += 1
+            # pylint: disable-next=W0718
+            except Exception as exc:
+                logger.error(f"Backplane {self.__class__.__name__} failed to send {len(messages)} messages: {exc}")
+
+    def _split(self, pending: list[tuple[str, bytes, Optional[MessageHandler]]]
+               ) -> Iterator[list[tuple[str, bytes]]]:
+        max_size = self.max_frame_size
+        if max_size is None:
+            yield [(channel, payload) for channel, payload, _ in pending]
+            return
+        messages: list[tuple[str, bytes]] = []
+        size = _FRAME_HEADER.size
+        for channel, payload, _ in pending:
+            message_size = _MESSAGE_HEADER.size + len(channel) + len(payload)
+            if messages and size + message_size > max_size:
+                yield messages
+                messages = []
+                size = _FRAME_HEADER.size
+            messages.append((channel, payload))
+            size += message_size
+        yield messages
+
+    def _receive_frame(self, frame: bytes) -> None:
+        """Delivers the messages of a frame from another worker to local subscribers"""
+        try:
+            origin, messages = decode_frame(frame)
+            if origin == self._origin:
+                return
+            self._frames_received += 1
+            for channel, payload in messages:
+                self._received += 1
+                self._dispatch(channel, payload, None)
+        except (struct.error, UnicodeDecodeError) as exc:
+            logger.error(f"Backplane {self.__class__.__name__} received an invalid frame: {exc}")
+
+    def _dispatch(self, channel: str, payload: bytes, source: Optional[MessageHandler]) -> None:
+        handlers = self._handlers.get(channel)
+        if not handlers:
+            return
+        # handlers may unsubscribe while messages are delivered
+        for handler in tuple(handlers):
+            if handler == source:
+                continue
+            try:
+                handler(payload)
+            # pylint: disable-next=W0718
+            except Exception as exc:
+                logger.error(f"Backplane handler of channel {channel!r} failed: {exc}")
@@ -0,0 +1,31 @@
+"""
+In-memory backplane (single process)
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .base_backplane import BaseBackplane
+
+if TYPE_CHECKING:
+    from ..pyjolt import PyJolt
+
+class MemoryBackplane(BaseBackplane):
+    """
+    Delivers messages only to subscribers in this process. Default backplane
+    for single worker deployments.
+    """
+
+    @classmethod
+    def configure_from_app(cls, app: PyJolt) -> "MemoryBackplane":
+        return cls()
+
+    async def connect(self) -> None:
+        return None
+
+    async def disconnect(self) -> None:
+        return None
+
+    def _send_frame(self, frame: bytes) -> None:
+        # there are no other workers
+        return None
@@ -0,0 +1,137 @@
+"""
+Redis pub/sub backplane (pip install redis)
+
+BACKPLANE_REDIS_URL       = "redis://localhost:6379/0"   # required
+BACKPLANE_REDIS_PASSWORD  = None                          # optional
+BACKPLANE_CHANNEL         = None                          # optional, redis channel of the application (default: pyjolt:<APP_NAME>:backplane)
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Any, Optional, TYPE_CHECKING
+
+from loguru import logger
+
+from .base_backplane import BaseBackplane, app_namespace
+
+if TYPE_CHECKING:
+    from ..pyjolt import PyJolt
+
+class RedisBackplane(BaseBackplane):
+    """
+    Backplane over a single Redis pub/sub channel. Every worker publishes one
+    frame per event loop tick (frames which pile up while Redis is slow are
+    sent in one pipeline) and listens for the frames of the other workers.
+    If Redis doesn't keep up, the oldest of max_pending_frames unsent frames
+    are dropped.
+    """
+
+    def __init__(self, url: str, password: Optional[str] = None,
+                 channel: str = "pyjolt:backplane", max_pending_frames: int = 1000) -> None:
+        if not url:
+            raise ValueError("BACKPLANE_REDIS_URL must be set for RedisBackplane")
+        super().__init__()
+        #pylint: disable-next=C0415
+        import redis.asyncio
+        self._redis = redis.asyncio
+        self._url = url
+        self._password = password
+        self._channel = channel
+        self._client: Any = None
+        self._pubsub: Any = None
+        self._frames: deque[bytes] = deque(maxlen=max_pending_frames)
+        self._dropped_frames: int = 0
+        self._waiter: Optional[asyncio.Future] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._reader: Optional[asyncio.Task] = None
+
+    @classmethod
+    def configure_from_app(cls, app: PyJolt) -> "RedisBackplane":
+        return cls(url=app.get_conf("BACKPLANE_REDIS_URL", ""),
+                   password=app.get_conf("BACKPLANE_REDIS_PASSWORD", None),
+                   channel=(app.get_conf("BACKPLANE_CHANNEL", None)
+                            or f"pyjolt:{app_namespace(app)}:backplane"))
+
+    async def connect(self) -> None:
+        if self._client is not None:
+            return
+        self._client = self._redis.from_url(self._url, decode_responses=False,
+                                            password=self._password)
+        self._pubsub = self._client.pubsub()
+        await self._pubsub.subscribe(self._channel)
+        self._reader = asyncio.ensure_future(self._read())
+        self._writer = asyncio.ensure_future(self._write())
+
+    async def disconnect(self) -> None:
+        for task in (self._reader, self._writer):
+            if task is not None:
+                task.cancel()
+        tasks = [task for task in (self._reader, self._writer) if task is not None]
+        if tasks:
+            await asyncio.wait(tasks)
+        self._reader = self._writer = None
+        if self._pubsub is not None:
+            await self._pubsub.reset()
+            self._pubsub = None
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    def stats(self) -> dict[str, int]:
+        stats = super().stats()
+        stats["pending_frames"] = len(self._frames)
+        stats["dropped_frames"] = self._dropped_frames
+        return stats
+
+    def _send_frame(self, frame: bytes) -> None:
+        if self._client is None:
+            # not connected (i.e. before startup), only local subscribers
+            return
+        frames = self._frames
+        if len(frames) == frames.maxlen:
+            self._dropped_frames += 1
+        frames.append(frame)
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def _write(self) -> None:
+        frames = self._frames
+        loop = asyncio.get_running_loop()
+        while True:
+            if not frames:
+                self._waiter = loop.create_future()
+                try:
+                    await self._waiter
+                finally:
+                    self._waiter = None
+                continue
+            batch = list(frames)
+            frames.clear()
+            try:
+                if len(batch) == 1:
+                    await self._client.publish(self._channel, batch[0])
+                else:
+                    async with self._client.pipeline(transaction=False) as pipe:
+                        for frame in batch:
+                            pipe.publish(self._channel, frame)
+                        await pipe.execute()
+            # pylint: disable-next=W0718
+            except Exception as exc:
+                self._dropped_frames += len(batch)
+                logger.error(f"RedisBackplane failed to publish {len(batch)} frames: {exc}")
+                await asyncio.sleep(1.0)
+
+    async def _read(self) -> None:
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    if message["type"] == "message":
+                        self._receive_frame(message["data"])
+            except asyncio.CancelledError:
+                raise
+            # pylint: disable-next=W0718
+            except Exception as exc:
+                logger.error(f"RedisBackplane lost its subscription: {exc}")
+                await asyncio.sleep(1.0)
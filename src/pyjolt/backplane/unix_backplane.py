@@ -0,0 +1,142 @@
+"""
+Unix socket backplane (workers on one host)
+
+BACKPLANE_SOCKET_DIR = None   # optional, shared by all workers of the application (default: <tmp>/pyjolt-backplane-<APP_NAME>)
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import tempfile
+import time
+from typing import Optional, TYPE_CHECKING
+
+from loguru import logger
+
+from .base_backplane import BaseBackplane, app_namespace
+
+if TYPE_CHECKING:
+    from ..pyjolt import PyJolt
+
+#: largest datagram a worker receives (bigger frames are dropped by the sender)
+MAX_DATAGRAM_SIZE: int = 1 << 20
+
+class UnixSocketBackplane(BaseBackplane):
+    """
+    Backplane for multiple workers on one host without an external broker.
+    Every worker binds a unix datagram socket in socket_dir and sends its
+    frame of each event loop tick to the sockets of the other workers with
+    one non-blocking sendto per worker. The directory is rescanned for
+    workers every peer_refresh_interval seconds (new workers receive messages
+    after at most that delay). Frames for workers which don't keep up are dropped.
+    """
+    max_frame_size: Optional[int] = 64 * 1024
+
+    def __init__(self, socket_dir: Optional[str] = None,
+                 peer_refresh_interval: float = 1.0) -> None:
+        super().__init__()
+        self._socket_dir = socket_dir or os.path.join(tempfile.gettempdir(), "pyjolt-backplane")
+        self._peer_refresh_interval = peer_refresh_interval
+        self._path = os.path.join(self._socket_dir, f"{os.getpid()}-{self._origin.hex()[:8]}.sock")
+        self._sock: Optional[socket.socket] = None
+        self._peers: list[str] = []
+        self._peers_refreshed: float = 0.0
+        self._buffer = bytearray(MAX_DATAGRAM_SIZE)
+        self._dropped_frames: int = 0
+
+    @classmethod
+    def configure_from_app(cls, app: PyJolt) -> "UnixSocketBackplane":
+        socket_dir = app.get_conf("BACKPLANE_SOCKET_DIR", None) or os.path.join(
+            tempfile.gettempdir(), f"pyjolt-backplane-{app_namespace(app)}")
+        return cls(socket_dir=socket_dir)
+
+    @property
+    def path(self) -> str:
+        """Socket path of this worker"""
+        return self._path
+
+    async def connect(self) -> None:
+        if self._sock is not None:
+            return
+        os.makedirs(self._socket_dir, mode=0o700, exist_ok=True)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        # best effort, capped by the system limits (queued datagrams count against both)
+        for option in (socket.SO_SNDBUF, socket.SO_RCVBUF):
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, option, 4 * MAX_DATAGRAM_SIZE)
+            except OSError:
+                pass
+        sock.setblocking(False)
+        sock.bind(self._path)
+        self._sock = sock
+        asyncio.get_running_loop().add_reader(sock.fileno(), self._on_readable)
+
+    async def disconnect(self) -> None:
+        sock = self._sock
+        if sock is None:
+            return
+        self._sock = None
+        asyncio.get_running_loop().remove_reader(sock.fileno())
+        sock.close()
+        try:
+            os.unlink(self._path)
+        except FileNotFoundError:
+            pass
+
+    def stats(self) -> dict[str, int]:
+        stats = super().stats()
+        stats["peers"] = len(self._peers)
+        stats["dropped_frames"] = self._dropped_frames
+        return stats
+
+    def _send_frame(self, frame: bytes) -> None:
+        sock = self._sock
+        if sock is None:
+            # not connected (i.e. before startup), only local subscribers
+            return
+        if len(frame) > MAX_DATAGRAM_SIZE:
+            self._dropped_frames += 1
+            logger.error(f"UnixSocketBackplane dropped a frame of {len(frame)} bytes "
+                         f"(max {MAX_DATAGRAM_SIZE} bytes per message)")
+            return
+        stale: list[str] = []
+        for peer in self._get_peers():
+            try:
+                sock.sendto(frame, peer)
+            except (BlockingIOError, InterruptedError):
+                # the worker doesn't keep up
+                self._dropped_frames += 1
+            except (ConnectionRefusedError, FileNotFoundError):
+                stale.append(peer)
+        for peer in stale:
+            self._remove_peer(peer)
+
+    def _get_peers(self) -> list[str]:
+        now = time.monotonic()
+        if now - self._peers_refreshed >= self._peer_refresh_interval:
+            self._peers_refreshed = now
+            with os.scandir(self._socket_dir) as entries:
+                self._peers = [entry.path for entry in entries
+                               if entry.name.endswith(".sock") and entry.path != self._path]
+        return self._peers
+
+    def _remove_peer(self, peer: str) -> None:
+        if peer in self._peers:
+            self._peers.remove(peer)
+        try:
+            # socket of a worker which exited without cleaning up
+            os.unlink(peer)
+        except OSError:
+            pass
+
+    def _on_readable(self) -> None:
+        sock = self._sock
+        buffer = self._buffer
+        while sock is not None:
+            try:
+                size = sock.recv_into(buffer)
+            except (BlockingIOError, InterruptedError):
+                return
+            self._receive_frame(bytes(memoryview(buffer)[:size]))
+            sock = self._sock
@@ -6,7 +6,7 @@ from functools import wraps
 from typing import Callable, NotRequired, Optional, Type, TypedDict, cast, TYPE_CHECKING, Any
 from pydantic import BaseModel, Field
 
-from ..utilities import run_sync_or_async
+from ..utilities import ensure_async
 from ..base_extension import BaseExtension
 
 from .backends.base_cache_backend import BaseCacheBackend
@@ -82,7 +82,7 @@ class Cache(BaseExtension):
     async def set(self, key: str, value: "Response", duration: Optional[int] = None) -> None:
         cached_value = {
             "status_code": value.status_code,
-            "headers": value.headers,
+            "headers": list(value.headers.raw),
             "body": value.body,
         }
         await cast(BaseCacheBackend, self._backend).set(key,
@@ -111,6 +111,8 @@ class Cache(BaseExtension):
         cache = self
 
         def decorator(handler: Callable) -> Callable:
+            call_handler = ensure_async(handler)
+
             @wraps(handler)
             async def wrapper(self, *args, **kwargs) -> "Response":  # type: ignore[override]
                 req: Request = args[0]
@@ -123,7 +125,7 @@ class Cache(BaseExtension):
                 if cached_value is not None:
                     return cached_value
 
-                res: Response = await run_sync_or_async(handler, self, *args, **kwargs)
+                res: Response = await call_handler(self, *args, **kwargs)
                 await cache.set(cache_key, res, duration)
                 return res
 
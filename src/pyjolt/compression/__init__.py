@@ -0,0 +1,7 @@
+"""Compression module"""
+from .compression_mw import CompressionMiddleware
+from .codecs import (CompressionCodec, GzipCodec, BrotliCodec,
+                     ZstdCodec, negotiate_encoding)
+
+__all__ = ["CompressionMiddleware", "CompressionCodec", "GzipCodec",
+           "BrotliCodec", "ZstdCodec", "negotiate_encoding"]
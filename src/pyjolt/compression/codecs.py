@@ -0,0 +1,181 @@
+"""
+Response compression codecs.
+gzip uses zlib from the standard library, br requires the brotli package
+(pip install brotli) and zstd the zstandard package (pip install zstandard).
+Every codec can compress a whole body at once or a stream chunk by chunk
+(each chunk is flushed so clients receive it immediately).
+"""
+import zlib
+import threading
+from functools import lru_cache
+from typing import Optional, Protocol
+
+from ..streaming import Chunk
+
+class StreamCompressor(Protocol):
+    """Incremental compressor of a single response stream"""
+
+    def compress(self, chunk: Chunk) -> bytes:
+        """Compresses and flushes the chunk"""
+        ...
+
+    def finish(self) -> bytes:
+        """Ends the compressed stream"""
+        ...
+
+class CompressionCodec(Protocol):
+    """Compression codec protocol"""
+    #: Content-Encoding token
+    encoding: str
+
+    def compress(self, data: bytes) -> bytes:
+        """Compresses a whole body"""
+        ...
+
+    def stream_compressor(self) -> StreamCompressor:
+        """Returns a compressor for a streamed body"""
+        ...
+
+class _GzipStream:
+    __slots__ = ("_compressor",)
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, chunk: Chunk) -> bytes:
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+class GzipCodec:
+    """gzip (zlib, always available)"""
+    encoding = "gzip"
+
+    def __init__(self, level: Optional[int] = None):
+        self._level: int = 6 if level is None else level
+
+    def compress(self, data: bytes) -> bytes:
+        compressor = zlib.compressobj(self._level, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+
+    def stream_compressor(self) -> StreamCompressor:
+        return _GzipStream(self._level)
+
+class _BrotliStream:
+    __slots__ = ("_compressor",)
+
+    def __init__(self, brotli, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, chunk: Chunk) -> bytes:
+        return self._compressor.process(chunk) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+class BrotliCodec:
+    """Brotli (pip install brotli)"""
+    encoding = "br"
+
+    def __init__(self, level: Optional[int] = None):
+        #pylint: disable-next=C0415
+        import brotli
+        self._brotli = brotli
+        # the default quality (11) is too slow for dynamic responses
+        self._quality: int = 4 if level is None else level
+
+    def compress(self, data: bytes) -> bytes:
+        return self._brotli.compress(data, quality=self._quality)
+
+    def stream_compressor(self) -> StreamCompressor:
+        return _BrotliStream(self._brotli, self._quality)
+
+class _ZstdStream:
+    __slots__ = ("_compressor", "_flush_block")
+
+    def __init__(self, zstandard, level: int):
+        # compressobj() shares the context of its ZstdCompressor: one compressor per stream
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        self._flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+
+    def compress(self, chunk: Chunk) -> bytes:
+        return self._compressor.compress(chunk) + self._compressor.flush(self._flush_block)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+class ZstdCodec:
+    """Zstandard (pip install zstandard)"""
+    encoding = "zstd"
+
+    def __init__(self, level: Optional[int] = None):
+        #pylint: disable-next=C0415
+        import zstandard
+        self._zstandard = zstandard
+        self._level: int = 3 if level is None else level
+        # ZstdCompressor objects must not be used from several threads at once
+        self._local = threading.local()
+
+    def compress(self, data: bytes) -> bytes:
+        compressor = getattr(self._local, "compressor", None)
+        if compressor is None:
+            compressor = self._local.compressor = self._zstandard.ZstdCompressor(level=self._level)
+        return compressor.compress(data)
+
+    def stream_compressor(self) -> StreamCompressor:
+        return _ZstdStream(self._zstandard, self._level)
+
+_CODECS: dict[str, type] = {
+    "zstd": ZstdCodec,
+    "br": BrotliCodec,
+    "gzip": GzipCodec,
+}
+
+def load_codecs(encodings: list[str], levels: Optional[dict[str, int]] = None
+                ) -> dict[str, CompressionCodec]:
+    """
+    Creates codecs for the encodings (in order of preference).
+    Codecs whose packages aren't installed are skipped.
+    """
+    levels = levels or {}
+    codecs: dict[str, CompressionCodec] = {}
+    for encoding in encodings:
+        codec_cls = _CODECS.get(encoding)
+        if codec_cls is None:
+            raise ValueError(f"Unknown compression encoding '{encoding}'. Use one of: {', '.join(_CODECS)}")
+        try:
+            codecs[encoding] = codec_cls(levels.get(encoding))
+        except ImportError:
+            continue
+    return codecs
+
+@lru_cache(maxsize=256)
+def negotiate_encoding(accept_encoding: str, available: tuple[str, ...]) -> Optional[str]:
+    """
+    Picks the encoding for the Accept-Encoding header value: the highest
+    q-value wins, ties are resolved by the order of `available`.
+    Returns None if no available encoding is acceptable.
+    """
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q: float = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[token] = q
+    wildcard: Optional[float] = accepted.get("*")
+    best: Optional[str] = None
+    best_q: float = 0.0
+    for encoding in available:
+        q = accepted.get(encoding, wildcard if wildcard is not None else 0.0)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
@@ -0,0 +1,135 @@
+"""
+Compression middleware for PyJolt.
+Compresses response bodies with the best encoding accepted by the client
+(Accept-Encoding). Fixed bodies are compressed at once (if they are large enough),
+streamed bodies chunk by chunk.
+"""
+from typing import AsyncIterable, AsyncIterator, Iterable, Optional, TYPE_CHECKING
+
+from ..executors import executors
+from ..middleware import MiddlewareBase, AppCallableType
+from ..streaming import Chunk, iterate_chunks
+from .codecs import CompressionCodec, load_codecs, negotiate_encoding
+
+if TYPE_CHECKING:
+    from ..pyjolt import PyJolt
+    from ..request import Request
+    from ..response import Response
+
+#: content types (prefixes) which are already compressed
+DEFAULT_EXCLUDED_CONTENT_TYPES: tuple[str, ...] = (
+    "image/", "video/", "audio/", "font/woff", "font/woff2",
+    "application/zip", "application/gzip", "application/x-gzip",
+    "application/zstd", "application/x-brotli", "application/x-7z-compressed",
+    "application/x-rar-compressed", "application/x-bzip2", "application/x-xz",
+    "application/pdf", "text/event-stream",
+)
+#: already compressed types with compressible exceptions
+_COMPRESSIBLE_CONTENT_TYPES: frozenset[str] = frozenset({"image/svg+xml", "image/x-icon", "image/bmp"})
+
+class CompressionMiddleware(MiddlewareBase):
+    """
+    Middleware which compresses responses (gzip, br, zstd).
+    Ranged/zero-copy responses, responses which already have a Content-Encoding
+    and excluded content types are sent as they are.
+    """
+
+    def __init__(self, app: "PyJolt", next_app: AppCallableType):
+        super().__init__(app, next_app)
+        self._codecs: dict[str, CompressionCodec] = load_codecs(
+            list(app.get_conf("COMPRESSION_ENCODINGS", None) or ["zstd", "br", "gzip"]),
+            app.get_conf("COMPRESSION_LEVELS", None),
+        )
+        self._available: tuple[str, ...] = tuple(self._codecs)
+        self._min_size: int = app.get_conf("COMPRESSION_MIN_SIZE", None) or 0
+        self._offload_threshold: Optional[int] = app.get_conf("COMPRESSION_OFFLOAD_THRESHOLD", None)
+        excluded = app.get_conf("COMPRESSION_EXCLUDED_CONTENT_TYPES", None)
+        self._excluded: tuple[str, ...] = (DEFAULT_EXCLUDED_CONTENT_TYPES if excluded is None
+                                          else tuple(t.lower() for t in excluded))
+        # content-type header value -> compressible
+        self._content_type_cache: dict[str, bool] = {}
+
+    async def middleware(self, req: "Request") -> "Response":
+        res: "Response" = await self.next(req)
+        if not self._compressible(res):
+            return res
+        self._add_vary(res)
+        accept_encoding: Optional[str] = req.headers.get("accept-encoding")
+        if not accept_encoding:
+            return res
+        encoding = negotiate_encoding(accept_encoding, self._available)
+        if encoding is None:
+            return res
+        codec = self._codecs[encoding]
+
+        stream = res.stream_iterable
+        if stream is not None:
+            if res.coalesce:
+                # every compressed chunk is flushed, compress coalesced chunks
+                stream = self.app.coalesce_stream(stream)
+                res.coalesce = False
+            res.stream_iterable = self._compress_stream(stream, codec)
+            self._set_encoding(res, encoding)
+            return res
+
+        await self.app.serialize_body(res, req.response.expected_body_type())
+        body = res.body
+        if not isinstance(body, (bytes, bytearray)) or len(body) < self._min_size:
+            return res
+        if self._offload_threshold is not None and len(body) >= self._offload_threshold:
+            res.body = await executors.run(codec.compress, bytes(body))
+        else:
+            res.body = codec.compress(bytes(body))
+        self._set_encoding(res, encoding)
+        return res
+
+    def _compressible(self, res: "Response") -> bool:
+        status = int(res.status_code)
+        if status < 200 or status in (204, 206) or res.zero_copy is not None:
+            return False
+        headers = res.headers
+        if "content-encoding" in headers or "content-range" in headers:
+            return False
+        content_type: Optional[str] = res.content_type
+        if not content_type:
+            return False
+        compressible = self._content_type_cache.get(content_type)
+        if compressible is None:
+            media_type = content_type.split(";", 1)[0].strip().lower()
+            compressible = (media_type in _COMPRESSIBLE_CONTENT_TYPES
+                            or not media_type.startswith(self._excluded))
+            if len(self._content_type_cache) < 256:
+                self._content_type_cache[content_type] = compressible
+        if compressible and status == 304:
+            # a 304 repeats the Vary header of the (compressed) 200 response
+            self._add_vary(res)
+            return False
+        return compressible
+
+    @staticmethod
+    def _add_vary(res: "Response") -> None:
+        vary: Optional[str] = res.headers.get("vary")
+        if not vary:
+            res.headers["vary"] = "Accept-Encoding"
+        elif "accept-encoding" not in vary.lower() and vary.strip() != "*":
+            res.headers["vary"] = f"{vary}, Accept-Encoding"
+
+    @staticmethod
+    def _set_encoding(res: "Response", encoding: str) -> None:
+        res.headers["content-encoding"] = encoding
+        # length of the uncompressed body (set again by the application for fixed bodies)
+        if "content-length" in res.headers:
+            del res.headers["content-length"]
+        etag: Optional[str] = res.headers.get("etag")
+        # the compressed representation has a different (weak) entity tag
+        if etag and not etag.startswith("W/"):
+            res.headers["etag"] = f"W/{etag}"
+
+    async def _compress_stream(self, iterable: AsyncIterable[Chunk] | Iterable[Chunk],
+                               codec: CompressionCodec) -> AsyncIterator[bytes]:
+        compressor = codec.stream_compressor()
+        async for chunk in iterate_chunks(iterable):
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
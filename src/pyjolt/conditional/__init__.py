@@ -0,0 +1,6 @@
+"""Conditional requests module (the middleware is in conditional.etag_mw)"""
+from .validators import (body_etag, quote_etag, etag_matches,
+                         http_date, parse_http_date, evaluate_preconditions)
+
+__all__ = ["body_etag", "quote_etag", "etag_matches",
+           "http_date", "parse_http_date", "evaluate_preconditions"]
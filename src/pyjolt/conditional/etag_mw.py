@@ -0,0 +1,42 @@
+"""
+ETag middleware for PyJolt.
+Adds an ETag (hash of the final body) to successful GET/HEAD responses
+and answers matching conditional requests with 304 Not Modified.
+"""
+from typing import Callable, TYPE_CHECKING
+
+from ..middleware import MiddlewareBase, AppCallableType
+from .validators import body_etag
+
+if TYPE_CHECKING:
+    from ..pyjolt import PyJolt
+    from ..request import Request
+    from ..response import Response
+
+class ETagMiddleware(MiddlewareBase):
+    """
+    Runs for all endpoints if ETAG_ENABLED is True, otherwise only
+    for endpoints decorated with @etag.
+    Responses which already carry an ETag (see Response.set_etag) are not hashed.
+    """
+
+    def __init__(self, app: "PyJolt", next_app: AppCallableType):
+        super().__init__(app, next_app)
+        self._enabled_globally: bool = bool(app.get_conf("ETAG_ENABLED", False))
+
+    def applies_to(self, route_handler: Callable) -> bool:
+        return self._enabled_globally or getattr(route_handler, "_etag", False)
+
+    async def middleware(self, req: "Request") -> "Response":
+        res: "Response" = await self.next(req)
+        if (req.method not in ("GET", "HEAD") or int(res.status_code) != 200
+                or res.is_streaming or res.zero_copy is not None):
+            return res
+        if "etag" not in res.headers:
+            await self.app.serialize_body(res, req.response.expected_body_type())
+            body = res.body
+            if not isinstance(body, (bytes, bytearray)):
+                return res
+            res.headers["etag"] = body_etag(body)
+        res.check_preconditions()
+        return res
@@ -0,0 +1,107 @@
+"""
+Validators (ETag, Last-Modified) and evaluation of conditional request headers
+(If-Match, If-None-Match, If-Modified-Since, If-Unmodified-Since).
+"""
+import zlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+try:
+    #pylint: disable-next=C0415
+    import xxhash # type: ignore[import-not-found]
+    _xxh3_64 = xxhash.xxh3_64_hexdigest
+except ImportError:
+    _xxh3_64 = None
+
+def body_etag(body: bytes|bytearray|memoryview) -> str:
+    """
+    Strong entity tag of a response body (fast non-cryptographic hash).
+    Uses xxhash (xxh3) if installed, else crc32 combined with the body length.
+    """
+    if _xxh3_64 is not None:
+        return f'"{_xxh3_64(body)}"'
+    return f'"{len(body):x}-{zlib.crc32(body):08x}"'
+
+def quote_etag(value: str, weak: bool = False) -> str:
+    """Formats a validator (i.e. a version number) as an entity tag"""
+    if value.startswith('W/"') or (value.startswith('"') and value.endswith('"')):
+        return value
+    return f'{"W/" if weak else ""}"{value}"'
+
+def _opaque(etag: str) -> str:
+    """Entity tag without the weak prefix"""
+    return etag[2:] if etag.startswith("W/") else etag
+
+def etag_matches(etag: Optional[str], header: str, weak: bool = True) -> bool:
+    """
+    If the entity tag matches the If-Match/If-None-Match header value.
+    Weak comparison ignores the W/ prefix (If-None-Match), strong comparison
+    (If-Match) never matches weak tags.
+    """
+    if etag is None:
+        return False
+    header = header.strip()
+    if header == "*":
+        return True
+    if not weak and etag.startswith("W/"):
+        return False
+    opaque = _opaque(etag)
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if not candidate:
+            continue
+        if candidate.startswith("W/"):
+            if not weak:
+                continue
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+def http_date(value: datetime|float|int) -> str:
+    """Formats a datetime or timestamp as an HTTP date"""
+    if not isinstance(value, datetime):
+        value = datetime.fromtimestamp(value, tz=timezone.utc)
+    elif value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+def parse_http_date(value: Optional[str]) -> Optional[datetime]:
+    """Parses an HTTP date (None if missing or invalid)"""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+def evaluate_preconditions(method: str, etag: Optional[str], last_modified: Optional[str],
+                           if_match: Optional[str], if_none_match: Optional[str],
+                           if_modified_since: Optional[str],
+                           if_unmodified_since: Optional[str]) -> Optional[int]:
+    """
+    Evaluates conditional request headers against the validators of the
+    current representation (RFC 9110, section 13.2.2).
+    Returns 412 (Precondition Failed), 304 (Not Modified) or None.
+    """
+    modified: Optional[datetime] = parse_http_date(last_modified)
+    if if_match is not None:
+        if not etag_matches(etag, if_match, weak=False):
+            return 412
+    elif if_unmodified_since is not None and modified is not None:
+        since = parse_http_date(if_unmodified_since)
+        if since is not None and modified > since:
+            return 412
+    safe: bool = method in ("GET", "HEAD")
+    if if_none_match is not None:
+        if etag_matches(etag, if_none_match, weak=True):
+            return 304 if safe else 412
+    elif safe and if_modified_since is not None and modified is not None:
+        since = parse_http_date(if_modified_since)
+        if since is not None and modified <= since:
+            return 304
+    return None
@@ -5,7 +5,7 @@ Base configuration class
 from __future__ import annotations
 
 import re
-from typing import Optional, Any, Sequence
+from typing import Optional, Any, Literal, Sequence
 from pydantic import BaseModel, Field, ConfigDict, field_validator
 
 from .logging.logger_config_base import OutputSink
@@ -30,6 +30,56 @@ class BaseConfig(BaseModel):
     RESPONSE_CLASS: Optional[type[Response]] = Field(
         Response, description="Response class to use. Must be a subclass of pyjolt.response")
 
+    TRUSTED_RESPONSE_OUTPUT: Optional[bool] = Field(
+        False, description=("Serialize response bodies of typed endpoints (Response[T] of a model or list of models) without validating them "
+                            "(only the model fields of dicts/ORM objects are dumped). "
+                            "Responses are always validated in DEBUG mode."))
+    RESPONSE_VALIDATION_SAMPLE_RATE: Optional[float] = Field(
+        0.0, ge=0.0, le=1.0, description="Fraction of responses which are still validated with TRUSTED_RESPONSE_OUTPUT")
+    JSON_OFFLOAD_THRESHOLD: Optional[int] = Field(
+        None, description=("Json bodies (lists/tuples) with at least this many items are serialized "
+                           "in a worker thread. None disables offloading."))
+    STRICT_REQUEST_VALIDATION: Optional[bool] = Field(
+        False, description="Validate request bodies of @consumes endpoints in pydantic strict mode (no type coercion)")
+    REQUEST_VALIDATION_OFFLOAD_THRESHOLD: Optional[int] = Field(
+        None, description=("Json request bodies with at least this many bytes are validated in a worker thread. "
+                           "None disables offloading."))
+    STREAM_COALESCE_SIZE: Optional[int] = Field(
+        16384, description=("Small chunks of streamed responses are joined into messages of up to this many bytes. "
+                            "None or 0 disables coalescing."))
+    STREAM_FLUSH_INTERVAL: Optional[float] = Field(
+        0.01, description=("Max seconds a coalesced chunk waits for more data before it is sent. "
+                           "None sends only full (STREAM_COALESCE_SIZE) chunks."))
+    SSE_PING_INTERVAL: Optional[float] = Field(
+        15.0, description="Seconds without events after which Server-Sent Events responses send a keep-alive comment. 0 disables it.")
+    SSE_RETRY: Optional[int] = Field(
+        None, description="Reconnection delay (milliseconds) sent to clients at the start of Server-Sent Events responses")
+    WEBSOCKET_QUEUE_SIZE: Optional[int] = Field(
+        100, description="Max queued outbound messages per websocket connection of the websocket hub")
+    WEBSOCKET_OVERFLOW: Optional[Literal["drop_oldest", "disconnect"]] = Field(
+        "drop_oldest", description=("What happens when the queue of a slow websocket client is full: "
+                                    "drop the oldest queued message or close the connection (code 1013)"))
+    BACKPLANE: Optional[Any] = Field(
+        None, description=("Backplane for websocket hub/broadcaster messages between workers: 'memory' (single process, default), "
+                           "'unix' (workers on one host), 'redis' or a BaseBackplane class/instance (see pyjolt.backplane)"))
+    BACKPLANE_REDIS_URL: Optional[str] = Field(
+        None, description="Redis url of the 'redis' backplane, i.e. redis://localhost:6379/0")
+    BACKPLANE_REDIS_PASSWORD: Optional[str] = Field(
+        None, description="Redis password of the 'redis' backplane")
+    BACKPLANE_CHANNEL: Optional[str] = Field(
+        None, description="Redis pub/sub channel of the 'redis' backplane (one per application). None uses pyjolt:<APP_NAME>:backplane")
+    BACKPLANE_SOCKET_DIR: Optional[str] = Field(
+        None, description="Directory of the worker sockets of the 'unix' backplane. None uses <tmp>/pyjolt-backplane-<APP_NAME>")
+    EXECUTOR_THREADS: Optional[int] = Field(
+        None, description="Threads of the default executor pool (sync handlers, hooks...). None uses the Python default.")
+    EXECUTOR_POOLS: Optional[dict[str, Optional[int]]] = Field(
+        None, description="Additional named thread pools with their sizes, i.e. {'io': 32, 'cpu': 4} (see @offload)")
+    EXECUTOR_PROCESS_WORKERS: Optional[int] = Field(
+        None, description="Worker processes of the @offload(process=True) pool. None uses the CPU count.")
+    JSON_CODEC: Optional[Any] = Field(
+        "stdlib", description=("JSON codec for request/response bodies: 'stdlib', 'orjson', 'msgspec', "
+                               "'auto' (fastest installed) or a codec class/instance (see pyjolt.json_codec)"))
+
     # required for Authentication extension
     SECRET_KEY: Optional[str] = Field(
         None, description="High entropy random string for signing cookies/jwts"
@@ -59,18 +109,56 @@ class BaseConfig(BaseModel):
         "/static", description="URL prefix for static files"
     )
     STATIC_CONTROLLER_NAME: Optional[str] = Field("static", description="Mount name for static files controller")
+    STATIC_MAX_AGE: Optional[int] = Field(None, description="Cache-Control max-age (seconds) of static files. None sends no Cache-Control header.")
+    STATIC_FINGERPRINT_MAX_AGE: Optional[int] = Field(31536000, description=("Cache-Control max-age of fingerprinted static files "
+                                                                             "(i.e. app.3f2a9c1b.js), sent with the immutable directive"))
+    STATIC_CACHE_MAX_BYTES: Optional[int] = Field(32 * 1024 * 1024, description="Max total size of static files kept in memory")
+    STATIC_CACHE_MAX_FILE_SIZE: Optional[int] = Field(256 * 1024, description="Max size of a single static file kept in memory")
+    STATIC_CACHE_IMMUTABLE: Optional[bool] = Field(False, description="Never revalidate cached static files (files don't change while the app runs)")
+    STATIC_CACHE_CHECK_INTERVAL: Optional[float] = Field(1.0, description="Min seconds between mtime checks of a cached static file")
+    MAX_BODY_SIZE: Optional[int] = Field(None, description=("Max request body size in bytes (after decompression). None means no limit. "
+                                                          "Larger bodies are rejected with 413. Can be set per endpoint with @max_body_size."))
+    DECOMPRESS_REQUEST_BODY: Optional[bool] = Field(True, description="Transparently decompress request bodies with Content-Encoding: gzip")
+    MULTIPART_SPOOL_THRESHOLD: Optional[int] = Field(1024 * 1024, description="Uploaded files larger than this (bytes) are spooled to a temporary file on disk")
+    MULTIPART_SPOOL_DIR: Optional[str] = Field(None, description="Directory for spooled uploads (default: system temp directory)")
+    MULTIPART_MAX_FILE_SIZE: Optional[int] = Field(None, description="Max size of a single uploaded file (bytes). None means no limit. Larger files are rejected with 413.")
+    MULTIPART_MAX_FIELD_SIZE: Optional[int] = Field(1024 * 1024, description="Max size of a single (non-file) multipart form field (bytes)")
+    MULTIPART_MAX_FIELDS: Optional[int] = Field(1000, description="Max number of (non-file) fields in a multipart form")
+    MULTIPART_MAX_FILES: Optional[int] = Field(100, description="Max number of files in a multipart form")
+    MULTIPART_HASH_ALGORITHM: Optional[str] = Field(None, description="hashlib algorithm (i.e. sha256) for hashing uploaded files while they are received (UploadedFile.digest)")
     TEMPLATES_STRICT: Optional[bool] = Field(
         True, description="Strict template rendering"
     )
     STRICT_SLASHES: Optional[bool] = Field(
         False, description="Route '/x' vs '/x/' strictness"
     )
+    ROUTER_MATCH_CACHE_SIZE: Optional[int] = Field(
+        None, description=("Max number of cached route match results keyed on (method, path). "
+                           "None or 0 disables the match cache.")
+    )
+    ROUTER_MATCH_CACHE_DYNAMIC_LIMIT: Optional[int] = Field(
+        256, description=("Max number of cached parameterised paths and route misses. "
+                          "Static routes are always cached.")
+    )
     OPEN_API: Optional[bool] = Field(True, description="Enable OpenAPI endpoint")
     OPEN_API_URL: Optional[str] = Field("/openapi", description="OpenAPI base path")
     OPEN_API_DESCRIPTION: Optional[str] = Field(
         "Simple API", description="OpenAPI description"
     )
 
+    #Compression settings
+    COMPRESSION_ENABLED: Optional[bool] = Field(False, description="Enable response compression middleware")
+    COMPRESSION_ENCODINGS: Optional[list[str]] = Field(["zstd", "br", "gzip"], description=("Supported encodings in order of preference. "
+                                                                                           "br and zstd are used only if brotli/zstandard are installed."))
+    COMPRESSION_LEVELS: Optional[dict[str, int]] = Field(None, description="Compression level per encoding, i.e. {'gzip': 6, 'br': 4, 'zstd': 3}")
+    COMPRESSION_MIN_SIZE: Optional[int] = Field(500, description="Fixed bodies smaller than this (bytes) are not compressed")
+    COMPRESSION_EXCLUDED_CONTENT_TYPES: Optional[list[str]] = Field(None, description=("Content types (prefixes) which are not compressed. "
+                                                                                      "None uses the defaults (images, video, audio, archives...)"))
+    COMPRESSION_OFFLOAD_THRESHOLD: Optional[int] = Field(None, description="Fixed bodies with at least this many bytes are compressed in a worker thread")
+
+    ETAG_ENABLED: Optional[bool] = Field(False, description=("Add ETags to all GET responses and answer matching conditional "
+                                                            "requests with 304 Not Modified (use @etag for single endpoints)"))
+
     #CORS settings
     CORS_ENABLED: Optional[bool] = Field(True, description="Enable CORS")
     CORS_ALLOW_ORIGINS: Optional[Sequence[str]] = Field(["*"], description="List of allowed origins")
@@ -100,6 +188,17 @@ class BaseConfig(BaseModel):
         "DELAY": True,
     }, description="Default pyjolt logger configuration")
 
+    ACCESS_LOG: Optional[bool] = Field(True, description="Write one structured access log record per request")
+    ACCESS_LOG_SINK: Optional[Any] = Field(None, description=("Access log output: 'stderr' (default), 'stdout', 'loguru', "
+                                                              "a file path, a stream or a callable which receives record batches"))
+    ACCESS_LOG_SAMPLE_RATES: Optional[dict[str, float]] = Field(None, description=("Fraction of logged requests per status class, "
+                                                                                   "i.e. {'2xx': 0.1, '3xx': 0.1}. Unlisted classes are always logged."))
+    ACCESS_LOG_EXCLUDE: Optional[list[str]] = Field(None, description=("Path prefixes (starting with '/') and route names "
+                                                                       "(i.e. 'HealthController.check') which are not logged"))
+    ACCESS_LOG_BATCH_SIZE: Optional[int] = Field(256, description="Max number of records written in one batch")
+    ACCESS_LOG_FLUSH_INTERVAL: Optional[float] = Field(1.0, description="Seconds between background writes of buffered records")
+    ACCESS_LOG_MAX_QUEUE: Optional[int] = Field(10000, description="Max number of buffered records. Excess records are dropped.")
+
     IN_MEMORY_LOG_BUFFER_SIZE: int = Field(1000, description=("The size of the in-memory log message deque list. "
                                                               "Log messages are stored in-memory for later view in "
                                                               "the admin dashboard or elsewhere."))
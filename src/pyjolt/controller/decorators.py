@@ -2,6 +2,7 @@
 Controller decorators
 """
 
+import json
 from typing import (
     Any,
     Awaitable,
@@ -13,21 +14,17 @@ from typing import (
     cast,
 )
 from functools import wraps
-import inspect
 
 from .controller import Controller, Descriptor
 from .utilities import (
-    _extract_response_type,
-    get_type_hints,
-    _unwrap_annotated,
-    _is_pydantic_model,
     _content_type_matches,
     _read_payload_for_consumes,
-    _build_model,
+    _validate_json_payload,
 )
+from .endpoint_metadata import endpoint_metadata
 from ..response import Response
 from ..request import Request
-from ..utilities import run_sync_or_async
+from ..utilities import run_sync_or_async, ensure_async
 from ..exceptions import MethodNotControllerMethod, UnexpectedDecorator
 from ..media_types import MediaType
 from ..http_methods import HttpMethod
@@ -54,6 +51,52 @@ class EndpointDecoratorFn(Protocol):
         tags: Optional[list[str]] = None,
     ) -> _EndpointDecorator: ...
 
+def _mark_endpoint(wrapper: Callable, func: Callable) -> None:
+    """
+    Records the wrapped endpoint function so that PyJolt.build() can compile
+    an equivalent dispatch callable (see compile_endpoint).
+    """
+    # pylint: disable-next=protected-access
+    wrapper._endpoint_dispatch = (wrapper, func)  # type: ignore[attr-defined]
+
+def compile_endpoint(handler: Callable) -> AsyncMethod:
+    """
+    Compiles a bound endpoint handler into a single async callable with the
+    controller hooks frozen into tuples and sync/async calls resolved upfront.
+    Does the same as the request wrapper of the endpoint decorators without the
+    per-request hook lookups. Handlers which were not created by the endpoint
+    decorators (or were wrapped by other decorators afterwards) are returned as they are.
+    """
+    dispatch = getattr(handler, "_endpoint_dispatch", None)
+    ctrl = getattr(handler, "__self__", None)
+    if (dispatch is None or dispatch[0] is not getattr(handler, "__func__", None)
+            or not isinstance(ctrl, Controller)):
+        return ensure_async(handler)
+
+    call = ensure_async(dispatch[1])
+    pre_hooks = tuple(
+        ensure_async(m) for m in reversed(getattr(ctrl, "_controller_decorator_methods", []) or [])
+    ) + tuple(
+        ensure_async(m) for m in getattr(ctrl, "_before_request_methods", []) or []
+    )
+    post_hooks = tuple(
+        ensure_async(m) for m in getattr(ctrl, "_after_request_methods", []) or []
+    )
+
+    if not pre_hooks and not post_hooks:
+        async def endpoint(req: "Request", **kwargs: Any) -> "Response":
+            return await call(ctrl, req, **kwargs)
+        return endpoint
+
+    async def hooked_endpoint(req: "Request", **kwargs: Any) -> "Response":
+        for hook in pre_hooks:
+            await hook(req)
+        response: "Response" = await call(ctrl, req, **kwargs)
+        for hook in post_hooks:
+            await hook(response)
+        return response
+    return hooked_endpoint
+
 def get(
     url_path: str, open_api_spec: bool = True, tags: Optional[list[str]] = None
 ) -> _EndpointDecorator:
@@ -93,6 +136,7 @@ def get(
             raise UnexpectedDecorator("GET endpoints can't consume request bodies.")
         # pylint: disable=protected-access
         wrapper._handler = merged  # type: ignore[attr-defined]
+        _mark_endpoint(wrapper, func)
         return wrapper
 
     return cast(_EndpointDecorator, decorator)
@@ -111,14 +155,8 @@ def endpoint_decorator_factory(http_method: HttpMethod) -> EndpointDecoratorFn:
                         f"Method {func.__name__} is not part of a valid controller class"
                     )
 
-                # Optionally infer/record expected response type for endpoint
-                req: "Request" = args[0]  # type: ignore[index]
-                if req.response.expected_body_type is None:
-                    expected = _extract_response_type(func)
-                    # pylint: disable=protected-access
-                    req.response._set_expected_body_type(expected)
-
                 # pre-hooks
+                req: "Request" = args[0]  # type: ignore[index]
                 for m in reversed(getattr(self, "_controller_decorator_methods", []) or []):
                     await run_sync_or_async(m, req)
                 for m in getattr(self, "_before_request_methods", []) or []:
@@ -141,6 +179,7 @@ def endpoint_decorator_factory(http_method: HttpMethod) -> EndpointDecoratorFn:
                 "open_api_spec": open_api_spec,
                 "tags": tags if tags is not None else [],
             }
+            _mark_endpoint(wrapper, func)
             return wrapper
 
         return cast(_EndpointDecorator, decorator)
@@ -183,21 +222,12 @@ def consumes(media_type: MediaType) -> _EndpointDecorator:
     """Decorator indicating what media type the endpoint consumes."""
 
     def decorator(func: Callable[..., Any]) -> AsyncMethod:
-        sig = inspect.signature(func)
-
-        try:
-            hints = get_type_hints(func, include_extras=True)
-        # pylint: disable-next=W0718
-        except Exception:
-            hints = getattr(func, "__annotations__", {}) or {}
-
-        consumed_type: Optional[Any] = None
-        for name, param in list(sig.parameters.items())[2:]:
-            ann = hints.get(name, param.annotation)
-            ann = _unwrap_annotated(ann)
-            if _is_pydantic_model(ann):
-                consumed_type = ann
-                break
+        metadata = endpoint_metadata(func)
+        # prebuilt start of the 415 response body (only the received type is encoded per request)
+        unsupported_prefix: bytes = (b'{"detail":"Unsupported Media Type","expected":'
+                                     + json.dumps(media_type.value).encode("utf-8")
+                                     + b',"received":')
+        is_json: bool = media_type in (MediaType.APPLICATION_JSON, MediaType.APPLICATION_PROBLEM_JSON)
 
         @wraps(func)
         async def wrapper(self: Controller, *args: Any, **kwargs: Any) -> "Response":
@@ -211,28 +241,26 @@ def consumes(media_type: MediaType) -> _EndpointDecorator:
             incoming_ct = req.headers.get("content-type", "")
             if not _content_type_matches(incoming_ct, media_type):
                 return req.response.json(
-                    {
-                        "detail": "Unsupported Media Type",
-                        "expected": media_type.value,
-                        "received": incoming_ct or None,
-                    }
+                    unsupported_prefix + json.dumps(incoming_ct or None).encode("utf-8") + b"}"
                 ).status(415)
 
-            payload = await _read_payload_for_consumes(req, media_type)
-            # Parameters: [0]=self, [1]=req, others start at index 2
-            for name, param in list(sig.parameters.items())[2:]:
-                if name in kwargs:
-                    continue
-
-                ann = hints.get(name, param.annotation)
-                if _is_pydantic_model(ann):
-                    kwargs[name] = _build_model(ann, payload)
+            if is_json:
+                # validated straight from the raw body (no intermediate dict)
+                raw = await req.body()
+                for name, adapter in metadata.injection_adapters:
+                    if name not in kwargs:
+                        kwargs[name] = await _validate_json_payload(req, adapter, raw)
+            else:
+                payload = await _read_payload_for_consumes(req, media_type)
+                for name, adapter in metadata.injection_adapters:
+                    if name not in kwargs:
+                        kwargs[name] = adapter.validate_python(payload)
 
             return await run_sync_or_async(func, self, *args, **kwargs)
 
         prev = getattr(func, "_handler", {}) or {}
         merged = dict(prev)
-        merged.update({"consumes": media_type, "consumes_type": consumed_type})
+        merged.update({"consumes": media_type, "consumes_type": metadata.consumed_type})
         # pylint: disable=protected-access
         wrapper._handler = merged  # type: ignore[attr-defined]
         return wrapper
@@ -249,7 +277,7 @@ def produces(
     """
 
     def decorator(func: Callable[..., Any]) -> AsyncMethod:
-        expected_body = _extract_response_type(func)
+        expected_body = endpoint_metadata(func).response_type
 
         @wraps(func)
         async def wrapper(self: Controller, *args: Any, **kwargs: Any) -> "Response":
@@ -343,6 +371,36 @@ def no_cors(func: Callable) -> Callable:
     setattr(func, "_disable_cors", True)
     return func
 
+def etag(func: Callable) -> Callable:
+    """
+    Decorator which enables automatic ETags and conditional requests
+    (304 Not Modified) for a GET endpoint (see ETAG_ENABLED for all endpoints).
+    Usage:
+    ```
+        @get("/")
+        @etag
+        async def list_items(self, req: Request) -> Response: ...
+    ```
+    """
+    setattr(func, "_etag", True)
+    return func
+
+def max_body_size(size: Optional[int]) -> Callable:
+    """
+    Per-endpoint request body size limit in bytes (overrides MAX_BODY_SIZE,
+    None disables the limit). Larger bodies are rejected with 413.
+    Usage:
+    ```
+        @post("/videos")
+        @max_body_size(2 * 1024 ** 3)
+        async def upload_video(self, req: Request) -> Response: ...
+    ```
+    """
+    def decorator(func: Callable) -> Callable:
+        setattr(func, "_max_body_size", size)
+        return func
+    return decorator
+
 def development(func_or_cls: Callable|Type[Any]) -> Callable|Type:
     """
     Decorator to mark a controller or endpoint as development only.
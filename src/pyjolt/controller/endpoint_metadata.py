@@ -0,0 +1,200 @@
+"""
+Endpoint type-hint metadata registry.
+Type hints of endpoint and exception handler methods are resolved once
+(at decoration or registration time) and shared by the decorators,
+exception handlers and the OpenAPI builder.
+"""
+import inspect
+from collections.abc import Mapping
+from types import UnionType
+from typing import (Any, Annotated, Callable, Optional, Type, Union, cast,
+                    get_args, get_origin, get_type_hints)
+
+from pydantic import TypeAdapter
+
+from ..response import Response
+from .utilities import _unwrap_annotated, _is_pydantic_model
+
+class EndpointMetadata:
+    """
+    Resolved type-hint metadata of a single handler function.
+    `injection_plan` holds (parameter_name, type) pairs of the pydantic models
+    (or lists of models) which are built from the request payload (see @consumes).
+    """
+    __slots__ = ("func", "signature", "hints", "response_type",
+                 "consumed_type", "injection_plan", "_response_adapter",
+                 "_injection_adapters")
+
+    def __init__(self, func: Callable, hints: dict[str, Any]):
+        self.func = func
+        self.signature = inspect.signature(func)
+        self.hints = hints
+        self.response_type: Optional[Type[Any]] = _response_type_from_hint(hints.get("return"))
+        plan: list[tuple[str, Type[Any]]] = []
+        # Parameters: [0]=self, [1]=req, others start at index 2
+        for name, param in list(self.signature.parameters.items())[2:]:
+            ann = _unwrap_annotated(hints.get(name, param.annotation))
+            if _is_pydantic_model(ann) or _is_model_list(ann):
+                plan.append((name, ann))
+        self.injection_plan: tuple[tuple[str, Type[Any]], ...] = tuple(plan)
+        self.consumed_type: Optional[Type[Any]] = plan[0][1] if plan else None
+        self._response_adapter: Optional[TypeAdapter] = None
+        self._injection_adapters: Optional[tuple[tuple[str, TypeAdapter], ...]] = None
+
+    @property
+    def response_adapter(self) -> Optional[TypeAdapter]:
+        """TypeAdapter of the response type (created on first use)"""
+        if self._response_adapter is None and self.response_type is not None:
+            self._response_adapter = response_adapter(self.response_type)
+        return self._response_adapter
+
+    @property
+    def injection_adapters(self) -> tuple[tuple[str, TypeAdapter], ...]:
+        """(parameter_name, TypeAdapter) pairs of the injection plan (created on first use)"""
+        if self._injection_adapters is None:
+            self._injection_adapters = tuple((name, cast(TypeAdapter, type_adapter(tp)))
+                                             for name, tp in self.injection_plan)
+        return self._injection_adapters
+
+def _is_model_list(tp: Any) -> bool:
+    """If the type is list[Model]"""
+    if get_origin(tp) is not list:
+        return False
+    args = get_args(tp)
+    return len(args) == 1 and _is_pydantic_model(_unwrap_annotated(args[0]))
+
+def _response_type_from_hint(ret: Any) -> Optional[Type[Any]]:
+    """If the hint is Response[T], return T; else None."""
+    if ret is None:
+        return None
+    if get_origin(ret) is Response:
+        args = get_args(ret)
+        if args:
+            t = args[0]
+            if get_origin(t) is Annotated:  # peel Annotated[T, ...]
+                t = get_args(t)[0]
+            return t
+    return None
+
+_ADAPTERS: dict[Any, Optional[TypeAdapter]] = {}
+
+def type_adapter(tp: Any) -> Optional[TypeAdapter]:
+    """
+    Cached TypeAdapter for a type (models, list[Model], unions...).
+    Returns None for types pydantic can't build a schema for.
+    """
+    try:
+        return _ADAPTERS[tp]
+    except KeyError:
+        pass
+    except TypeError:
+        # unhashable type hint
+        return None
+    adapter: Optional[TypeAdapter] = None
+    try:
+        adapter = TypeAdapter(tp)
+    # pylint: disable-next=W0718
+    except Exception:
+        adapter = None
+    _ADAPTERS[tp] = adapter
+    return adapter
+
+def response_adapter(response_type: Any) -> Optional[TypeAdapter]:
+    """
+    Cached TypeAdapter for a response type (models, list[Model], unions...).
+    Returns None for types pydantic can't build a schema for
+    and for exception classes (used as response types of exception handlers).
+    """
+    if inspect.isclass(response_type) and issubclass(response_type, BaseException):
+        return None
+    return type_adapter(response_type)
+
+_MISSING: Any = object()
+
+# model -> (field name, alias, nested kind ("model"/"list"/None), nested model) per field
+_CONSTRUCT_PLANS: dict[type, tuple[tuple[str, Optional[str], Optional[str], Any], ...]] = {}
+
+def _nested_model(annotation: Any) -> tuple[Optional[str], Any]:
+    """("model", Model) for Model/Optional[Model] and ("list", Model) for list[Model] fields"""
+    tp = _unwrap_annotated(annotation)
+    if get_origin(tp) in (Union, UnionType):
+        args = [arg for arg in get_args(tp) if arg is not type(None)]
+        if len(args) != 1:
+            return None, None
+        tp = _unwrap_annotated(args[0])
+    if _is_pydantic_model(tp):
+        return "model", tp
+    if _is_model_list(tp):
+        return "list", _unwrap_annotated(get_args(tp)[0])
+    return None, None
+
+def _construct_plan(model: Any) -> tuple[tuple[str, Optional[str], Optional[str], Any], ...]:
+    plan = _CONSTRUCT_PLANS.get(model)
+    if plan is None:
+        plan = _CONSTRUCT_PLANS[model] = tuple(
+            (name, field.alias, *_nested_model(field.annotation))
+            for name, field in model.model_fields.items()
+        )
+    return plan
+
+def _construct(model: Any, data: Any) -> Any:
+    """Model instance with only the model fields of data (dict or object), without validation"""
+    if isinstance(data, model):
+        return data
+    is_mapping = isinstance(data, Mapping)
+    values: dict[str, Any] = {}
+    for name, alias, kind, nested in _construct_plan(model):
+        if is_mapping:
+            value = data.get(alias, _MISSING) if alias else _MISSING
+            if value is _MISSING:
+                value = data.get(name, _MISSING)
+        else:
+            value = getattr(data, name, _MISSING)
+        if value is _MISSING:
+            continue
+        if value is not None:
+            if kind == "model":
+                value = _construct(nested, value)
+            elif kind == "list" and isinstance(value, (list, tuple)):
+                value = [_construct(nested, item) for item in value]
+        values[name] = value
+    return model.model_construct(**values)
+
+def construct_response(body: Any, response_type: Any) -> Any:
+    """
+    Builds the body (dicts, ORM objects or model instances) into instances of the
+    response type (Model or list[Model]) without validating it, keeping only the
+    model fields (also of nested models), so dumping it never sends other keys or
+    attributes. Returns None for other response types.
+    """
+    response_type = _unwrap_annotated(response_type)
+    if _is_pydantic_model(response_type):
+        return _construct(response_type, body)
+    if _is_model_list(response_type) and isinstance(body, (list, tuple)):
+        model = _unwrap_annotated(get_args(response_type)[0])
+        return [_construct(model, item) for item in body]
+    return None
+
+_REGISTRY: dict[Callable, EndpointMetadata] = {}
+
+def endpoint_metadata(func: Callable) -> EndpointMetadata:
+    """
+    Returns the metadata of the handler. Decorator wrappers (functools.wraps)
+    and bound methods resolve to the original function, so every
+    decorator in the stack shares the same entry.
+    If type hints can't be resolved yet (i.e. forward references) the raw
+    annotations are used and resolution is retried on the next lookup.
+    """
+    original = inspect.unwrap(getattr(func, "__func__", func))
+    original = getattr(original, "__func__", original)
+    metadata = _REGISTRY.get(original)
+    if metadata is not None:
+        return metadata
+    try:
+        hints = get_type_hints(original, include_extras=True)
+    # pylint: disable-next=W0718
+    except Exception:
+        return EndpointMetadata(original, dict(getattr(original, "__annotations__", {}) or {}))
+    metadata = EndpointMetadata(original, hints)
+    _REGISTRY[original] = metadata
+    return metadata
@@ -1,13 +1,16 @@
 """
 Utility methods for controller related things
 """
-from typing import Any, Annotated, Type, Optional, get_origin, get_args, Mapping, get_type_hints
+from typing import Any, Annotated, Optional, Type, get_origin, get_args, Mapping, TYPE_CHECKING
 import inspect
 from pydantic import BaseModel
 
 from ..request import Request
-from ..response import Response
 from ..media_types import MediaType
+from ..executors import executors
+
+if TYPE_CHECKING:
+    from pydantic import TypeAdapter
 
 def _get_handler_dict(obj: Any) -> dict[str, Any]:
     """Return or create the _handler dict on an object."""
@@ -33,8 +36,22 @@ def _is_subclass(x: Any, base: Type) -> bool:
 def _is_pydantic_model(tp: Any) -> bool:
     return _is_subclass(tp, BaseModel)
 
-def _build_model(model_cls: Type[BaseModel], data: Any) -> BaseModel:
-    return model_cls.model_validate(data)  # type: ignore[attr-defined]
+async def _validate_json_payload(req: "Request", adapter: "TypeAdapter", raw: bytes) -> Any:
+    """
+    Validates the raw json body with the TypeAdapter (parsed and validated
+    in one step, without building intermediate dicts). Bodies with at least
+    REQUEST_VALIDATION_OFFLOAD_THRESHOLD bytes are validated in a worker thread.
+    Raises pydantic.ValidationError (also for invalid json).
+    """
+    get_conf = req.app.get_conf
+    # None keeps the strict setting of the model config
+    strict: Optional[bool] = True if get_conf("STRICT_REQUEST_VALIDATION", False) else None
+    if not raw:
+        return adapter.validate_python({}, strict=strict)
+    threshold: Optional[int] = get_conf("REQUEST_VALIDATION_OFFLOAD_THRESHOLD", None)
+    if threshold is not None and len(raw) >= threshold:
+        return await executors.run(adapter.validate_json, raw, strict=strict)
+    return adapter.validate_json(raw, strict=strict)
 
 def _content_type_matches(incoming: str, expected: "MediaType") -> bool:
     """
@@ -69,20 +86,3 @@ async def _read_payload_for_consumes(req: "Request", mt: "MediaType") -> Mapping
         return await req.form_and_files()
     #extend with additional types if needed.
     return {}
-
-def _extract_response_type(func) -> Optional[Type[Any]]:
-    """
-    If the function is annotated as -> Response[T], return T; else None.
-    """
-    hints = get_type_hints(func, include_extras=True)
-    ret = hints.get("return")
-    if ret is None:
-        return None
-    if get_origin(ret) is Response:
-        args = get_args(ret)
-        if args:
-            t = args[0]
-            if get_origin(t) is Annotated:  # peel Annotated[T, ...]
-                t = get_args(t)[0]
-            return t
-    return None
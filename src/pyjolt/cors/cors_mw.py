@@ -15,10 +15,10 @@ class CORSMiddleware(MiddlewareBase):
     """
 
     async def middleware(self, req: "Request") -> "Response":
-        scope = req.scope
+        headers = req.headers
         cors_opts = self._resolve_cors_options(cast(Callable, req.route_handler))
-        origin = self._get_header(scope, "origin")
-        is_preflight = (req.method == "OPTIONS") and bool(self._get_header(scope, "access-control-request-method"))
+        origin = headers.get("origin")
+        is_preflight = (req.method == "OPTIONS") and bool(headers.get("access-control-request-method"))
 
         if cors_opts["enabled"] and origin:
             if not self._origin_allowed(origin, cors_opts["allow_origins"]):
@@ -28,7 +28,7 @@ class CORSMiddleware(MiddlewareBase):
                 }).status(403)
 
             if is_preflight:
-                return self._handle_preflight(scope, req, origin, cors_opts)
+                return self._handle_preflight(req, origin, cors_opts)
 
             # Wrap send to inject CORS headers on normal responses
             #pylint: disable-next=W0212
@@ -36,16 +36,9 @@ class CORSMiddleware(MiddlewareBase):
 
         return await self.next(req)
 
-    def _get_header(self, scope, name: str) -> Optional[str]:
-        target = name.lower().encode("latin1")
-        for k, v in scope.get("headers", []):
-            if k.lower() == target:
-                try:
-                    return v.decode("latin1")
-                #pylint: disable-next=W0718
-                except Exception:
-                    return None
-        return None
+    def applies_to(self, route_handler: Callable) -> bool:
+        """Endpoints with @no_cors skip the CORS middleware"""
+        return not getattr(route_handler, "_disable_cors", False)
 
     def _normalize_list(self, v, *, upper: bool = False) -> list[str]:
         if v is None:
@@ -162,9 +155,9 @@ class CORSMiddleware(MiddlewareBase):
             headers.append((b"access-control-expose-headers", ", ".join(expose).encode("latin1")))
         return headers
 
-    def _handle_preflight(self, scope, req: "Request", origin: str, cors_opts: dict) -> "Response":
-        acr_method = self._get_header(scope, "access-control-request-method")
-        acr_headers = self._get_header(scope, "access-control-request-headers")
+    def _handle_preflight(self, req: "Request", origin: str, cors_opts: dict) -> "Response":
+        acr_method = req.headers.get("access-control-request-method")
+        acr_headers = req.headers.get("access-control-request-headers")
 
         if(acr_method and cors_opts["allow_methods"] 
            and acr_method.upper() not in cors_opts["allow_methods"]):
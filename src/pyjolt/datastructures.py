@@ -0,0 +1,264 @@
+"""
+Immutable multi-value views of request headers, query parameters and cookies
+and the mutable (pre-encoded) response headers.
+Views are built once per request (on first access) from the raw ASGI data
+and can be looked up with str or bytes keys.
+"""
+from collections.abc import Iterable, Iterator, Mapping, MutableMapping
+from typing import Any, Optional
+from urllib.parse import parse_qsl
+
+from .media_types import MediaType
+
+class MultiValueView(Mapping[str, Any]):
+    """
+    Read-only mapping which keeps every value of repeated keys.
+    Indexing returns a single value (see subclasses), getlist returns all of them.
+    """
+    __slots__ = ("_pairs", "_index")
+
+    #: lookups lowercase the key (headers)
+    case_insensitive: bool = False
+
+    def __init__(self, pairs: Iterable[tuple[str, str]]):
+        self._pairs: tuple[tuple[str, str], ...] = tuple(pairs)
+        index: dict[str, list[str]] = {}
+        for key, value in self._pairs:
+            values = index.get(key)
+            if values is None:
+                index[key] = [value]
+            else:
+                values.append(value)
+        self._index = index
+
+    def _normalize(self, key: str|bytes) -> str:
+        if isinstance(key, bytes):
+            key = key.decode("latin1")
+        return key.lower() if self.case_insensitive else key
+
+    def _value(self, key: str, values: list[str]) -> Any:
+        """Value returned for key (first value by default)"""
+        return values[0]
+
+    def __getitem__(self, key: str|bytes) -> Any:
+        key = self._normalize(key)
+        return self._value(key, self._index[key])
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, (str, bytes)):
+            return False
+        return self._normalize(key) in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def getlist(self, key: str|bytes) -> list[str]:
+        """All values of the key in the order they were received"""
+        return list(self._index.get(self._normalize(key), ()))
+
+    def getone(self, key: str|bytes, default: Optional[str] = None) -> Optional[str]:
+        """First value of the key"""
+        values = self._index.get(self._normalize(key))
+        return values[0] if values else default
+
+    def multi_items(self) -> list[tuple[str, str]]:
+        """All (key, value) pairs including repeated keys"""
+        return list(self._pairs)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self._pairs)!r})"
+
+class Headers(MultiValueView):
+    """
+    Request headers. Keys are lowercase and lookups are case-insensitive.
+    Repeated headers are combined with ", " ("; " for cookie) when indexed,
+    getlist returns the individual values.
+    """
+    __slots__ = ()
+    case_insensitive = True
+
+    def __init__(self, raw: Iterable[tuple[bytes, bytes]]):
+        super().__init__(
+            (key.decode("latin1").lower(), value.decode("latin1"))
+            for key, value in raw
+        )
+
+    def _value(self, key: str, values: list[str]) -> Any:
+        if len(values) == 1:
+            return values[0]
+        return ("; " if key == "cookie" else ", ").join(values)
+
+class QueryParams(MultiValueView):
+    """
+    Parsed query string. Indexing returns a string or a list
+    of strings if the parameter is repeated.
+    """
+    __slots__ = ()
+
+    def __init__(self, query_string: bytes|str):
+        if isinstance(query_string, bytes):
+            query_string = query_string.decode("utf-8", "replace")
+        super().__init__(parse_qsl(query_string))
+
+    def _value(self, key: str, values: list[str]) -> Any:
+        return values[0] if len(values) == 1 else list(values)
+
+class Cookies(MultiValueView):
+    """
+    Request cookies parsed from all cookie headers. Indexing returns the first
+    value of a cookie (the most specific one as sent by the client).
+    """
+    __slots__ = ()
+
+    def __init__(self, cookie_headers: Iterable[str]):
+        pairs: list[tuple[str, str]] = []
+        for header in cookie_headers:
+            for chunk in header.split(";"):
+                name, sep, value = chunk.partition("=")
+                name = name.strip()
+                if not sep or not name:
+                    continue
+                value = value.strip()
+                if len(value) > 1 and value[0] == value[-1] == '"':
+                    value = value[1:-1]
+                pairs.append((name, value))
+        super().__init__(pairs)
+
+#: encoded names of common response headers
+_HEADER_NAMES: dict[str, bytes] = {
+    name: name.encode("latin1") for name in (
+        "content-type", "content-length", "content-encoding", "content-disposition",
+        "content-range", "accept-ranges", "cache-control", "etag", "last-modified",
+        "location", "set-cookie", "vary", "allow", "x-content-type-options",
+        "access-control-allow-origin", "access-control-allow-methods",
+        "access-control-allow-headers", "access-control-expose-headers",
+        "access-control-allow-credentials", "access-control-max-age",
+    )
+}
+#: encoded values of common response headers (content types etc.)
+_HEADER_VALUES: dict[str, bytes] = {
+    value: value.encode("latin1") for value in (
+        *(media_type.value for media_type in MediaType),
+        "text/html; charset=utf-8", "text/plain; charset=utf-8",
+        "bytes", "true", "*", "no-cache", "no-store", "nosniff", "Origin",
+    )
+}
+# max number of header names learned at runtime
+_MAX_HEADER_NAMES: int = 512
+
+def encode_header_name(name: str|bytes) -> bytes:
+    """Lowercase, encoded header name (common names are cached)"""
+    if isinstance(name, bytes):
+        return name.lower()
+    encoded = _HEADER_NAMES.get(name)
+    if encoded is None:
+        encoded = name.lower().encode("latin1")
+        if len(_HEADER_NAMES) < _MAX_HEADER_NAMES:
+            _HEADER_NAMES[name] = encoded
+    return encoded
+
+def encode_header_value(value: Any) -> bytes:
+    """Encoded header value (common values are pre-encoded)"""
+    if isinstance(value, bytes):
+        return value
+    if not isinstance(value, str):
+        value = str(value)
+    encoded = _HEADER_VALUES.get(value)
+    if encoded is None:
+        encoded = value.encode("utf-8")
+    return encoded
+
+class ResponseHeaders(MutableMapping[str, str]):
+    """
+    Response headers stored as pre-encoded (name, value) byte pairs which are
+    passed to the ASGI server as they are. Names are lowercase and lookups are
+    case-insensitive. Setting a header replaces all its values, add() appends
+    a repeated header (i.e. set-cookie).
+    """
+    __slots__ = ("_raw",)
+
+    def __init__(self, headers: Optional[Mapping[str, Any]|Iterable[tuple[Any, Any]]] = None):
+        self._raw: list[tuple[bytes, bytes]] = []
+        if headers is None:
+            return
+        if isinstance(headers, ResponseHeaders):
+            self._raw = list(headers.raw)
+        elif isinstance(headers, Mapping):
+            for key, value in headers.items():
+                self[key] = value
+        else:
+            for key, value in headers:
+                self.add(key, value)
+
+    @property
+    def raw(self) -> list[tuple[bytes, bytes]]:
+        """Encoded (name, value) pairs in the order they were set"""
+        return self._raw
+
+    def add(self, key: str|bytes, value: Any) -> None:
+        """Appends a header without replacing existing values"""
+        self._raw.append((encode_header_name(key), encode_header_value(value)))
+
+    def getlist(self, key: str|bytes) -> list[str]:
+        """All values of the header"""
+        name = encode_header_name(key)
+        return [value.decode("utf-8") for raw_name, value in self._raw if raw_name == name]
+
+    def __getitem__(self, key: str|bytes) -> str:
+        name = encode_header_name(key)
+        values = [value for raw_name, value in self._raw if raw_name == name]
+        if not values:
+            raise KeyError(key)
+        if len(values) == 1:
+            return values[0].decode("utf-8")
+        return ", ".join(value.decode("utf-8") for value in values)
+
+    def __setitem__(self, key: str|bytes, value: Any) -> None:
+        name = encode_header_name(key)
+        encoded = encode_header_value(value)
+        raw = self._raw
+        for i, (raw_name, _) in enumerate(raw):
+            if raw_name == name:
+                raw[i] = (name, encoded)
+                # drops the other values of a repeated header
+                self._raw = raw[:i + 1] + [pair for pair in raw[i + 1:] if pair[0] != name]
+                return
+        raw.append((name, encoded))
+
+    def __delitem__(self, key: str|bytes) -> None:
+        name = encode_header_name(key)
+        raw = [pair for pair in self._raw if pair[0] != name]
+        if len(raw) == len(self._raw):
+            raise KeyError(key)
+        self._raw = raw
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, (str, bytes)):
+            return False
+        name = encode_header_name(key)
+        for raw_name, _ in self._raw:
+            if raw_name == name:
+                return True
+        return False
+
+    def __iter__(self) -> Iterator[str]:
+        seen: dict[str, None] = {}
+        for raw_name, _ in self._raw:
+            seen.setdefault(raw_name.decode("latin1"), None)
+        return iter(seen)
+
+    def __len__(self) -> int:
+        return len({raw_name for raw_name, _ in self._raw})
+
+    def copy(self) -> "ResponseHeaders":
+        """Shallow copy"""
+        return ResponseHeaders(self)
+
+    def __reduce__(self):
+        return (ResponseHeaders, (list(self._raw),))
+
+    def __repr__(self) -> str:
+        return f"ResponseHeaders({[(k.decode('latin1'), v.decode('utf-8')) for k, v in self._raw]!r})"
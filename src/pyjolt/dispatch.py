@@ -0,0 +1,72 @@
+"""
+Precompiled per-endpoint dispatch pipelines.
+Built once for every route handler (PyJolt.build) so that a request runs
+through a fixed tuple of async stages instead of re-resolving the middleware
+chain, controller hooks and sync/async calls on every request.
+"""
+from typing import Any, Awaitable, Callable, Sequence, TYPE_CHECKING
+
+from .middleware import MiddlewareBase
+from .controller.decorators import compile_endpoint
+from .utilities import ensure_async
+
+if TYPE_CHECKING:
+    from .request import Request
+    from .response import Response
+
+Stage = Callable[["Request"], Awaitable["Response"]]
+
+class NextStage:
+    """
+    The `next_app` given to the middleware instance at `position`.
+    Middleware instances are shared by all routes, the stage which
+    follows them is looked up in the pipeline of the current request.
+    """
+    __slots__ = ("_position",)
+
+    def __init__(self, position: int):
+        self._position = position
+
+    def __call__(self, req: "Request") -> Awaitable["Response"]:
+        #pylint: disable-next=W0212
+        return req._pipeline.next_stages[self._position](req)
+
+def _middleware_stage(middleware: Any) -> Stage:
+    """
+    Resolves the callable of a middleware instance. Plain MiddlewareBase
+    subclasses are called through their middleware method directly.
+    """
+    if (isinstance(middleware, MiddlewareBase)
+            and type(middleware).__call__ is MiddlewareBase.__call__):
+        return ensure_async(middleware.middleware)
+    return middleware
+
+def _endpoint_stage(route_handler: Callable) -> Stage:
+    """Calls the compiled route handler with the matched path variables"""
+    endpoint = compile_endpoint(route_handler)
+
+    async def call_endpoint(req: "Request") -> "Response":
+        return await endpoint(req, **req.route_parameters)
+    return call_endpoint
+
+class RoutePipeline:
+    """
+    Dispatch pipeline of a single route handler.
+    `entry` is the first stage. `next_stages[i]` is the stage which runs
+    after the middleware at position i (only middleware which applies
+    to the handler is part of the pipeline).
+    """
+    __slots__ = ("entry", "next_stages")
+
+    def __init__(self, route_handler: Callable, middleware: Sequence[Any]):
+        stage: Stage = _endpoint_stage(route_handler)
+        next_stages: list[Stage] = [stage] * len(middleware)
+        for position in range(len(middleware) - 1, -1, -1):
+            instance = middleware[position]
+            next_stages[position] = stage
+            applies_to = getattr(instance, "applies_to", None)
+            if applies_to is not None and not applies_to(route_handler):
+                continue
+            stage = _middleware_stage(instance)
+        self.entry: Stage = stage
+        self.next_stages: tuple[Stage, ...] = tuple(next_stages)
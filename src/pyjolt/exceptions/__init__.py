@@ -6,6 +6,7 @@ from .http_exceptions import (BaseHttpException,
                             StaticAssetNotFound,
                             AborterException,
                             MissingRequestData,
+                            PayloadTooLarge,
                             SchemaValidationError,
                             PydanticSchemaValidationError,
                             AuthenticationException,
@@ -26,7 +27,8 @@ from .runtime_exceptions import (CustomException,
                                 InvalidWebsocketHandler,
                                 MethodNotControllerMethod,
                                 UnexpectedDecorator,
-                                MissingDecoratorError)
+                                MissingDecoratorError,
+                                ClientDisconnected)
 
 from .exception_handler import ExceptionHandler, handles
 from werkzeug.exceptions import NotFound, MethodNotAllowed
@@ -36,6 +38,7 @@ __all__ = ['CustomException',
             'StaticAssetNotFound',
             'AborterException',
             'MissingRequestData',
+            'PayloadTooLarge',
             'SchemaValidationError',
             'PydanticSchemaValidationError',
             'AuthenticationException',
@@ -48,6 +51,7 @@ __all__ = ['CustomException',
             'Jinja2NotInitilized',
             'MissingExtension',
             'MissingDecoratorError',
+            'ClientDisconnected',
             'MissingDependencyInjectionMethod',
             'MissingResponseObject',
             'MissingRouterInstance',
@@ -5,7 +5,7 @@ from functools import wraps
 from typing import Callable, TYPE_CHECKING, Type
 
 from ..controller.decorators import AsyncMethod, P, R
-from ..controller.utilities import _extract_response_type
+from ..controller.endpoint_metadata import endpoint_metadata
 from ..utilities import run_sync_or_async
 
 if TYPE_CHECKING:
@@ -16,13 +16,16 @@ if TYPE_CHECKING:
 class ExceptionHandler:
 
     def __init__(self, app: "PyJolt"):
-        self._exception_mapping: dict[str, Callable] = {}
+        self._exception_mapping: dict[Type[BaseException], Callable] = {}
         self._app = app
 
-    def get_exception_mapping(self) -> dict[str, Callable]:
-        """Produces exception mapping"""
+    def get_exception_mapping(self) -> dict[Type[BaseException], Callable]:
+        """
+        Produces exception mapping (exception class -> handler method).
+        Handlers also handle subclasses of their exceptions (see PyJolt.exception_handler_for).
+        """
         owner_cls: "type[ExceptionHandler]|None" = self.__class__ or None
-        handlers: dict[str, Callable] = {}
+        handlers: dict[Type[BaseException], Callable] = {}
         if owner_cls is None:
             return handlers
 
@@ -32,7 +35,7 @@ class ExceptionHandler:
                 continue
             handled_exceptions = getattr(method, "_handled_exceptions", []) or []
             for handled_exception in handled_exceptions:
-                handlers[handled_exception.__name__] = method
+                handlers[handled_exception] = method
             
         self._exception_mapping = handlers
         return handlers
@@ -44,7 +47,7 @@ class ExceptionHandler:
 def handles(*exceptions: Type[Exception]):
     """Decorator registers exceptions with handler method"""
     def decorator(func: Callable[P,R]) -> AsyncMethod:
-        expected_body = _extract_response_type(func)
+        expected_body = endpoint_metadata(func).response_type
         @wraps(func)
         async def wrapper(self, *args: P.args, **kwargs: P.kwargs) -> "Response":
             # Request is auto-injected as first arg after self
@@ -82,6 +82,22 @@ class MissingRequestData(BaseHttpException):
             data
         )
 
+class PayloadTooLarge(BaseHttpException):
+    """
+    Request body (or a part of a multipart body) exceeds the configured size limit.
+    Answered with a generic 413 response if not handled by an exception handler.
+    """
+    def __init__(self, message: str = "Request body too large",
+                 status_code: int = 413,
+                 status: str = "error",
+                 data: Any = None):
+        super().__init__(
+            message,
+            status_code,
+            status,
+            data
+        )
+
 class SchemaValidationError(BaseHttpException, PydanticValidationError):
     """
     Exception for schema validation errors
@@ -94,3 +94,11 @@ class InvalidWebsocketHandler(CustomException):
     """
     def __init__(self):
         self.message = """This si not a valid websocket handler method for ClassBlueprint"""
+
+class ClientDisconnected(CustomException):
+    """
+    The client disconnected before the request body was received.
+    Responses aren't sent for unhandled ClientDisconnected errors.
+    """
+    def __init__(self, message: str = "Client disconnected"):
+        self.message = message
@@ -0,0 +1,252 @@
+"""
+Executor subsystem for sync handlers, hooks and offloaded work.
+Holds named, instrumented thread pools (the "default" pool runs sync handlers,
+hooks and exception handlers) and an optional process pool for CPU-bound
+functions decorated with @offload(process=True).
+Pools are configured by the application (EXECUTOR_* configs) and created on first use.
+"""
+import asyncio
+import importlib
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial, wraps
+from typing import Any, Awaitable, Callable, Optional
+
+DEFAULT_POOL: str = "default"
+
+class PoolStats:
+    """
+    Counters of a single pool. Wait time is the time a submitted call
+    spends in the queue before a worker picks it up.
+    """
+    __slots__ = ("_lock", "submitted", "started", "completed", "failed",
+                 "wait_time_total", "wait_time_max")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.submitted: int = 0
+        self.started: int = 0
+        self.completed: int = 0
+        self.failed: int = 0
+        self.wait_time_total: float = 0.0
+        self.wait_time_max: float = 0.0
+
+    def on_submit(self) -> None:
+        with self._lock:
+            self.submitted += 1
+
+    def on_start(self, wait_time: float) -> None:
+        with self._lock:
+            self.started += 1
+            self.wait_time_total += wait_time
+            if wait_time > self.wait_time_max:
+                self.wait_time_max = wait_time
+
+    def on_done(self, failed: bool) -> None:
+        with self._lock:
+            self.completed += 1
+            if failed:
+                self.failed += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "queued": self.submitted - self.started,
+                "running": self.started - self.completed,
+                "wait_time_avg_ms": (self.wait_time_total / self.started * 1000.0
+                                     if self.started else 0.0),
+                "wait_time_max_ms": self.wait_time_max * 1000.0,
+            }
+
+class InstrumentedThreadPoolExecutor(ThreadPoolExecutor):
+    """ThreadPoolExecutor which records queue depth and wait times"""
+
+    def __init__(self, max_workers: Optional[int] = None, thread_name_prefix: str = ""):
+        super().__init__(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self.stats = PoolStats()
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        stats = self.stats
+        submitted_at = time.perf_counter()
+
+        def _instrumented() -> Any:
+            stats.on_start(time.perf_counter() - submitted_at)
+            failed = True
+            try:
+                result = fn(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                stats.on_done(failed)
+
+        stats.on_submit()
+        return super().submit(_instrumented)
+
+class InstrumentedProcessPoolExecutor(ProcessPoolExecutor):
+    """
+    ProcessPoolExecutor which records submitted/completed calls.
+    Wait times are not available (calls start in the worker processes).
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        super().__init__(max_workers=max_workers)
+        self.stats = PoolStats()
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        stats = self.stats
+        stats.on_submit()
+        future = super().submit(fn, *args, **kwargs)
+        # counts as started immediately (no wait time is known)
+        stats.on_start(0.0)
+        future.add_done_callback(lambda f: stats.on_done(f.cancelled() or f.exception() is not None))
+        return future
+
+class Executors:
+    """
+    Registry of named executor pools.
+    Pool sizes: `default_threads` for the default pool, `pools` maps additional
+    pool names to their thread counts, `process_workers` sizes the process pool.
+    None means the concurrent.futures default size.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pool_sizes: dict[str, Optional[int]] = {DEFAULT_POOL: None}
+        self._process_workers: Optional[int] = None
+        self._pools: dict[str, InstrumentedThreadPoolExecutor] = {}
+        self._process_pool: Optional[InstrumentedProcessPoolExecutor] = None
+
+    def configure(self, default_threads: Optional[int] = None,
+                  pools: Optional[dict[str, Optional[int]]] = None,
+                  process_workers: Optional[int] = None) -> None:
+        """
+        Sets pool sizes. Already created pools are shut down (without waiting)
+        and recreated with the new size on next use.
+        """
+        with self._lock:
+            self._pool_sizes = {DEFAULT_POOL: default_threads, **(pools or {})}
+            self._process_workers = process_workers
+            old_pools = list(self._pools.values())
+            self._pools = {}
+            old_process_pool = self._process_pool
+            self._process_pool = None
+        for pool in old_pools:
+            pool.shutdown(wait=False)
+        if old_process_pool is not None:
+            old_process_pool.shutdown(wait=False)
+
+    def get(self, name: str = DEFAULT_POOL) -> InstrumentedThreadPoolExecutor:
+        """Returns the thread pool with the given name"""
+        pool = self._pools.get(name)
+        if pool is not None:
+            return pool
+        with self._lock:
+            pool = self._pools.get(name)
+            if pool is None:
+                if name not in self._pool_sizes:
+                    raise ValueError(f"Unknown executor pool '{name}'. Configure it with EXECUTOR_POOLS.")
+                pool = InstrumentedThreadPoolExecutor(self._pool_sizes[name],
+                                                      thread_name_prefix=f"pyjolt-{name}")
+                self._pools[name] = pool
+            return pool
+
+    @property
+    def process_pool(self) -> InstrumentedProcessPoolExecutor:
+        """Process pool for @offload(process=True) functions"""
+        if self._process_pool is None:
+            with self._lock:
+                if self._process_pool is None:
+                    self._process_pool = InstrumentedProcessPoolExecutor(self._process_workers)
+        return self._process_pool
+
+    async def run(self, func: Callable[..., Any], *args: Any,
+                  pool: str = DEFAULT_POOL, **kwargs: Any) -> Any:
+        """Runs sync callable in the named thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.get(pool), partial(func, *args, **kwargs))
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """
+        Metrics of all created pools: max_workers, submitted, completed, failed,
+        queued (waiting for a worker), running, wait_time_avg_ms, wait_time_max_ms
+        """
+        out: dict[str, dict[str, Any]] = {}
+        pools: dict[str, Executor] = {**self._pools}
+        if self._process_pool is not None:
+            pools["process"] = self._process_pool
+        for name, pool in pools.items():
+            out[name] = {
+                #pylint: disable-next=W0212
+                "max_workers": getattr(pool, "_max_workers", None),
+                **pool.stats.snapshot(),  # type: ignore[attr-defined]
+            }
+        return out
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shuts down all pools. Pools are recreated on next use."""
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools = {}
+            process_pool = self._process_pool
+            self._process_pool = None
+        for pool in pools:
+            pool.shutdown(wait=wait)
+        if process_pool is not None:
+            process_pool.shutdown(wait=wait)
+
+#: executors used by the framework (configured by PyJolt)
+executors = Executors()
+
+def _run_offloaded(module_name: str, qualname: str, args: tuple, kwargs: dict) -> Any:
+    """
+    Entry point in worker processes. Resolves the decorated function by
+    import path and calls the original (undecorated) function.
+    """
+    target: Any = importlib.import_module(module_name)
+    for part in qualname.split("."):
+        target = getattr(target, part)
+    target = getattr(target, "__wrapped__", target)
+    return target(*args, **kwargs)
+
+def offload(pool: str = DEFAULT_POOL, *, process: bool = False
+            ) -> Callable[[Callable[..., Any]], Callable[..., Awaitable[Any]]]:
+    """
+    Decorator which turns a sync function into an async function running
+    in the named thread pool. With process=True the function runs in the
+    process pool (for CPU-bound work). Process offloaded functions must be
+    module level functions and their arguments/results must be picklable.
+    ```
+    @offload(process=True)
+    def render_report(data: dict) -> bytes:
+        ...
+
+    report = await render_report(data)
+    ```
+    """
+    def decorator(func: Callable[..., Any]) -> Callable[..., Awaitable[Any]]:
+        if asyncio.iscoroutinefunction(func):
+            raise TypeError(f"@offload can only be used on sync functions ({func.__qualname__})")
+
+        if process:
+            if "<locals>" in func.__qualname__:
+                raise TypeError("@offload(process=True) requires a module level function")
+
+            @wraps(func)
+            async def process_wrapper(*args: Any, **kwargs: Any) -> Any:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    executors.process_pool,
+                    _run_offloaded, func.__module__, func.__qualname__, args, kwargs
+                )
+            return process_wrapper
+
+        @wraps(func)
+        async def thread_wrapper(*args: Any, **kwargs: Any) -> Any:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executors.get(pool), partial(func, *args, **kwargs))
+        return thread_wrapper
+    return decorator
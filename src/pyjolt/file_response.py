@@ -0,0 +1,180 @@
+"""
+File responses.
+A single engine for all file responses (static files, Response.send_file,
+range requests, admin downloads). Response bodies are never read into memory
+at once: the file path (and byte range) is attached to the response and
+send_response hands it to the server via the ASGI pathsend/zerocopy extensions
+(if the server supports them) or reads and sends it in chunks in a worker thread.
+"""
+import os
+import stat as stat_module
+import mimetypes
+from typing import Optional, TypedDict, TYPE_CHECKING
+
+from .executors import executors
+from .conditional.validators import etag_matches, http_date, parse_http_date
+from .http_statuses import HttpStatus
+
+if TYPE_CHECKING:
+    from .response import Response
+
+#: size of chunks read and sent when the server has no zero-copy extension
+FILE_CHUNK_SIZE: int = 256 * 1024
+
+class FileSegment(TypedDict):
+    """Zero-copy parameters of a response (see Response.zero_copy)"""
+    file_path: str
+    start: int
+    length: int
+
+def file_etag(stat: os.stat_result, suffix: str = "") -> str:
+    """Entity tag of a file (size and modification time)"""
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}{suffix}"'
+
+class RangeNotSatisfiable(ValueError):
+    """The requested byte range starts after the end of the file"""
+
+def parse_range(range_header: str, size: int) -> Optional[tuple[int, int]]:
+    """
+    Parses a single byte range (bytes=0-99, bytes=100-, bytes=-100).
+    Returns (start, end) with an inclusive end or None if the header should
+    be ignored (invalid or multiple ranges).
+    Raises RangeNotSatisfiable if no byte of the range is in the file.
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep or not (first or last):
+        return None
+    try:
+        start: Optional[int] = int(first) if first else None
+        end: Optional[int] = int(last) if last else None
+    except ValueError:
+        return None
+    if start is None:
+        # suffix range: the last n bytes
+        if end == 0 or size == 0:
+            raise RangeNotSatisfiable(range_header)
+        return max(size - end, 0), size - 1 # type: ignore[operator]
+    if end is not None and start > end:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable(range_header)
+    return start, size - 1 if end is None else min(end, size - 1)
+
+def _if_range_matches(if_range: str, etag: Optional[str], last_modified: Optional[str]) -> bool:
+    if_range = if_range.strip()
+    if if_range.startswith(('"', 'W/"')):
+        return etag_matches(etag, if_range, weak=False)
+    since = parse_http_date(if_range)
+    modified = parse_http_date(last_modified)
+    return since is not None and modified is not None and modified <= since
+
+def prepare_file_response(res: "Response", path: str, *,
+                          content_type: Optional[str] = None,
+                          filename: Optional[str] = None,
+                          range_header: Optional[str] = None,
+                          stat: Optional[os.stat_result] = None) -> "Response":
+    """
+    Turns the response into a file response without reading the file.
+    Sets Content-Type, Content-Length, Accept-Ranges, ETag and Last-Modified
+    (unless already set), answers conditional requests (304/412) and serves
+    a single byte range (206/416) if range_header is given.
+    Raises FileNotFoundError if the path isn't a file.
+    """
+    if stat is None:
+        stat = os.stat(path)
+    if not stat_module.S_ISREG(stat.st_mode):
+        raise FileNotFoundError(path)
+    size: int = stat.st_size
+    headers = res.headers
+    if content_type is None:
+        guessed, _ = mimetypes.guess_type(path)
+        content_type = guessed or "application/octet-stream"
+    headers["content-type"] = content_type
+    headers["accept-ranges"] = "bytes"
+    if filename:
+        headers["content-disposition"] = f'attachment; filename="{filename}"'
+    if "etag" not in headers:
+        headers["etag"] = file_etag(stat)
+    if "last-modified" not in headers:
+        headers["last-modified"] = http_date(stat.st_mtime_ns / 1e9)
+    if res.check_preconditions():
+        return res
+
+    start, length = 0, size
+    status = HttpStatus.OK
+    if range_header:
+        if_range: Optional[str] = res.request.headers.get("if-range")
+        if if_range is not None and not _if_range_matches(if_range, headers.get("etag"),
+                                                          headers.get("last-modified")):
+            range_header = None
+    if range_header:
+        try:
+            byte_range = parse_range(range_header, size)
+        except RangeNotSatisfiable:
+            headers["content-range"] = f"bytes */{size}"
+            res.body = None
+            return res.status(HttpStatus.RANGE_NOT_SATISFIABLE)
+        if byte_range is not None:
+            start, end = byte_range
+            length = end - start + 1
+            headers["content-range"] = f"bytes {start}-{end}/{size}"
+            status = HttpStatus.PARTIAL_CONTENT
+
+    headers["content-length"] = str(length)
+    res.set_zero_copy(FileSegment(file_path=path, start=start, length=length))
+    return res.status(status)
+
+async def send_file_segment(scope: dict, send, segment: FileSegment) -> None:
+    """
+    Sends the file segment as the response body.
+    Uses the http.response.pathsend extension for whole files and
+    http.response.zerocopy (os.sendfile in the server) for ranges if the
+    server advertises them, else reads and sends the file in chunks (in a worker
+    thread). The body ends early if the file was truncated in the meantime.
+    """
+    path: str = segment["file_path"]
+    start: int = segment["start"]
+    length: int = segment["length"]
+    if length <= 0:
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+        return
+    extensions: dict = scope.get("extensions") or {}
+    if "http.response.pathsend" in extensions and start == 0 and length == os.path.getsize(path):
+        await send({"type": "http.response.pathsend", "path": os.path.abspath(path)})
+        return
+    file = await executors.run(open, path, "rb")
+    try:
+        if "http.response.zerocopy" in extensions:
+            await send({
+                "type": "http.response.zerocopy",
+                "file": file,
+                "offset": start,
+                "count": length,
+                "more_body": False,
+            })
+            return
+        await _send_chunks(file, send, start, length)
+    finally:
+        file.close()
+
+def _read_at(file, offset: int, size: int) -> bytes:
+    if hasattr(os, "pread"):
+        return os.pread(file.fileno(), size, offset)
+    file.seek(offset)
+    return file.read(size)
+
+async def _send_chunks(file, send, start: int, length: int) -> None:
+    position: int = start
+    end: int = start + length
+    while position < end:
+        size = min(FILE_CHUNK_SIZE, end - position)
+        chunk: bytes = await executors.run(_read_at, file, position, size)
+        position += len(chunk)
+        # a short read means the file shrank since it was stat-ed: end the body
+        more_body = len(chunk) == size and position < end
+        await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+        if not more_body:
+            return
@@ -0,0 +1,156 @@
+"""
+Pluggable JSON codecs.
+The application codec (JSON_CODEC config) is used for parsing request bodies,
+serializing response bodies and websocket json messages.
+Codecs produce bytes directly and share the handling of non-JSON types:
+datetimes/dates/times as ISO 8601 strings (UTC as "Z"), UUIDs and Decimals
+as strings, enums by value, sets as lists and pydantic models/dataclasses
+as objects.
+"""
+import json
+import dataclasses
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Protocol, runtime_checkable
+from uuid import UUID
+
+from pydantic import BaseModel
+
+class JsonDecodeError(ValueError):
+    """Raised by codecs for invalid JSON documents"""
+
+@runtime_checkable
+class JsonCodec(Protocol):
+    """JSON codec protocol"""
+    name: str
+
+    def dumps(self, obj: Any) -> bytes:
+        """Serializes object to UTF-8 encoded JSON bytes"""
+        ...
+
+    def loads(self, data: bytes|bytearray|memoryview|str) -> Any:
+        """Parses JSON document. Raises JsonDecodeError for invalid documents."""
+        ...
+
+def _isoformat(value: datetime|time) -> str:
+    text = value.isoformat()
+    if text.endswith("+00:00"):
+        return text[:-6] + "Z"
+    return text
+
+def json_default(obj: Any) -> Any:
+    """
+    Converts objects which are not natively JSON serializable.
+    Shared by all built-in codecs.
+    """
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (datetime, time)):
+        return _isoformat(obj)
+    if isinstance(obj, date):
+        return obj.isoformat()
+    if isinstance(obj, (UUID, Decimal)):
+        return str(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+class StdlibJsonCodec:
+    """Codec based on the json module of the standard library"""
+    name = "stdlib"
+
+    def __init__(self) -> None:
+        self._encoder = json.JSONEncoder(
+            default=json_default, ensure_ascii=False, separators=(",", ":")
+        )
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj).encode("utf-8")
+
+    def loads(self, data: bytes|bytearray|memoryview|str) -> Any:
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        try:
+            return json.loads(data)
+        except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+            raise JsonDecodeError(str(exc)) from exc
+
+class OrjsonCodec:
+    """Codec based on orjson (pip install orjson)"""
+    name = "orjson"
+
+    def __init__(self) -> None:
+        #pylint: disable-next=C0415
+        import orjson
+        self._orjson = orjson
+        self._options = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj, default=json_default, option=self._options)
+
+    def loads(self, data: bytes|bytearray|memoryview|str) -> Any:
+        try:
+            return self._orjson.loads(data)
+        except self._orjson.JSONDecodeError as exc:
+            raise JsonDecodeError(str(exc)) from exc
+
+class MsgspecCodec:
+    """Codec based on msgspec (pip install msgspec)"""
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        #pylint: disable-next=C0415
+        import msgspec
+        self._msgspec = msgspec
+        self._encoder = msgspec.json.Encoder(enc_hook=json_default, decimal_format="string")
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: bytes|bytearray|memoryview|str) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._msgspec.DecodeError as exc:
+            raise JsonDecodeError(str(exc)) from exc
+
+_CODECS: dict[str, type] = {
+    "stdlib": StdlibJsonCodec,
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+}
+
+def get_json_codec(codec: Any = "stdlib") -> JsonCodec:
+    """
+    Resolves the JSON_CODEC configuration value. Accepts a codec name
+    ("stdlib", "orjson", "msgspec" or "auto" - fastest installed codec),
+    a codec class or a codec instance.
+    """
+    if codec is None:
+        codec = "stdlib"
+    if isinstance(codec, str):
+        if codec == "auto":
+            for name in ("orjson", "msgspec"):
+                try:
+                    return _CODECS[name]()
+                except ImportError:
+                    continue
+            return StdlibJsonCodec()
+        codec_cls = _CODECS.get(codec)
+        if codec_cls is None:
+            raise ValueError(f"Unknown JSON_CODEC '{codec}'. Use one of: auto, {', '.join(_CODECS)}")
+        try:
+            return codec_cls()
+        except ImportError as exc:
+            raise ImportError(f"JSON_CODEC '{codec}' requires the {codec} package. "
+                              f"Install it with: pip install {codec}") from exc
+    if isinstance(codec, type):
+        codec = codec()
+    if not isinstance(codec, JsonCodec):
+        raise TypeError("JSON_CODEC must be a codec name or implement dumps(obj) -> bytes and loads(data)")
+    return codec
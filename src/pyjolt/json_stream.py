@@ -0,0 +1,161 @@
+"""
+Incremental parsers for streamed json bodies.
+JsonArrayParser returns the elements of a top-level json array and
+NdjsonSplitter the raw bytes of each line of a newline delimited json body
+as soon as they are complete, so only the current (partial) item is buffered.
+"""
+import re
+import json
+import codecs
+from typing import Any, Optional
+
+_WHITESPACE = b" \t\r\n"
+_SKIP_WHITESPACE = re.compile(r"[ \t\r\n]*")
+_DELIMITERS = frozenset(",] \t\r\n")
+
+class JsonSplitError(ValueError):
+    """The body isn't a json array / valid newline delimited json"""
+
+class JsonArrayParser:
+    """
+    Parses a top-level json array, fed in chunks, element by element.
+    Elements are decoded with the (C accelerated) json decoder. A partial
+    element at the end of a chunk is retried once the buffer has grown enough,
+    so large elements spanning many chunks are not re-parsed on every chunk.
+    """
+    __slots__ = ("_decoder", "_utf8", "_text", "_pending", "_pending_size",
+                 "_started", "_finished", "_expect_item", "_count", "_retry_at")
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._text: str = ""
+        # chunks received while waiting for the rest of a large element
+        self._pending: list[str] = []
+        self._pending_size: int = 0
+        self._started: bool = False
+        self._finished: bool = False
+        # True after "[" or ",", False after an element
+        self._expect_item: bool = True
+        self._count: int = 0
+        self._retry_at: int = 0
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        """Returns the elements completed by the chunk"""
+        try:
+            text = self._utf8.decode(chunk)
+        except UnicodeDecodeError as exc:
+            raise JsonSplitError("Request body is not valid UTF-8") from exc
+        return self._parse(text, final=False)
+
+    def close(self) -> list[Any]:
+        """Returns the remaining elements and checks that the array was complete"""
+        items = self._parse(self._utf8.decode(b"", final=True), final=True)
+        if not self._started:
+            raise JsonSplitError("Request body is empty")
+        if not self._finished:
+            raise JsonSplitError("Incomplete json array")
+        return items
+
+    def _parse(self, chunk: str, final: bool) -> list[Any]:
+        if not final and len(self._text) + self._pending_size + len(chunk) < self._retry_at:
+            self._pending.append(chunk)
+            self._pending_size += len(chunk)
+            return []
+        if self._pending:
+            chunk = "".join(self._pending) + chunk
+            self._pending.clear()
+            self._pending_size = 0
+        text = self._text + chunk if self._text else chunk
+        items: list[Any] = []
+        pos = 0
+        end = len(text)
+        while True:
+            pos = _SKIP_WHITESPACE.match(text, pos).end() # type: ignore[union-attr]
+            if pos == end:
+                break
+            if self._finished:
+                raise JsonSplitError("Unexpected data after the json array")
+            char = text[pos]
+            if not self._started:
+                if char != "[":
+                    raise JsonSplitError("Request body is not a json array")
+                self._started = True
+                pos += 1
+                continue
+            if not self._expect_item:
+                if char == ",":
+                    self._expect_item = True
+                    pos += 1
+                elif char == "]":
+                    self._finished = True
+                    pos += 1
+                else:
+                    raise JsonSplitError(f"Expected ',' or ']' at position {pos}")
+                continue
+            if char == "]":
+                if self._count:
+                    raise JsonSplitError("Invalid json array (trailing comma)")
+                # empty array
+                self._finished = True
+                pos += 1
+                continue
+            if not final and end < self._retry_at:
+                break
+            try:
+                item, item_end = self._decoder.raw_decode(text, pos)
+            except json.JSONDecodeError as exc:
+                if final:
+                    raise JsonSplitError(f"Invalid json array element: {exc.msg}") from exc
+                # probably incomplete: retry when the buffer doubled the partial element
+                self._retry_at = end + (end - pos)
+                break
+            if (not final and text[item_end - 1] not in '"}]'
+                    and (item_end == end or text[item_end] not in _DELIMITERS)):
+                # a number (i.e. "1.", "2e") may continue in the next chunk
+                self._retry_at = end + 1
+                break
+            items.append(item)
+            self._count += 1
+            self._expect_item = False
+            self._retry_at = 0
+            pos = item_end
+        self._text = text[pos:]
+        if self._retry_at:
+            self._retry_at -= pos
+        return items
+
+class NdjsonSplitter:
+    """
+    Splits newline delimited json (application/x-ndjson, JSON Lines),
+    fed in chunks, into the raw bytes of its (non-empty) lines.
+    """
+    __slots__ = ("_buffer", "_pos")
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._pos: int = 0
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        """Returns the lines completed by the chunk"""
+        buffer = self._buffer
+        buffer += chunk
+        lines: list[bytes] = []
+        start = 0
+        newline = buffer.find(b"\n", self._pos)
+        while newline != -1:
+            line = bytes(buffer[start:newline].strip(_WHITESPACE))
+            if line:
+                lines.append(line)
+            start = newline + 1
+            newline = buffer.find(b"\n", start)
+        del buffer[:start]
+        self._pos = len(buffer)
+        return lines
+
+    def close(self) -> Optional[bytes]:
+        """Returns the last line if the body didn't end with a newline"""
+        line = bytes(self._buffer.strip(_WHITESPACE))
+        self._buffer.clear()
+        self._pos = 0
+        return line or None
@@ -11,7 +11,8 @@ from .logger_config_base import (LoggerBase, LoggerConfig,
                                 CompressionType,
                                 FilterType,
                                 OutputSink)
+from .access_log import AccessLog, AccessLogSink
 
 __all__ = ["LoggerBase", "LoggerConfig", "LogLevel", "Writable", "SinkInput", "SinkAccepted",
            "RotationType", "RetentionType", "CompressionType", "FilterType",
-           "OutputSink"]
+           "OutputSink", "AccessLog", "AccessLogSink"]
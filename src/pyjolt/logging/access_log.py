@@ -0,0 +1,271 @@
+"""
+Structured access log.
+One compact record is written per request after the response was sent
+(method, path, route, status, latency, bytes, client). Records are sampled
+per status class, buffered in memory and written in batches by a background
+task, so the request path never formats strings or performs I/O.
+The access log doesn't depend on loguru - sinks receive plain dicts.
+"""
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping, Optional, Protocol, TextIO, runtime_checkable
+
+from ..executors import executors
+
+#: status class -> sample rate (fraction of requests which are logged)
+DEFAULT_SAMPLE_RATES: dict[str, float] = {
+    "1xx": 1.0, "2xx": 1.0, "3xx": 1.0, "4xx": 1.0, "5xx": 1.0
+}
+
+#: min seconds between two reports of failing sink writes
+FAILURE_REPORT_INTERVAL: float = 60.0
+
+_RECORD_FIELDS: tuple[str, ...] = ("time", "method", "path", "route", "status",
+                                   "duration_ms", "bytes", "client")
+
+@runtime_checkable
+class AccessLogSink(Protocol):
+    """Receives batches of access log records (runs in a worker thread)"""
+
+    def write(self, records: list[dict[str, Any]]) -> None:
+        """Writes a batch of records"""
+        ...
+
+class StreamAccessLogSink:
+    """Writes records as JSON lines to a text stream (sys.stderr by default)"""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self._stream = stream
+
+    def write(self, records: list[dict[str, Any]]) -> None:
+        stream = self._stream or sys.stderr
+        stream.write("".join(json.dumps(record, separators=(",", ":")) + "\n"
+                             for record in records))
+        stream.flush()
+
+class FileAccessLogSink:
+    """Appends records as JSON lines to a file"""
+
+    def __init__(self, path: str|Path):
+        self._path = Path(path)
+
+    def write(self, records: list[dict[str, Any]]) -> None:
+        with self._path.open("a", encoding="utf-8") as file:
+            file.write("".join(json.dumps(record, separators=(",", ":")) + "\n"
+                               for record in records))
+
+class LoguruAccessLogSink:
+    """Forwards records to loguru (one INFO message per record)"""
+
+    def write(self, records: list[dict[str, Any]]) -> None:
+        #pylint: disable-next=C0415
+        from loguru import logger
+        access_logger = logger.bind(logger_name="AccessLog")
+        for record in records:
+            access_logger.info("{method} {path} {status} {duration_ms}ms {bytes}B",
+                               **{k: v for k, v in record.items() if k != "time"})
+
+class _CallableAccessLogSink:
+    """Adapts a plain callable(records) to the sink protocol"""
+
+    def __init__(self, func: Callable[[list[dict[str, Any]]], Any]):
+        self._func = func
+
+    def write(self, records: list[dict[str, Any]]) -> None:
+        self._func(records)
+
+def get_access_log_sink(sink: Any) -> AccessLogSink:
+    """
+    Resolves the ACCESS_LOG_SINK configuration value: None or "stderr",
+    "stdout", "loguru", a file path, a text stream, a sink instance
+    or a callable which receives a list of records.
+    """
+    if sink is None:
+        return StreamAccessLogSink()
+    if isinstance(sink, str):
+        name = sink.strip().lower()
+        if name == "stderr":
+            return StreamAccessLogSink()
+        if name == "stdout":
+            return StreamAccessLogSink(sys.stdout)
+        if name == "loguru":
+            return LoguruAccessLogSink()
+        return FileAccessLogSink(sink)
+    if isinstance(sink, Path):
+        return FileAccessLogSink(sink)
+    if isinstance(sink, AccessLogSink):
+        return sink
+    if hasattr(sink, "write"):
+        return StreamAccessLogSink(sink)
+    if callable(sink):
+        return _CallableAccessLogSink(sink)
+    raise TypeError("ACCESS_LOG_SINK must be a stream name, file path, stream, sink or callable")
+
+class AccessLogSend:
+    """
+    Wraps the ASGI send callable and records the response status
+    and the number of body bytes sent.
+    """
+    __slots__ = ("_send", "started", "status", "bytes_sent")
+
+    def __init__(self, send: Callable):
+        self._send = send
+        self.started: float = time.perf_counter()
+        self.status: Optional[int] = None
+        self.bytes_sent: int = 0
+
+    async def __call__(self, message: dict[str, Any]) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.body":
+            self.bytes_sent += len(message.get("body", b""))
+        elif message_type == "http.response.start":
+            self.status = message["status"]
+        elif message_type == "websocket.send":
+            self.bytes_sent += len(message.get("bytes") or message.get("text") or "")
+        elif message_type == "websocket.accept":
+            self.status = 101
+        elif message_type == "websocket.close" and self.status is None:
+            self.status = 403
+        await self._send(message)
+
+class AccessLog:
+    """
+    Access log pipeline. Use track() to decide if a request is logged,
+    wrap its send callable with AccessLogSend and call record() when the
+    request is done. Records are written by a background task every
+    `flush_interval` seconds or when `batch_size` records are buffered.
+    At most `max_queue` records are buffered, excess records are dropped
+    (see stats()).
+    ```
+    access_log = AccessLog(sink="stdout", sample_rates={"2xx": 0.1},
+                           exclude=["/static", "Health.check"])
+    ```
+    `exclude` entries starting with "/" are path prefixes, others are route names.
+    """
+
+    def __init__(self, sink: Any = None,
+                 sample_rates: Optional[Mapping[str, float]] = None,
+                 exclude: Optional[Iterable[str]] = None,
+                 batch_size: int = 256,
+                 flush_interval: float = 1.0,
+                 max_queue: int = 10000):
+        self._sink: AccessLogSink = get_access_log_sink(sink)
+        rates: dict[str, float] = {**DEFAULT_SAMPLE_RATES, **(sample_rates or {})}
+        # index = status // 100
+        self._sample_rates: tuple[float, ...] = (1.0,) + tuple(
+            float(rates.get(f"{i}xx", 1.0)) for i in range(1, 6)
+        )
+        exclude = list(exclude or [])
+        self._excluded_prefixes: tuple[str, ...] = tuple(e for e in exclude if e.startswith("/"))
+        self._excluded_routes: frozenset[str] = frozenset(e for e in exclude if not e.startswith("/"))
+        self._batch_size: int = max(1, batch_size)
+        self._flush_interval: float = flush_interval
+        self._max_queue: int = max_queue
+        self._queue: deque[tuple] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._written: int = 0
+        self._dropped: int = 0
+        self._failed_writes: int = 0
+        self._failure_reported: Optional[float] = None
+        self._unreported_failures: int = 0
+
+    def track(self, path: str, route: Optional[str]) -> bool:
+        """If requests to the path/route are logged"""
+        if self._excluded_prefixes and path.startswith(self._excluded_prefixes):
+            return False
+        return route not in self._excluded_routes
+
+    def record(self, method: str, path: str, route: Optional[str],
+               send: AccessLogSend, client: Optional[tuple] = None) -> None:
+        """Samples and buffers the record of a finished request"""
+        # no response was sent - the request failed with an unhandled exception
+        status: int = send.status or 500
+        rate: float = self._sample_rates[status // 100] if 100 <= status < 600 else 1.0
+        if rate < 1.0 and (rate <= 0.0 or random.random() >= rate):
+            return
+        queue = self._queue
+        if len(queue) >= self._max_queue:
+            self._dropped += 1
+            return
+        queue.append((time.time(), method, path, route, status,
+                      round((time.perf_counter() - send.started) * 1000.0, 3),
+                      send.bytes_sent, client[0] if client else None))
+        if self._task is None or self._task.done():
+            self.start()
+        elif len(queue) >= self._batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        """Starts the background writer in the running event loop"""
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._writer())
+
+    async def stop(self) -> None:
+        """Stops the background writer and writes the buffered records"""
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Writes all buffered records"""
+        while self._queue:
+            batch: list[tuple] = []
+            queue = self._queue
+            while queue and len(batch) < self._batch_size:
+                batch.append(queue.popleft())
+            await executors.run(self._write, batch)
+
+    async def _writer(self) -> None:
+        wakeup = self._wakeup
+        assert wakeup is not None
+        while True:
+            try:
+                await asyncio.wait_for(wakeup.wait(), self._flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            wakeup.clear()
+            await self.flush()
+
+    def _write(self, batch: list[tuple]) -> None:
+        try:
+            self._sink.write([dict(zip(_RECORD_FIELDS, record)) for record in batch])
+            self._written += len(batch)
+        # pylint: disable-next=W0718
+        except Exception as exc:
+            self._failed_writes += 1
+            self._report_failure(exc)
+
+    def _report_failure(self, exc: Exception) -> None:
+        """Reports failing sink writes (at most once per FAILURE_REPORT_INTERVAL)"""
+        now = time.monotonic()
+        if (self._failure_reported is not None
+                and now - self._failure_reported < FAILURE_REPORT_INTERVAL):
+            self._unreported_failures += 1
+            return
+        suppressed, self._unreported_failures = self._unreported_failures, 0
+        self._failure_reported = now
+        #pylint: disable-next=C0415
+        from loguru import logger
+        logger.bind(logger_name="AccessLog").error(
+            f"Access log sink failed: {exc!r}"
+            + (f" ({suppressed} more failures since the last report)" if suppressed else ""))
+
+    def stats(self) -> dict[str, int]:
+        """Number of written, dropped (queue full) and buffered records and failed writes"""
+        return {
+            "written": self._written,
+            "dropped": self._dropped,
+            "buffered": len(self._queue),
+            "failed_writes": self._failed_writes,
+        }
@@ -1,60 +1,230 @@
 """
 In-memory log buffer
 """
-from collections import deque
-from threading import Lock
-from typing import Deque, Dict, Any, List
+import sys
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+
+#: levels which are also stored in the separate severe ring
+SEVERE_LEVELS: frozenset[str] = frozenset({"ERROR", "CRITICAL", "FATAL"})
+
+class _RecordRing:
+    """
+    Preallocated ring of record tuples. The first item of every record is its
+    sequence number, readers drop slots which were overwritten while reading.
+    Written by the buffer writer only.
+    """
+    __slots__ = ("_records", "_capacity", "seq")
+
+    def __init__(self, capacity: int):
+        self._records: list[Optional[tuple]] = [None] * capacity
+        self._capacity = capacity
+        self.seq: int = 0
+
+    def append(self, fields: tuple) -> int:
+        """Stores the record, returns its sequence number"""
+        seq = self.seq
+        self._records[seq % self._capacity] = (seq, *fields)
+        # publishes the record to readers
+        self.seq = seq + 1
+        return seq
+
+    def get(self, seq: int) -> Optional[tuple]:
+        """Record with the sequence number or None if it was overwritten"""
+        record = self._records[seq % self._capacity]
+        if record is None or record[0] != seq:
+            return None
+        return record
+
+    def newest_first(self):
+        seq = self.seq
+        for position in range(seq - 1, max(seq - self._capacity, 0) - 1, -1):
+            record = self.get(position)
+            if record is None:
+                return
+            yield record
+
+    def __len__(self) -> int:
+        return min(self.seq, self._capacity)
+
+class _SeqIndex:
+    """
+    Ring of sequence numbers of records with the same level/logger name.
+    Written by the buffer writer only.
+    """
+    __slots__ = ("_slots", "_capacity", "count")
+
+    def __init__(self, capacity: int):
+        self._slots: list[int] = [-1] * capacity
+        self._capacity = capacity
+        self.count: int = 0
+
+    def append(self, seq: int) -> None:
+        self._slots[self.count % self._capacity] = seq
+        self.count += 1
+
+    def newest_first(self):
+        """Yields sequence numbers from the newest to the oldest"""
+        slots = self._slots
+        capacity = self._capacity
+        count = self.count
+        previous: int = sys.maxsize
+        for position in range(count - 1, max(count - capacity, 0) - 1, -1):
+            seq = slots[position % capacity]
+            # slot was overwritten by the writer while reading
+            if seq >= previous:
+                return
+            previous = seq
+            yield seq
 
 class InMemoryLogBuffer:
     """
     Callable Loguru sink that stores recent log records in memory.
 
-    - Uses a bounded deque so memory doesn't grow indefinitely.
-    - Thread-safe with a simple Lock.
+    - Preallocated ring buffer of compact record tuples (interned level, logger,
+      file and function names, float timestamps), so memory doesn't grow.
+    - Single writer (the loguru sink), lock-free readers: every slot carries the
+      sequence number of its record and readers drop slots which were
+      overwritten while they were reading (seqlock-style validation).
+    - Secondary indexes by level and logger name for queries like the last
+      200 INFO records of a logger without scanning the whole buffer.
+    - ERROR and above are also kept in a separate ring of the same size, so the
+      last maxlen severe records survive any number of lower level records.
     """
     def __init__(self, maxlen: int = 1000):
-        self._buffer: Deque[Dict[str, Any]] = deque(maxlen=maxlen)
-        self._severe_buffer: Deque[Dict[str, Any]] = deque(maxlen=maxlen)
-        self._lock = Lock()
+        self._capacity: int = max(1, maxlen)
+        # (seq, timestamp, level, logger_name, message, file, line, name, function)
+        self._records = _RecordRing(self._capacity)
+        self._severe = _RecordRing(self._capacity)
+        self._indexes: dict[str, _SeqIndex] = {}
 
     def __call__(self, message):  # type: ignore[override]
         record = message.record
-        data = {
-            "time": record["time"].isoformat(),
-            "level": record["level"].name,
-            "message": record["message"],
-            "logger_name": record["extra"].get("logger_name"),
-            "file": record["file"].name,
-            "line": record["line"],
-            "name": record["name"],
-            "function": record["function"],
+        level: str = sys.intern(record["level"].name)
+        logger_name: Optional[str] = record["extra"].get("logger_name")
+        if logger_name is not None:
+            logger_name = sys.intern(str(logger_name))
+        fields = (
+            record["time"].timestamp(),
+            level,
+            logger_name,
+            record["message"],
+            sys.intern(record["file"].name),
+            record["line"],
+            sys.intern(record["name"] or ""),
+            sys.intern(record["function"]),
+        )
+        if level in SEVERE_LEVELS:
+            self._severe.append(fields)
+        # indexes are updated before the record is published (the reader skips unpublished sequence numbers)
+        seq = self._records.seq
+        self._index(f"level:{level}").append(seq)
+        if logger_name is not None:
+            self._index(f"logger:{logger_name}").append(seq)
+        self._records.append(fields)
+
+    def _index(self, key: str) -> _SeqIndex:
+        index = self._indexes.get(key)
+        if index is None:
+            index = self._indexes[key] = _SeqIndex(self._capacity)
+        return index
+
+    def _from_index(self, key: str):
+        index = self._indexes.get(key)
+        if index is None:
+            return
+        published = self._records.seq
+        for seq in index.newest_first():
+            if seq >= published:
+                continue
+            record = self._records.get(seq)
+            if record is None:
+                return
+            yield record
+
+    @staticmethod
+    def _to_dict(record: tuple) -> Dict[str, Any]:
+        _, timestamp, level, logger_name, message, file, line, name, function = record
+        return {
+            "time": datetime.fromtimestamp(timestamp).astimezone().isoformat(),
+            "timestamp": timestamp,
+            "level": level,
+            "message": message,
+            "logger_name": logger_name,
+            "file": file,
+            "line": line,
+            "name": name,
+            "function": function,
         }
 
-        with self._lock:
-            self._buffer.append(data)
-        
-        if record["level"].name in ["ERROR", "CRITICAL", "FATAL"]:
-            with self._lock:
-                self._severe_buffer.append(data)
+    def query(self, n: Optional[int] = 100, *, level: Optional[str] = None,
+              logger_name: Optional[str] = None, severe: bool = False,
+              newest_first: bool = False) -> List[Dict[str, Any]]:
+        """
+        Returns the last n records (all if n is None) filtered by level,
+        logger name and/or severity (ERROR and above).
+        Records are returned oldest first unless newest_first=True.
+        """
+        keys: list[str] = []
+        if level is not None:
+            keys.append(f"level:{level.upper()}")
+        if logger_name is not None:
+            keys.append(f"logger:{logger_name}")
+        if severe or (level is not None and level.upper() in SEVERE_LEVELS):
+            # severe records have their own ring, other filters are checked on its records
+            source = self._severe.newest_first()
+        elif not keys:
+            source = self._records.newest_first()
+        else:
+            # walks the smallest index and checks the remaining filters on its records
+            indexes = [self._indexes.get(key) for key in keys]
+            if any(index is None for index in indexes):
+                return []
+            key = min(keys, key=lambda k: self._indexes[k].count)
+            source = self._from_index(key)
+        limit: int = self._capacity if n is None else n
+        out: List[Dict[str, Any]] = []
+        if limit <= 0:
+            return out
+        for record in source:
+            if level is not None and record[2] != level.upper():
+                continue
+            if logger_name is not None and record[3] != logger_name:
+                continue
+            if severe and record[2] not in SEVERE_LEVELS:
+                continue
+            out.append(self._to_dict(record))
+            if len(out) >= limit:
+                break
+        if not newest_first:
+            out.reverse()
+        return out
 
     def get_last(self, n: int = 100) -> List[Dict[str, Any]]:
         """Return last n records (newest last)."""
-        with self._lock:
-            if n >= len(self._buffer):
-                return list(self._buffer)
-            return list(self._buffer)[-n:]
+        return self.query(n)
 
     def get_all(self) -> List[Dict[str, Any]]:
-        with self._lock:
-            return list(self._buffer)
-        
+        return self.query(None)
+
     def get_last_severe(self, n: int = 100) -> List[Dict[str, Any]]:
         """Return last n records (newest last)."""
-        with self._lock:
-            if n >= len(self._severe_buffer):
-                return list(self._severe_buffer)
-            return list(self._severe_buffer)[-n:]
-    
+        return self.query(n, severe=True)
+
     def get_severe(self) -> List[Dict[str, Any]]:
-        with self._lock:
-            return list(self._severe_buffer)
\ No newline at end of file
+        return self.query(None, severe=True)
+
+    def levels(self) -> List[str]:
+        """Levels with at least one record"""
+        return [key[6:] for key in list(self._indexes) if key.startswith("level:")]
+
+    def logger_names(self) -> List[str]:
+        """Logger names with at least one record"""
+        return [key[7:] for key in list(self._indexes) if key.startswith("logger:")]
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def __len__(self) -> int:
+        return len(self._records)
@@ -52,6 +52,15 @@ class MiddlewareBase(ABC):
         """
         return await run_sync_or_async(self.middleware, req)
 
+    def applies_to(self, route_handler: Callable) -> bool:
+        """
+        Called once per route handler when the app is built. Middleware which
+        returns False is left out of the compiled dispatch pipeline of the handler.
+        Override only if the middleware would pass requests to this handler
+        straight to the next part of the chain.
+        """
+        return True
+
     @property
     def app(self) -> "PyJolt":
         """
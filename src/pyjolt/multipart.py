@@ -0,0 +1,336 @@
+"""
+Streaming multipart/form-data parser.
+Body chunks are fed into python-multipart as they are received. Form fields
+are collected in memory (up to a size limit), file parts are written to a
+SpooledTemporaryFile which moves to disk once it outgrows the spool threshold.
+"""
+import re
+import base64
+import hashlib
+import shutil
+from io import BytesIO
+from tempfile import SpooledTemporaryFile
+from typing import Any, BinaryIO, Mapping, Optional, cast
+
+from python_multipart.multipart import MultipartParser, parse_options_header
+from pydantic_core import core_schema
+
+from .exceptions.http_exceptions import PayloadTooLarge
+
+def extract_boundary(content_type: str) -> str:
+    """
+    Pull the boundary=... out of a Content-Type header.
+    """
+    match = re.search(r'boundary="?([^";]+)"?', content_type)
+    if not match:
+        raise ValueError("No boundary found in Content-Type")
+    return match.group(1)
+
+class UploadedFile:
+    """
+    Wrapper around an in-memory/temporary file.
+    Uploaded files are kept in memory up to the spool threshold
+    (MULTIPART_SPOOL_THRESHOLD) and in a temporary file on disk above it.
+    """
+    def __init__(self, filename: str, content: Optional[bytes] = None,
+                 content_type: str = "application/octet-stream", *,
+                 file: Optional[BinaryIO] = None, size: Optional[int] = None,
+                 digest: Optional[str] = None):
+        self.filename = filename
+        self.content_type = content_type
+        #: hex digest of the content (MULTIPART_HASH_ALGORITHM), None if not hashed
+        self.digest = digest
+        if file is None:
+            # BytesIO shares the bytes object until it is written to
+            file = BytesIO(content or b"")
+            size = len(content or b"")
+        self._stream: BinaryIO = file
+        self._size: Optional[int] = size
+
+    def read(self, size: int = -1) -> bytes:
+        return self._stream.read(size)
+
+    def seek(self, pos: int, whence: int = 0) -> int:
+        return self._stream.seek(pos, whence)
+
+    def save(self, path: str) -> None:
+        """Copies the file to path in chunks (blocking, use an executor for large files)"""
+        with open(path, "wb") as f:
+            self.seek(0)
+            shutil.copyfileobj(self._stream, f, 1024 * 1024)
+
+    def close(self) -> None:
+        """Closes the file (removes the temporary file)"""
+        self._stream.close()
+
+    @property
+    def size(self) -> int:
+        if self._size is None:
+            cur = self._stream.tell()
+            self._stream.seek(0, 2)
+            self._size = self._stream.tell()
+            self._stream.seek(cur)
+        return self._size
+
+    @property
+    def stream(self) -> BinaryIO:
+        self.seek(0)
+        return self._stream
+
+    def get_stream(self) -> BinaryIO:
+        return self.stream
+
+    def __repr__(self) -> str:
+        return (f"<UploadedFile filename={self.filename!r} "
+                f"size={self.size} content_type={self.content_type!r}>")
+
+    # Pydantic v2 integration
+    @staticmethod
+    def _from_mapping(data: Mapping[str, Any]) -> "UploadedFile":
+        """
+        Accepts dict-like input:
+          - filename: str (required)
+          - content: bytes | bytearray | memoryview | str (base64 or raw text; you decide)
+          - content_type: str (optional; defaults to application/octet-stream)
+        """
+        if "filename" not in data:
+            raise ValueError("UploadedFile requires 'filename'")
+
+        filename = data["filename"]
+        content_type = data.get("content_type", "application/octet-stream")
+
+        if "content" not in data:
+            raise ValueError("UploadedFile requires 'content' (bytes)")
+
+        content = data["content"]
+
+        if isinstance(content, (bytes, bytearray)):
+            content_bytes = bytes(content)
+        elif isinstance(content, memoryview):
+            content_bytes = content.tobytes()
+        elif isinstance(content, str):
+            try:
+                content_bytes = base64.b64decode(content, validate=True)
+            except Exception as e:
+                raise ValueError("Invalid base64 for UploadedFile.content") from e
+        else:
+            raise TypeError(
+                "UploadedFile.content must be bytes/bytearray/memoryview or base64 str"
+            )
+
+        if not isinstance(filename, str):
+            raise TypeError("UploadedFile.filename must be a string")
+        if not isinstance(content_type, str):
+            raise TypeError("UploadedFile.content_type must be a string")
+
+        return UploadedFile(filename=filename, content=content_bytes, content_type=content_type)
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source_type: Any, handler: Any) -> core_schema.CoreSchema:
+        """
+        Core validation + serialization.
+        """
+        def validate(v: Any) -> "UploadedFile":
+            if isinstance(v, UploadedFile):
+                return v
+
+            if isinstance(v, Mapping):
+                return cls._from_mapping(v)
+
+            if isinstance(v, tuple):
+                if len(v) == 2:
+                    filename, content = v
+                    return cls._from_mapping({"filename": filename, "content": content})
+                if len(v) == 3:
+                    filename, content, content_type = v
+                    return cls._from_mapping({"filename": filename, "content": content, "content_type": content_type})
+                raise ValueError("UploadedFile tuple input must be (filename, content) or (filename, content, content_type)")
+
+            raise TypeError("Value is not a valid UploadedFile input")
+
+        def serialize(v: "UploadedFile") -> dict[str, Any]:
+            return {
+                "filename": v.filename,
+                "content_type": v.content_type,
+                "size": v.size,
+            }
+
+        return core_schema.no_info_plain_validator_function(
+            validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                serialize,
+                info_arg=False,
+                return_schema=core_schema.dict_schema(),
+            ),
+        )
+
+    @classmethod
+    def __get_pydantic_json_schema__(cls, core_schema: core_schema.CoreSchema, handler: Any) -> dict[str, Any]:
+        """
+        JSON schema for docs / OpenAPI.
+        """
+        return {
+            "type": "object",
+            "title": "UploadedFile",
+            "properties": {
+                "filename": {"type": "string"},
+                "content_type": {"type": "string"},
+                "size": {"type": "integer"},
+            },
+            "required": ["filename"],
+            "additionalProperties": True,
+            "description": "Uploaded file (serialized as metadata by default).",
+        }
+
+class StreamingMultipartParser:
+    """
+    Incremental multipart/form-data parser. Feed body chunks with feed()
+    and collect the results with finish().
+    Limits (None disables a limit) raise PayloadTooLarge:
+    - max_file_size: size of a single file part
+    - max_field_size: size of a single (non-file) field
+    - max_fields/max_files: number of fields/file parts
+    File parts are hashed while streaming if hash_algorithm (hashlib name) is set.
+    """
+
+    def __init__(self, content_type: str, *,
+                 spool_threshold: int = 1024 * 1024,
+                 max_file_size: Optional[int] = None,
+                 max_field_size: Optional[int] = 1024 * 1024,
+                 max_fields: Optional[int] = 1000,
+                 max_files: Optional[int] = 100,
+                 hash_algorithm: Optional[str] = None,
+                 spool_dir: Optional[str] = None):
+        self._spool_threshold = spool_threshold
+        self._max_file_size = max_file_size
+        self._max_field_size = max_field_size
+        self._max_fields = max_fields
+        self._max_files = max_files
+        self._hash_algorithm = hash_algorithm
+        self._spool_dir = spool_dir
+
+        self.fields: dict[str, str] = {}
+        self.files: dict[str, UploadedFile] = {}
+        self._field_count: int = 0
+        self._file_count: int = 0
+
+        # state of the current part
+        self._headers: dict[bytes, bytes] = {}
+        self._header_field: bytearray = bytearray()
+        self._header_value: bytearray = bytearray()
+        self._name: str = ""
+        self._filename: Optional[str] = None
+        self._content_type: str = ""
+        self._field_data: bytearray = bytearray()
+        self._file: Optional[SpooledTemporaryFile] = None
+        self._size: int = 0
+        self._hash: Any = None
+
+        self._parser = MultipartParser(extract_boundary(content_type).encode("latin1"), cast(Any, {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        }))
+
+    @property
+    def spooling_to_disk(self) -> bool:
+        """If the current file part is written to disk (feed may block)"""
+        return self._file is not None and self._size > self._spool_threshold
+
+    def feed(self, chunk: bytes) -> None:
+        """Parses the next body chunk"""
+        try:
+            self._parser.write(chunk)
+        except BaseException:
+            self.close()
+            raise
+
+    def finish(self) -> tuple[dict[str, str], dict[str, UploadedFile]]:
+        """Ends parsing and returns the form fields and files"""
+        self._parser.finalize()
+        if self._file is not None:
+            # body ended inside a file part
+            self._file.close()
+            self._file = None
+        return self.fields, self.files
+
+    def close(self) -> None:
+        """Closes all (partially) received files"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        for file in self.files.values():
+            file.close()
+
+    def _on_part_begin(self) -> None:
+        self._headers = {}
+        self._name = ""
+        self._filename = None
+        self._content_type = ""
+        self._field_data = bytearray()
+        self._size = 0
+        self._hash = None
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._headers[bytes(self._header_field).lower()] = bytes(self._header_value)
+        self._header_field = bytearray()
+        self._header_value = bytearray()
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        self._name = options.get(b"name", b"").decode("latin1")
+        filename: Optional[bytes] = options.get(b"filename")
+        self._content_type = self._headers.get(b"content-type", b"").decode("latin1")
+        if filename is None:
+            self._field_count += 1
+            if self._max_fields is not None and self._field_count > self._max_fields:
+                raise PayloadTooLarge(f"Too many form fields (max {self._max_fields})")
+            return
+        self._file_count += 1
+        if self._max_files is not None and self._file_count > self._max_files:
+            raise PayloadTooLarge(f"Too many files (max {self._max_files})")
+        self._filename = filename.decode("latin1")
+        self._file = SpooledTemporaryFile(max_size=self._spool_threshold, dir=self._spool_dir)
+        if self._hash_algorithm is not None:
+            self._hash = hashlib.new(self._hash_algorithm)
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        self._size += end - start
+        if self._file is None:
+            if self._max_field_size is not None and self._size > self._max_field_size:
+                raise PayloadTooLarge(f"Form field '{self._name}' is too large (max {self._max_field_size} bytes)")
+            self._field_data += data[start:end]
+            return
+        if self._max_file_size is not None and self._size > self._max_file_size:
+            raise PayloadTooLarge(f"File '{self._filename}' is too large (max {self._max_file_size} bytes)")
+        chunk = memoryview(data)[start:end]
+        self._file.write(chunk)
+        if self._hash is not None:
+            self._hash.update(chunk)
+
+    def _on_part_end(self) -> None:
+        if self._file is None:
+            self.fields[self._name] = self._field_data.decode("utf-8", "replace")
+            return
+        self._file.seek(0)
+        previous = self.files.get(self._name)
+        if previous is not None:
+            previous.close()
+        self.files[self._name] = UploadedFile(
+            filename=cast(str, self._filename),
+            content_type=self._content_type,
+            file=cast(BinaryIO, self._file),
+            size=self._size,
+            digest=self._hash.hexdigest() if self._hash is not None else None,
+        )
+        self._file = None
@@ -2,7 +2,7 @@
 OpenAPI controller
 """
 import re
-from typing import Any, Dict, Optional, Set, Type, Tuple, List, cast, Callable
+from typing import Any, Dict, Optional, Set, Type, Tuple, List, cast, Callable, get_args, get_origin
 from pydantic import BaseModel
 
 from .http_statuses import HttpStatus
@@ -10,7 +10,7 @@ from .media_types import MediaType
 from .response import Response
 from .request import Request
 from .controller import Controller, get, produces
-from .controller.utilities import _extract_response_type
+from .controller.endpoint_metadata import endpoint_metadata
 
 _WERKZEUG_PARAM_RE = re.compile(r"<(?:(int|string|path):)?([a-zA-Z_][a-zA-Z0-9_]*)>")
 
@@ -292,7 +292,14 @@ def build_openapi(
                 consumes_type = cast(Type, cast(dict, ep_cfg).get("consumes_type"))
                 if consumes or consumes_type:
                     mt = _as_media_type(consumes) if consumes else "application/json"
-                    schema_ref = _ensure_schema(components, consumes_type)
+                    if get_origin(consumes_type) is list:
+                        # list[Model] payloads
+                        item_type = get_args(consumes_type)[0]
+                        item_ref = _ensure_schema(components, item_type)
+                        schema_ref = {"type": "array", "items": item_ref} if item_ref else None
+                        consumes_type = item_type
+                    else:
+                        schema_ref = _ensure_schema(components, consumes_type)
                     if consumes_type:
                         try:
                             referenced_models.add(consumes_type)
@@ -314,7 +321,7 @@ def build_openapi(
                 responses: Dict[int, Any] = {}
                 op_obj["responses"] = responses
 
-                response_type = _extract_response_type(cast(str, cast(dict, ep_cfg).get("method")))
+                response_type = endpoint_metadata(cast(Callable, cast(dict, ep_cfg).get("method"))).response_type
                 resp_schema_ref = _ensure_schema(components, response_type) if response_type else None
                 if response_type:
                     try:
@@ -6,17 +6,17 @@ PyJolt application class
 import os
 import inspect
 import argparse
-import json
-from collections.abc import AsyncIterator, Iterable
+from collections.abc import AsyncIterable, AsyncIterator, AsyncGenerator, Iterable
 import asyncio
+import random
 from enum import StrEnum
 from typing import (Any, Callable, Mapping,
                     Optional, Type, TypeVar,
-                    cast, AsyncIterable, Union)
-import aiofiles
+                    cast)
 from loguru import logger
 from werkzeug.exceptions import NotFound, MethodNotAllowed
 from pydantic import BaseModel
+from pydantic_core import PydanticSerializationError
 
 from jinja2 import (
     Environment,
@@ -28,13 +28,22 @@ from jinja2 import (
 
 from pyjolt.media_types import MediaType
 
-from .exceptions.http_exceptions import HtmlAborterException
+from .exceptions.http_exceptions import HtmlAborterException, PayloadTooLarge
+from .exceptions.runtime_exceptions import ClientDisconnected
 from .http_statuses import HttpStatus
 from .http_methods import HttpMethod
 from .request import Request
 from .response import Response
-from .utilities import get_app_root_path, run_sync_or_async, import_module
+from .utilities import get_app_root_path, run_sync_or_async, import_module, ensure_async
+from .executors import executors, Executors
+from .static_cache import StaticFileCache
+from .websocket_hub import WebSocketHub
+from .backplane import BaseBackplane, get_backplane, app_namespace
+from .file_response import send_file_segment
+from .streaming import Chunk, iterate_chunks, coalesce_chunks, close_stream, as_bytes
 from .router import Router
+from .json_codec import JsonCodec, get_json_codec
+from .controller.endpoint_metadata import response_adapter, construct_response
 from .static import Static
 from .open_api import OpenAPIController
 from .controller import path
@@ -47,38 +56,12 @@ from .configuration_base import BaseConfig
 from .database.sql import SqlDatabase
 from .database.sql.declarative_base import DeclarativeBaseModel as BaseModelClass
 from .middleware import MiddlewareBase, AppCallableType
+from .dispatch import NextStage, RoutePipeline
 from .cli import CLIController
 from .logging.logger_config_base import LoggerBase
+from .logging.access_log import AccessLog, AccessLogSend
 from .logging.inmemory_buffer import InMemoryLogBuffer
 
-# ──────────────────────────────────────────────────────────────────────────────
-# Monkey‐patch Uvicorn’s RequestResponseCycle.run_asgi so that, just before
-# it invokes your ASGI app, it injects the real socket into the scope dict.
-try:
-    from uvicorn.protocols.http.h11_impl import RequestResponseCycle
-
-    _orig_run_asgi = RequestResponseCycle.run_asgi
-
-    async def _patched_run_asgi(self, application):
-        # grab the raw socket from the transport and stash it into scope
-        sock = None
-        if hasattr(self, "transport") and self.transport is not None:
-            sock = self.transport.get_extra_info("socket")
-        if sock is not None:
-            self.scope["socket"] = sock
-
-        # now call the real ASGI loop
-        return await _orig_run_asgi(self, application)
-
-    RequestResponseCycle.run_asgi = _patched_run_asgi #type: ignore[method-assign]
-# pylint: disable-next=W0718
-except Exception as e:
-    logger.debug(
-        "Could not patch RequestResponseCycle.run_asgi; "
-        "os.sendfile() zero-copy will fall back to aiofiles. "
-        f"Patch error: {e}"
-    )
-# ──────────────────────────────────────────────────────────────────────────────
 #remove default Loguru sink
 logger.remove()
 
@@ -94,6 +77,19 @@ A Fast, Simple, and Productive Python Web Framework
 
 PYJOLT_VERSION: str = "0.111.x"
 
+_JSON_MEDIA_TYPES: tuple[str, ...] = (MediaType.APPLICATION_JSON,
+                                      MediaType.APPLICATION_PROBLEM_JSON,
+                                      MediaType.APPLICATION_X_NDJSON)
+
+# statuses which never have a body (no content-length)
+_NO_BODY_STATUSES: frozenset[int] = frozenset({100, 101, 102, 103, 204, 304})
+# headers and prebuilt bodies of generic framework error responses
+_JSON_HEADERS: tuple[tuple[bytes, bytes], ...] = ((b"content-type", b"application/json"),)
+# generic response for unmatched routes (sent without building a Request)
+_ROUTE_NOT_FOUND_BODY: bytes = b'{ "status": "error", "message": "Endpoint not found" }'
+_METHOD_NOT_ALLOWED_BODY: bytes = b'{"status":"error","message":"Method not allowed"}'
+_INTERNAL_SERVER_ERROR_BODY: bytes = b'{"status":"error","message":"Internal server error"}'
+
 T = TypeVar("T", bound="PyJolt")
 
 def app_path(url_path: Optional[str] = None) -> Callable[[Type[T]], Type[T]]:
@@ -200,6 +196,8 @@ class PyJolt:
         self._configs = {**validated_configs.model_dump()}
         static_dir = self.get_conf('STATIC_DIR').lstrip("/\\")
         self._static_files_path = os.path.join(self._root_path, static_dir)
+        self._static_file_cache: Optional[StaticFileCache] = None
+        self._websocket_hub: Optional[WebSocketHub] = None
         self._templates_path = self._root_path + self.get_conf("TEMPLATES_DIR")
 
         self._all_templates_paths = [self._templates_path]
@@ -222,9 +220,31 @@ class PyJolt:
         sink_id = DefaultLogger(self).configure()
         self._logger_sink_ids.append(sink_id)
 
-        self._router = Router(self.get_conf("STRICT_SLASHES", False))
+        self._router = Router(self.get_conf("STRICT_SLASHES", False),
+                              self.get_conf("ROUTER_MATCH_CACHE_SIZE", None),
+                              self.get_conf("ROUTER_MATCH_CACHE_DYNAMIC_LIMIT", 256))
         self._socket_router = Router(self.get_conf("STRICT_SLASHES", False))
+        executors.configure(self.get_conf("EXECUTOR_THREADS", None),
+                            self.get_conf("EXECUTOR_POOLS", None),
+                            self.get_conf("EXECUTOR_PROCESS_WORKERS", None))
+        self._json_codec: JsonCodec = get_json_codec(self.get_conf("JSON_CODEC", "stdlib"))
+        self._backplane: BaseBackplane = get_backplane(self, self.get_conf("BACKPLANE", None))
+        self._trusted_response_output: bool = bool(self.get_conf("TRUSTED_RESPONSE_OUTPUT", False))
+        self._response_validation_sample_rate: float = self.get_conf("RESPONSE_VALIDATION_SAMPLE_RATE", 0.0) or 0.0
+        self._json_offload_threshold: Optional[int] = self.get_conf("JSON_OFFLOAD_THRESHOLD", None)
+        self._stream_coalesce_size: Optional[int] = self.get_conf("STREAM_COALESCE_SIZE", 16384)
+        self._stream_flush_interval: Optional[float] = self.get_conf("STREAM_FLUSH_INTERVAL", 0.01)
         self._logger = logger
+        self._access_log: Optional[AccessLog] = None
+        if self.get_conf("ACCESS_LOG", True):
+            self._access_log = AccessLog(
+                sink=self.get_conf("ACCESS_LOG_SINK", None),
+                sample_rates=self.get_conf("ACCESS_LOG_SAMPLE_RATES", None),
+                exclude=self.get_conf("ACCESS_LOG_EXCLUDE", None),
+                batch_size=self.get_conf("ACCESS_LOG_BATCH_SIZE", None) or 256,
+                flush_interval=self.get_conf("ACCESS_LOG_FLUSH_INTERVAL", None) or 1.0,
+                max_queue=self.get_conf("ACCESS_LOG_MAX_QUEUE", None) or 10000,
+            )
 
         self.log_buffer = InMemoryLogBuffer(maxlen=self._configs.get("IN_MEMORY_LOG_BUFFER_SIZE", 1000))
         # Capture everything (TRACE and above) in the in-memory log buffer
@@ -237,11 +257,17 @@ class PyJolt:
         )
         self._logger_sink_ids.append(self._log_buffer_sink_id)
 
-        self._app: AppCallableType = self._base_app
+        # runs requests through the route pipelines (compiled in build or on first use)
+        self._app: AppCallableType = self._dispatch
         self._middleware: list[Callable] = []
+        self._middleware_instances: list[AppCallableType] = []
+        # route handler -> compiled dispatch pipeline (see build)
+        self._route_pipelines: dict[Callable, RoutePipeline] = {}
         self._controllers: dict[str, "Controller"] = {}
         self._cli_controllers: dict[str, "CLIController"] = {}
-        self._exception_handlers: dict[str, Callable] = {}
+        self._exception_handlers: dict[Type[BaseException], Callable] = {}
+        # exception class -> resolved handler (None if unhandled)
+        self._exception_handler_cache: dict[type, Optional[Callable]] = {}
         self._json_spec: Optional[dict] = None
         self._db_models: dict[str, list[Type[BaseModelClass]]] = {}
         self._db_name_configs_map: dict[str, str] = {}
@@ -272,6 +298,8 @@ class PyJolt:
         #all extensions, models, controllers, exception handlers and middleware
         #is registered and configured with the app.
         if not cli_mode:
+            self._enable_compression() #enables compression middleware if configured
+            self._enable_etags() #ETag middleware (global or @etag endpoints)
             self._enable_cors() #enables CORS middleware if configured
             self._load_modules(loggers)
             self._load_modules(models)
@@ -289,6 +317,26 @@ class PyJolt:
         
         self._jinja_environment.loader = FileSystemLoader(self._all_templates_paths)
 
+    def _enable_compression(self):
+        if not self.get_conf("COMPRESSION_ENABLED", False):
+            return
+
+        #pylint: disable-next=C0415
+        from .compression.compression_mw import CompressionMiddleware
+        self.logger.info(f"Registering middleware: {CompressionMiddleware.__name__}")
+        self._middleware.append(
+            #pylint: disable-next=W0108
+            lambda app, next_app: CompressionMiddleware(app, next_app)
+        )
+
+    def _enable_etags(self):
+        #pylint: disable-next=C0415
+        from .conditional.etag_mw import ETagMiddleware
+        self._middleware.append(
+            #pylint: disable-next=W0108
+            lambda app, next_app: ETagMiddleware(app, next_app)
+        )
+
     def _enable_cors(self):
         cors_enabled: bool = self.get_conf("CORS_ENABLED", True)
         if not cors_enabled:
@@ -384,17 +432,20 @@ class PyJolt:
         """
         Adds global context method to global_context_methods array
         """
-        self.global_context_methods.append(func)
+        self.global_context_methods.append(ensure_async(func))
 
-    async def _base_app(self, req: Request) -> Response:
+    async def _dispatch(self, req: Request) -> Response:
         """
-        The bare-bones application without any middleware.
-        Calls the route handler directly.
+        Runs the request through the precompiled pipeline of its route handler.
+        Pipelines of handlers registered after build are compiled on first use.
         """
-        res: Response = await run_sync_or_async(
-            req.route_handler, req, **req.route_parameters
-        )
-        return res
+        pipeline = self._route_pipelines.get(req.route_handler)
+        if pipeline is None:
+            pipeline = RoutePipeline(req.route_handler, self._middleware_instances)
+            self._route_pipelines[req.route_handler] = pipeline
+        #pylint: disable-next=W0212
+        req._pipeline = pipeline
+        return await pipeline.entry(req)
 
     async def abort_route_not_found(self, send, req: Request, path_data: Mapping[str, Any]):
         """
@@ -402,55 +453,103 @@ class PyJolt:
         """
         exc: NotFound|MethodNotAllowed|None = path_data.get("exc")
         if exc is not None:
-            handler: Callable|None = (
-                self._exception_handlers.get(exc.__class__.__name__, None) or None
-            )
+            handler: Callable|None = self.exception_handler_for(exc.__class__)
             if handler:
-                res = await run_sync_or_async(handler, req, exc)
+                res = await handler(req, exc)
                 response_type = res.expected_body_type() or exc.__class__
                 return await self.send_response(res, send, response_type)
         ##sends generic response if custom handler not available
+        await self._send_route_not_found(send, exc)
+
+    async def _send_route_not_found(self, send, exc: Optional[Exception] = None) -> None:
+        """
+        Sends the generic (prebuilt) endpoint not found or method not allowed response
+        """
+        status: int = 404
+        body: bytes = _ROUTE_NOT_FOUND_BODY
+        headers: list[tuple[bytes, bytes]] = list(_JSON_HEADERS)
+        if isinstance(exc, MethodNotAllowed):
+            status = 405
+            body = _METHOD_NOT_ALLOWED_BODY
+            if exc.valid_methods:
+                headers.append((b"allow", ", ".join(exc.valid_methods).encode("latin1")))
         await send(
             {
                 "type": "http.response.start",
-                "status": 404,
-                "headers": [(b"content-type", b"application/json")],
+                "status": status,
+                "headers": headers,
             }
         )
         await send(
             {
                 "type": "http.response.body",
-                "body": b'{ "status": "error", "message": "Endpoint not found" }',
+                "body": body,
             }
         )
+
+    def exception_handler_for(self, exc_class: type) -> Optional[Callable]:
+        """
+        Returns the handler of the exception class. Handlers registered for
+        a base class handle its subclasses (the closest class in the MRO wins).
+        Resolution is cached per exception class.
+        """
+        try:
+            return self._exception_handler_cache[exc_class]
+        except KeyError:
+            pass
+        handler: Optional[Callable] = None
+        for cls in exc_class.__mro__:
+            handler = self._exception_handlers.get(cls)
+            if handler is not None:
+                break
+        self._exception_handler_cache[exc_class] = handler
+        return handler
     
-    async def _iterate_stream(
-        self,
-        iterable: Union[AsyncIterable[bytes], Iterable[bytes]],
-    ) -> AsyncIterator[bytes]:
+    def coalesce_stream(self, iterable: AsyncIterable[Chunk] | Iterable[Chunk]) -> AsyncGenerator[Chunk, None]:
         """
-        Normalizes async/sync iterables into an async iterator of bytes.
-        Accepts bytes/bytearray/str chunks and encodes/normalizes to bytes.
+        Iterates the chunks of a response stream, with small chunks joined
+        (STREAM_COALESCE_SIZE, STREAM_FLUSH_INTERVAL) unless coalescing is disabled.
         """
-        async def _aiter_from_sync(sync_iter: Iterable[bytes]) -> AsyncIterator[bytes]:
-            for chunk in sync_iter:
-                yield self._normalize_chunk(chunk)
+        chunks = iterate_chunks(iterable)
+        if not self._stream_coalesce_size:
+            return chunks
+        return coalesce_chunks(chunks, self._stream_coalesce_size, self._stream_flush_interval)
 
-        if hasattr(iterable, "__aiter__"):
-            async for chunk in iterable:  # type: ignore[attr-defined]
-                yield self._normalize_chunk(chunk)
-        else:
-            async for chunk in _aiter_from_sync(iterable):  # type: ignore[arg-type]
-                yield chunk
-
-    def _normalize_chunk(self, chunk: Any) -> bytes:
-        if isinstance(chunk, (bytes, bytearray)):
-            return bytes(chunk)
-        if isinstance(chunk, str):
-            return chunk.encode("utf-8")
-        raise TypeError(
-            f"Streaming chunks must be bytes, bytearray or str, got {type(chunk)!r}"
-        )
+    async def _send_stream(self, res: Response, send) -> None:
+        """
+        Sends a streamed body. Small chunks are coalesced (STREAM_COALESCE_SIZE,
+        STREAM_FLUSH_INTERVAL) and the stream is stopped (and closed) as soon as
+        the client disconnects.
+        """
+        stream = res.stream_iterable
+        assert stream is not None
+        chunks: AsyncGenerator[Chunk, None] = (self.coalesce_stream(stream) if res.coalesce
+                                               else iterate_chunks(stream))
+        try:
+            if not res.request.body_received:
+                # the stream may still read the request body, don't compete for its messages
+                await self._send_chunks(chunks, send)
+                return
+            sending = asyncio.ensure_future(self._send_chunks(chunks, send))
+            disconnected = asyncio.ensure_future(res.request.wait_disconnect())
+            try:
+                await asyncio.wait((sending, disconnected), return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                disconnected.cancel()
+                if not sending.done():
+                    sending.cancel()
+                    await asyncio.wait((sending,))
+            if not sending.cancelled():
+                sending.result()
+        finally:
+            await chunks.aclose()
+            await close_stream(stream)
+
+    @staticmethod
+    async def _send_chunks(chunks: AsyncIterator[Chunk], send) -> None:
+        async for chunk in chunks:
+            await send({"type": "http.response.body", "body": as_bytes(chunk), "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
 
     async def send_response(
         self, res: Response, send, response_type: Optional[Type[Any]] = None
@@ -458,104 +557,96 @@ class PyJolt:
         """
         Sends response
         """
-        # Build headers for ASGI send
-        headers = []
-        for k, v in res.headers.items():
-            headers.append((k.encode("utf-8"), v.encode("utf-8")))
+        await self.serialize_body(res, response_type)
+
+        status: int = res.status_code.value if isinstance(res.status_code, HttpStatus) else res.status_code
+        # headers are stored pre-encoded
+        headers: list[tuple[bytes, bytes]] = res.headers.raw
+        body = res.body
+        fixed_body: bool = res.zero_copy is None and not res.is_streaming
+        if fixed_body and status not in _NO_BODY_STATUSES and b"content-length" not in res.headers:
+            headers = [*headers, (b"content-length", str(len(body) if body else 0).encode("latin1"))]
         await send(
             {
                 "type": "http.response.start",
-                "status": res.status_code.value
-                if isinstance(res.status_code, HttpStatus)
-                else res.status_code,
+                "status": status,
                 "headers": headers,
             }
         )
-        # Zero-copy _parameters_ were stashed in res._zero_copy
+        if res.request.method == "HEAD":
+            # HEAD is served by GET handlers: same headers, no body
+            await close_stream(res.stream_iterable)
+            await send({"type": "http.response.body", "body": b""})
+            return
+        # file responses (see file_response.prepare_file_response)
         if res.zero_copy is not None:
-            params = res.zero_copy
-            file_path = params["file_path"]
-            start = params["start"]
-            length = params["length"]
-
-            # stream in 1 MiB chunks
-            chunk_size = 1 * 1024 * 1024
-            remaining = length
-
-            async with aiofiles.open(file_path, "rb") as f:
-                await f.seek(start)
-                while remaining > 0:
-                    to_read = min(remaining, chunk_size)
-                    chunk = await f.read(to_read)
-                    if not chunk:
-                        break
-                    remaining -= len(chunk)
-                    await send(
-                        {
-                            "type": "http.response.body",
-                            "body": chunk,
-                            "more_body": remaining > 0,
-                        }
-                    )
+            await send_file_segment(res.request.scope, send, res.zero_copy)
             return
 
-        if getattr(res, "is_streaming", False) and res.is_streaming:
-            stream_iter = res.stream_iterable
-            if stream_iter is None:
-                await send({"type": "http.response.body", "body": b"", "more_body": False})
-                return
-
-            async for chunk in self._iterate_stream(stream_iter):
-                await send(
-                    {
-                        "type": "http.response.body",
-                            "body": chunk,
-                            "more_body": True,
-                    }
-                )
-
-            # Final empty chunk with more_body=False
-            await send(
-                {
-                    "type": "http.response.body",
-                    "body": b"",
-                    "more_body": False,
-                }
-            )
+        if res.is_streaming:
+            await self._send_stream(res, send)
             return
 
-        if (res.body and res.content_type in [MediaType.APPLICATION_JSON,
-                                 MediaType.APPLICATION_PROBLEM_JSON,
-                                 MediaType.APPLICATION_X_NDJSON]):
-            if(response_type and issubclass(response_type, BaseModel)
-                and isinstance(res.body, dict)):
-                res.body = response_type(**res.body).model_dump_json().encode("utf-8")
-            elif(response_type and issubclass(response_type, BaseModel)
-                 and isinstance(res.body, BaseModel)):
-                res.body = res.body.model_dump_json().encode("utf-8")
-            elif(res.body and response_type is None
-                 and isinstance(res.body, BaseModel)):
-                res.body = res.body.model_dump_json().encode("utf-8")
-            elif not response_type and isinstance(res.body, dict):
-                #tries to serialize plain dict to json. Works if the dict contains only json serializable types
-                res.body = json.dumps(res.body).encode("utf-8")
-            elif res.body and not isinstance(res.body, (bytes, bytearray)):
-                #tries to serialize other types (not bytes or bytesarray) to json
-                res.body = json.dumps(res.body).encode("utf-8")
-
         await send(
             {
                 "type": "http.response.body",
-                "body": res.body or b"",
+                "body": body or b"",
             }
         )
 
+    async def serialize_body(self, res: Response, response_type: Optional[Type[Any]] = None) -> None:
+        """
+        Serializes json response bodies (in place). Bodies which are already
+        bytes are left as they are. Used by send_response and by middleware
+        which needs the final body bytes (i.e. compression).
+        """
+        if (res.body and res.content_type in _JSON_MEDIA_TYPES
+                and not isinstance(res.body, (bytes, bytearray))):
+            res.body = await self._serialize_json_body(res.body, response_type)
+
+    async def _serialize_json_body(self, body: Any, response_type: Optional[Type[Any]]) -> bytes:
+        """
+        Serializes json response body. Typed bodies (Response[T]) are validated and
+        dumped with a cached TypeAdapter (TRUSTED_RESPONSE_OUTPUT: built from the model fields and dumped without validation),
+        model instances with their own serializer and everything else with the json codec.
+        Large list bodies are serialized in a worker thread (JSON_OFFLOAD_THRESHOLD).
+        """
+        threshold: Optional[int] = self._json_offload_threshold
+        if (threshold is not None and isinstance(body, (list, tuple))
+                and len(body) >= threshold):
+            return await executors.run(self._serialize_json_body_sync, body, response_type)
+        return self._serialize_json_body_sync(body, response_type)
+
+    def _serialize_json_body_sync(self, body: Any, response_type: Optional[Type[Any]]) -> bytes:
+        if isinstance(body, BaseModel):
+            return body.__pydantic_serializer__.to_json(body)
+        adapter = response_adapter(response_type) if response_type is not None else None
+        if adapter is None:
+            return self._json_codec.dumps(body)
+        if self._trusted_response_output and not self._validate_response_sample():
+            trusted_body = construct_response(body, response_type)
+            if trusted_body is not None:
+                try:
+                    return adapter.dump_json(trusted_body, warnings=False)
+                except PydanticSerializationError:
+                    # values pydantic can't dump directly are validated
+                    pass
+        return adapter.dump_json(adapter.validate_python(body, from_attributes=True))
+
+    def _validate_response_sample(self) -> bool:
+        """If a trusted response should be validated (DEBUG or sampled)"""
+        if self.get_conf("DEBUG", False):
+            return True
+        rate: float = self._response_validation_sample_rate
+        return rate > 0 and random.random() < rate
+
     async def _lifespan_app(self, _, receive, send):
         """This loop will listen for 'startup' and 'shutdown'"""
         while True:
             message = await receive()
 
             if message["type"] == "lifespan.startup":
+                await self._backplane.connect()
                 for method in self._on_startup_methods:
                     await run_sync_or_async(method)
                 await send({"type": "lifespan.startup.complete"})
@@ -563,8 +654,12 @@ class PyJolt:
             elif message["type"] == "lifespan.shutdown":
                 for method in self._on_shutdown_methods:
                     await run_sync_or_async(method)
+                await self._backplane.disconnect()
                 for logger_sink_id in self._logger_sink_ids:
                     self.logger.remove(logger_sink_id)
+                if self._access_log is not None:
+                    await self._access_log.stop()
+                executors.shutdown(wait=False)
                 await send({"type": "lifespan.shutdown.complete"})
                 return  # Exit the lifespan loop
 
@@ -574,14 +669,34 @@ class PyJolt:
         """
         method: str = scope["method"].upper()
         url_path: str = scope["path"]
-        self._log_request(scope, method, url_path)
-
         route_handler, path_kwargs = self.router.match(url_path, method)
-        req = self.request_class(scope, receive, self, path_kwargs, cast(Callable, route_handler))
+        access_log = self._access_log
+        if access_log is None:
+            return await self._respond(scope, receive, send, route_handler, path_kwargs)
+        route_name: Optional[str] = getattr(route_handler, "__qualname__", None)
+        if not access_log.track(url_path, route_name):
+            return await self._respond(scope, receive, send, route_handler, path_kwargs)
+        access_send = AccessLogSend(send)
+        try:
+            return await self._respond(scope, receive, access_send, route_handler, path_kwargs)
+        finally:
+            access_log.record(method, url_path, route_name, access_send, scope.get("client"))
 
+    async def _respond(self, scope, receive, send, route_handler: Optional[Callable],
+                       path_kwargs: Mapping[str, Any]):
+        """
+        Runs the matched route handler (or the not found handling) and sends the response
+        """
         if not route_handler:
+            exc = path_kwargs.get("exc")
+            if exc is None or self.exception_handler_for(exc.__class__) is None:
+                # fast path: no request object is needed for the generic response
+                return await self._send_route_not_found(send, exc)
+            req = self.request_class(scope, receive, self, path_kwargs, cast(Callable, route_handler))
             return await self.abort_route_not_found(send, req, path_kwargs)
 
+        req = self.request_class(scope, receive, self, path_kwargs, cast(Callable, route_handler))
+
         try:
             try:
                 res: Response = await self._app(req)
@@ -597,13 +712,18 @@ class PyJolt:
                 return await self.send_response(res, send, None)
             # pylint: disable-next=W0718
             except Exception as exc:
-                handler = (
-                    self._exception_handlers.get(exc.__class__.__name__, None) or None
-                )
+                handler = self.exception_handler_for(exc.__class__)
                 if not handler:
+                    if isinstance(exc, ClientDisconnected):
+                        # nobody to respond to
+                        return None
+                    if isinstance(exc, PayloadTooLarge):
+                        res = req.res.json({"status": "error", "message": exc.message}).status(
+                            HttpStatus.PAYLOAD_TOO_LARGE)
+                        return await self.send_response(res, send, None)
                     #pylint: disable-next=W0719
                     raise Exception("Unhandled exception occured") from exc
-                res = await run_sync_or_async(handler, req, exc)
+                res = await handler(req, exc)
                 response_type = res.expected_body_type() or exc.__class__
                 return await self.send_response(res, send, response_type)
         # pylint: disable-next=W0718
@@ -612,27 +732,18 @@ class PyJolt:
             # if the app is in production (DEBUG = False)
             # else reraises the error
             if not self.get_conf("DEBUG", False):
-                res = req.res.json(
-                    {
-                        "status": "error",
-                        "message": "Internal server error",
-                    }
-                ).status(HttpStatus.INTERNAL_SERVER_ERROR)
+                res = req.res.json(_INTERNAL_SERVER_ERROR_BODY).status(HttpStatus.INTERNAL_SERVER_ERROR)
                 self.logger.critical(
                 f"Unhandled critical error: ({req.method}) {req.path}, {req.route_parameters}"
                 )
                 return await self.send_response(res, send, exc.__class__)
             raise
+        finally:
+            #pylint: disable-next=W0212
+            if req._files:
+                req.close_files()
 
 
-    def _log_request(self, scope, method: str, url_path: str) -> None:
-        """
-        Logs incoming request
-        """
-        logger.info(
-            f"HTTP request. CLIENT: {(scope.get('client') or ("-", ""))[0]}, SCHEME: {scope['scheme']}, METHOD: {method}, PATH: {url_path}, QUERY_STRING: {scope['query_string'].decode('utf-8')}"
-        )
-
     def register_static_controller(self, base_path: str):
         print("Register static: ", base_path)
         static_controller_dec = path(f"{base_path}", open_api_spec=False)
@@ -648,9 +759,9 @@ class PyJolt:
 
     def build(self) -> None:
         """
-        Build the final app by wrapping self._app in all middleware.
-        Apply them in reverse order so the first middleware in the list
-        is the outermost layer.
+        Build the final app by compiling a dispatch pipeline (middleware,
+        controller hooks and endpoint) for every route handler.
+        The first middleware in the list is the outermost layer.
         """
         print(PYJOLT_ASCIART)
         print(f"Starting PyJolt {PYJOLT_VERSION} application '{self.app_name}'")
@@ -658,10 +769,18 @@ class PyJolt:
         if self.get_conf("OPEN_API", False):
             self.build_openapi_spec()
             self.register_openapi_controller()
-        built_app: AppCallableType = self._base_app
-        for factory in reversed(self._middleware):
-            built_app = factory(self, built_app)
-        self._app = built_app
+        # Every middleware is instantiated once. Its next_app resolves the
+        # following stage from the pipeline of the current request.
+        self._middleware_instances = [
+            factory(self, NextStage(position))
+            for position, factory in reversed(list(enumerate(self._middleware)))
+        ][::-1]
+        self.router.compile()
+        self._socket_router.compile()
+        self._route_pipelines = {
+            handler: RoutePipeline(handler, self._middleware_instances)
+            for handler in self.router.endpoints.values()
+        }
         self._is_built = True
 
     def add_extension(self, extension):
@@ -727,7 +846,11 @@ class PyJolt:
         for handler in handlers:
             handler_instance = handler(self)
             handled_exceptions = handler_instance.get_exception_mapping()
-            self._exception_handlers.update(handled_exceptions)
+            # sync/async is resolved once at registration
+            self._exception_handlers.update({
+                exc_class: ensure_async(method) for exc_class, method in handled_exceptions.items()
+            })
+        self._exception_handler_cache.clear()
 
     def url_for(self, endpoint: str, **values) -> str:
         """
@@ -837,6 +960,42 @@ class PyJolt:
         """
         return self
 
+    @property
+    def static_file_cache(self) -> StaticFileCache:
+        """Cache of static files (created on first use, see STATIC_CACHE_* configs)"""
+        if self._static_file_cache is None:
+            self._static_file_cache = StaticFileCache(
+                self._static_files_path,
+                max_bytes=self.get_conf("STATIC_CACHE_MAX_BYTES", None) or 32 * 1024 * 1024,
+                max_file_size=self.get_conf("STATIC_CACHE_MAX_FILE_SIZE", None) or 256 * 1024,
+                immutable=bool(self.get_conf("STATIC_CACHE_IMMUTABLE", False)),
+                check_interval=self.get_conf("STATIC_CACHE_CHECK_INTERVAL", 1.0) or 0.0,
+                max_age=self.get_conf("STATIC_MAX_AGE", None),
+                fingerprint_max_age=self.get_conf("STATIC_FINGERPRINT_MAX_AGE", None) or 31536000,
+            )
+        return self._static_file_cache
+
+    @property
+    def websocket_hub(self) -> WebSocketHub:
+        """Hub of websocket connections (created on first use, see WEBSOCKET_* configs)"""
+        if self._websocket_hub is None:
+            self._websocket_hub = WebSocketHub(
+                queue_size=self.get_conf("WEBSOCKET_QUEUE_SIZE", None) or 100,
+                overflow=self.get_conf("WEBSOCKET_OVERFLOW", None) or "drop_oldest",
+                dumps=self._json_codec.dumps,
+                backplane=self._backplane,
+                channel=app_namespace(self),
+            )
+        return self._websocket_hub
+
+    @property
+    def backplane(self) -> BaseBackplane:
+        """
+        Backplane which carries websocket hub and broadcaster messages
+        between workers (BACKPLANE config, in-memory by default)
+        """
+        return self._backplane
+
     @property
     def static_files_path(self) -> str:
         """Static files paths"""
@@ -854,6 +1013,24 @@ class PyJolt:
     def logger(self):
         return self._logger
 
+    @property
+    def access_log(self) -> Optional[AccessLog]:
+        """Access log pipeline (None if ACCESS_LOG is disabled)"""
+        return self._access_log
+
+    @property
+    def executors(self) -> Executors:
+        """
+        Executor pools for sync handlers, hooks and offloaded work.
+        Use app.executors.stats() for queue depth and wait time metrics.
+        """
+        return executors
+
+    @property
+    def json_codec(self) -> JsonCodec:
+        """JSON codec of the application (JSON_CODEC config)"""
+        return self._json_codec
+
     @property
     def jinja_environment(self) -> Environment:
         return self._jinja_environment
@@ -899,9 +1076,22 @@ class PyJolt:
         """
         method: str = "SOCKET"
         url_path: str = scope["path"]
-        self._log_request(scope, method, url_path)
-
         route_handler, path_kwargs = self._socket_router.match(url_path, method)
+        access_log = self._access_log
+        route_name: Optional[str] = getattr(route_handler, "__qualname__", None)
+        if access_log is None or not access_log.track(url_path, route_name):
+            return await self._run_websocket(scope, receive, send, route_handler, path_kwargs)
+        access_send = AccessLogSend(send)
+        try:
+            return await self._run_websocket(scope, receive, access_send, route_handler, path_kwargs)
+        finally:
+            access_log.record(method, url_path, route_name, access_send, scope.get("client"))
+
+    async def _run_websocket(self, scope, receive, send, route_handler: Optional[Callable],
+                             path_kwargs: Mapping[str, Any]):
+        """
+        Runs the matched websocket handler
+        """
         if not route_handler:
             await send({"type": "websocket.close","code": 1000})
             return
@@ -1,171 +1,46 @@
 # request.py
 #pylint: disable=C0116
-import re
-import json
-import base64
-from io import BytesIO
+import zlib
+from functools import partial
 from urllib.parse import parse_qs
-from typing import Callable, Any, Union, TYPE_CHECKING, Mapping, cast
-import python_multipart as pm
-from pydantic_core import core_schema
+from typing import AsyncGenerator, AsyncIterator, Callable, Any, Optional, Union, TYPE_CHECKING, Mapping
+from pydantic import ValidationError
 
 from .response import Response
+from .datastructures import Headers, QueryParams, Cookies
+from .executors import executors
+from .json_stream import JsonArrayParser, JsonSplitError, NdjsonSplitter
+from .exceptions.http_exceptions import AborterException, PayloadTooLarge
+from .exceptions.runtime_exceptions import ClientDisconnected
+# UploadedFile and extract_boundary are re-exported from here
+#pylint: disable-next=W0611
+from .multipart import StreamingMultipartParser, UploadedFile, extract_boundary as extract_boundary
 
 if TYPE_CHECKING:
+    from pydantic import TypeAdapter
     from .pyjolt import PyJolt
 
-def extract_boundary(content_type: str) -> str:
-    """
-    Pull the boundary=... out of a Content-Type header.
-    """
-    match = re.search(r'boundary="?([^";]+)"?', content_type)
-    if not match:
-        raise ValueError("No boundary found in Content-Type")
-    return match.group(1)
-
-class UploadedFile:
-    """
-    Wrapper around an in-memory/temporary file.
-    """
-    def __init__(self, filename: str, content: bytes, content_type: str):
-        self.filename = filename
-        self.content_type = content_type
-        self._content = content
-        self._stream = BytesIO(content)
-
-    def read(self, size: int = -1) -> bytes:
-        return self._stream.read(size)
-
-    def seek(self, pos: int, whence: int = 0) -> int:
-        return self._stream.seek(pos, whence)
-
-    def save(self, path: str) -> None:
-        with open(path, "wb") as f:
-            self.seek(0)
-            f.write(self._stream.read())
-
-    @property
-    def size(self) -> int:
-        cur = self._stream.tell()
-        self._stream.seek(0, 2)
-        sz = self._stream.tell()
-        self._stream.seek(cur)
-        return sz
-
-    @property
-    def stream(self) -> BytesIO:
-        self.seek(0)
-        return self._stream
-
-    def get_stream(self) -> BytesIO:
-        return BytesIO(self._content)
-
-    def __repr__(self) -> str:
-        return (f"<UploadedFile filename={self.filename!r} "
-                f"size={self.size} content_type={self.content_type!r}>")
-
-    # Pydantic v2 integration
-    @staticmethod
-    def _from_mapping(data: Mapping[str, Any]) -> "UploadedFile":
-        """
-        Accepts dict-like input:
-          - filename: str (required)
-          - content: bytes | bytearray | memoryview | str (base64 or raw text; you decide)
-          - content_type: str (optional; defaults to application/octet-stream)
-        """
-        if "filename" not in data:
-            raise ValueError("UploadedFile requires 'filename'")
-
-        filename = data["filename"]
-        content_type = data.get("content_type", "application/octet-stream")
-
-        if "content" not in data:
-            raise ValueError("UploadedFile requires 'content' (bytes)")
-
-        content = data["content"]
-
-        if isinstance(content, (bytes, bytearray)):
-            content_bytes = bytes(content)
-        elif isinstance(content, memoryview):
-            content_bytes = content.tobytes()
-        elif isinstance(content, str):
-            try:
-                content_bytes = base64.b64decode(content, validate=True)
-            except Exception as e:
-                raise ValueError("Invalid base64 for UploadedFile.content") from e
-        else:
-            raise TypeError(
-                "UploadedFile.content must be bytes/bytearray/memoryview or base64 str"
-            )
-
-        if not isinstance(filename, str):
-            raise TypeError("UploadedFile.filename must be a string")
-        if not isinstance(content_type, str):
-            raise TypeError("UploadedFile.content_type must be a string")
-
-        return UploadedFile(filename=filename, content=content_bytes, content_type=content_type)
-
-    @classmethod
-    def __get_pydantic_core_schema__(cls, source_type: Any, handler: Any) -> core_schema.CoreSchema:
-        """
-        Core validation + serialization.
-        """
-        def validate(v: Any) -> "UploadedFile":
-            if isinstance(v, UploadedFile):
-                return v
-
-            if isinstance(v, Mapping):
-                return cls._from_mapping(v)
-
-            if isinstance(v, tuple):
-                if len(v) == 2:
-                    filename, content = v
-                    return cls._from_mapping({"filename": filename, "content": content})
-                if len(v) == 3:
-                    filename, content, content_type = v
-                    return cls._from_mapping({"filename": filename, "content": content, "content_type": content_type})
-                raise ValueError("UploadedFile tuple input must be (filename, content) or (filename, content, content_type)")
-
-            raise TypeError("Value is not a valid UploadedFile input")
-
-        def serialize(v: "UploadedFile") -> dict[str, Any]:
-            return {
-                "filename": v.filename,
-                "content_type": v.content_type,
-                "size": v.size,
-            }
-
-        return core_schema.no_info_plain_validator_function(
-            validate,
-            serialization=core_schema.plain_serializer_function_ser_schema(
-                serialize,
-                info_arg=False,
-                return_schema=core_schema.dict_schema(),
-            ),
-        )
-
-    @classmethod
-    def __get_pydantic_json_schema__(cls, core_schema: core_schema.CoreSchema, handler: Any) -> dict[str, Any]:
-        """
-        JSON schema for docs / OpenAPI.
-        """
-        return {
-            "type": "object",
-            "title": "UploadedFile",
-            "properties": {
-                "filename": {"type": "string"},
-                "content_type": {"type": "string"},
-                "size": {"type": "integer"},
-            },
-            "required": ["filename"],
-            "additionalProperties": True,
-            "description": "In-memory uploaded file (serialized as metadata by default).",
-        }
+def _item_adapter(model: Any) -> Optional["TypeAdapter"]:
+    if model is None:
+        return None
+    #pylint: disable-next=C0415
+    from .controller.endpoint_metadata import type_adapter
+    adapter = type_adapter(model)
+    if adapter is None:
+        raise TypeError(f"Can't validate items as {model!r}")
+    return adapter
 
 class Request:
     """
     ASGI-style request adapter that lazy-parses JSON, form, and multipart.
+    The Response object and the request context are created on first access.
     """
+    __slots__ = ("_app", "scope", "_receive", "_send", "_body", "_body_consumed",
+                 "_body_received", "_json",
+                 "_form", "_files", "_user", "_route_parameters", "_route_handler",
+                 "_response", "_context", "_headers", "_query_params", "_cookies",
+                 "_pipeline", "state")
+
     def __init__(
         self,
         scope: dict,
@@ -179,14 +54,23 @@ class Request:
         self._receive = receive
         self._send: Callable = None  # type: ignore
         self._body: Union[bytes, None] = None
+        self._body_consumed: bool = False
+        self._body_received: bool = False
         self._json: Union[dict, None]  = None
         self._form: Union[dict, None]  = None
         self._files: Union[dict, None]  = None
         self._user: Any = None
         self._route_parameters = route_parameters
         self._route_handler    = route_handler
-        self._response: Response[Any] = app.response_class(app, self)
-        self._context: dict[str, Any] = {}
+        self._response: Union[Response[Any], None] = None
+        self._context: Union[dict[str, Any], None] = None
+        self._headers: Union[Headers, None] = None
+        self._query_params: Union[QueryParams, None] = None
+        self._cookies: Union[Cookies, None] = None
+        # compiled dispatch pipeline of the route handler (set by PyJolt)
+        self._pipeline: Any = None
+        #: free slot for passing state down the request chain (middleware etc.)
+        self.state: Any = None
 
     @property
     def route_handler(self) -> Callable:
@@ -202,7 +86,8 @@ class Request:
 
     @property
     def method(self) -> str:
-        if self._send is not None:
+        # not _send: middleware (i.e. CORS) also sets it on http requests
+        if self.scope.get("type") == "websocket":
             return "SOCKET"
         return self.scope.get("method", "").upper()
 
@@ -215,21 +100,31 @@ class Request:
         return self.scope.get("query_string", b"").decode("utf-8")
 
     @property
-    def headers(self) -> dict[str, str]:
+    def headers(self) -> Headers:
+        """
+        Immutable view of the request headers (case-insensitive, str or bytes keys).
+        Built from the raw ASGI headers on first access.
+        """
+        if self._headers is None:
+            self._headers = Headers(self.scope.get("headers", []))
+        return self._headers
+
+    @property
+    def query_params(self) -> QueryParams:
         """
-        Decode the raw ASGI headers into a dict of lowercase str→str.
+        Immutable view of the query parameters. Repeated parameters
+        are returned as lists, getlist always returns a list.
         """
-        raw = self.scope.get("headers", [])
-        return {
-            key.decode("latin1").lower(): val.decode("latin1")
-            for key, val in raw
-        }
+        if self._query_params is None:
+            self._query_params = QueryParams(self.scope.get("query_string", b""))
+        return self._query_params
 
     @property
-    def query_params(self) -> dict[str, str]:
-        qs = self.scope.get("query_string", b"")
-        parsed = parse_qs(qs.decode("utf-8"))
-        return cast(dict[str, str], {k: v if len(v) > 1 else v[0] for k, v in parsed.items()})
+    def cookies(self) -> Cookies:
+        """Immutable view of the request cookies"""
+        if self._cookies is None:
+            self._cookies = Cookies(self.headers.getlist("cookie"))
+        return self._cookies
 
     @property
     def user(self) -> Any:
@@ -245,19 +140,114 @@ class Request:
     def remove_user(self) -> None:
         self._user = None
 
+    @property
+    def max_body_size(self) -> Optional[int]:
+        """
+        Body size limit of the request: set by the @max_body_size decorator
+        on the endpoint or the MAX_BODY_SIZE config (None means no limit)
+        """
+        if hasattr(self._route_handler, "_max_body_size"):
+            return self._route_handler._max_body_size # type: ignore[union-attr]
+        return self._app.get_conf("MAX_BODY_SIZE", None)
+
+    @property
+    def body_consumed(self) -> bool:
+        """If the body was received (with body() or stream())"""
+        return self._body_consumed
+
+    @property
+    def body_received(self) -> bool:
+        """If the whole body was received (or the request has no body)"""
+        if self._body_received or self._body is not None:
+            return True
+        if self._body_consumed:
+            return False
+        headers = self.headers
+        return "transfer-encoding" not in headers and headers.get("content-length", "0") == "0"
+
     async def body(self) -> bytes:
         if self._body is not None:
             return self._body
+        parts: list[bytes] = [chunk async for chunk in self.stream()]
+        self._body = parts[0] if len(parts) == 1 else b"".join(parts)
+        return self._body
 
-        parts = []
+    async def stream(self) -> AsyncGenerator[bytes, None]:
+        """
+        Yields the request body in chunks as they are received, without
+        buffering it. Bodies with Content-Encoding gzip are decompressed
+        (DECOMPRESS_REQUEST_BODY). The body size limit (see max_body_size)
+        applies to the received and to the decompressed body, bodies with a larger
+        Content-Length are rejected (PayloadTooLarge) before they are received.
+        The body can be streamed only once, unless it was read with body() first.
+        """
+        if self._body is not None:
+            if self._body:
+                yield self._body
+            return
+        if self._body_consumed:
+            raise RuntimeError("The request body was already consumed")
+        self._body_consumed = True
+
+        limit: Optional[int] = self.max_body_size
+        if limit is not None:
+            content_length = self.headers.get("content-length")
+            if content_length and content_length.isdigit() and int(content_length) > limit:
+                raise PayloadTooLarge(f"Request body is too large (max {limit} bytes)")
+        decompressor = None
+        encoding = self.headers.get("content-encoding")
+        if encoding and encoding.strip().lower() in ("gzip", "x-gzip") \
+                and self._app.get_conf("DECOMPRESS_REQUEST_BODY", True):
+            decompressor = zlib.decompressobj(wbits=31)
+
+        received: int = 0
+        size: int = 0
         while True:
             msg = await self._receive()
-            if msg["type"] == "http.request":
-                parts.append(msg.get("body", b""))
-                if not msg.get("more_body", False):
-                    break
-        self._body = b"".join(parts)
-        return self._body
+            msg_type = msg["type"]
+            if msg_type == "http.disconnect":
+                raise ClientDisconnected()
+            if msg_type != "http.request":
+                continue
+            chunk: bytes = msg.get("body", b"")
+            if chunk:
+                received += len(chunk)
+                if limit is not None and received > limit:
+                    raise PayloadTooLarge(f"Request body is too large (max {limit} bytes)")
+                if decompressor is None:
+                    yield chunk
+                else:
+                    # max_length bounds the memory used by decompression bombs
+                    data = chunk
+                    while data:
+                        max_length = 0 if limit is None else limit - size + 1
+                        try:
+                            out = decompressor.decompress(data, max_length)
+                        except zlib.error as exc:
+                            raise AborterException("Invalid gzip request body") from exc
+                        size += len(out)
+                        if limit is not None and size > limit:
+                            raise PayloadTooLarge(f"Request body is too large (max {limit} bytes)")
+                        if out:
+                            yield out
+                        data = decompressor.unconsumed_tail
+            if not msg.get("more_body", False):
+                break
+        self._body_received = True
+        if decompressor is not None:
+            if not decompressor.eof:
+                raise AborterException("Invalid gzip request body")
+
+    async def wait_disconnect(self) -> None:
+        """
+        Returns when the client disconnects (http requests). The body must have
+        been received (see body_received), otherwise its remainder is discarded.
+        """
+        self._body_consumed = True
+        while True:
+            message = await self._receive()
+            if message["type"] == "http.disconnect":
+                return
 
     async def json(self) -> dict[str, Any]|None:
         if self._json is not None:
@@ -266,11 +256,95 @@ class Request:
         if not raw:
             return None
         try:
-            self._json = json.loads(raw)
-        except json.JSONDecodeError:
+            self._json = self._app.json_codec.loads(raw)
+        except ValueError:
             self._json = None
         return self._json
 
+    async def iter_json_items(self, model: Any = None, *,
+                              batch_size: Optional[int] = None) -> AsyncIterator[Any]:
+        """
+        Yields the elements of a json array body while it is received
+        (only the current element is buffered). Elements are validated with a
+        cached TypeAdapter if a model (or any type) is provided. With batch_size
+        lists of up to batch_size elements are yielded (i.e. for bulk inserts).
+        ```
+        async for batch in req.iter_json_items(Record, batch_size=1000):
+            await insert_many(batch)
+        ```
+        Raises AborterException (400) if the body isn't a json array
+        and pydantic.ValidationError for invalid elements.
+        """
+        parser = JsonArrayParser()
+        adapter = _item_adapter(model)
+        strict = self._strict_validation()
+        parse_item: Optional[Callable[[Any], Any]] = None
+        if adapter is not None:
+            parse_item = partial(adapter.validate_python, strict=strict)
+        async for items in self._iter_items(parser.feed, parser.close, parse_item, batch_size):
+            yield items
+
+    async def iter_ndjson(self, model: Any = None, *,
+                          batch_size: Optional[int] = None) -> AsyncIterator[Any]:
+        """
+        Yields the records of a newline delimited json body (application/x-ndjson,
+        JSON Lines) while it is received. Records are parsed with the application
+        json codec or validated from the raw line with a cached TypeAdapter if a
+        model is provided. See iter_json_items for batch_size.
+        """
+        splitter = NdjsonSplitter()
+        adapter = _item_adapter(model)
+        parse_item: Callable[[Any], Any] = self._app.json_codec.loads
+        if adapter is not None:
+            parse_item = partial(adapter.validate_json, strict=self._strict_validation())
+
+        def close() -> list[bytes]:
+            last = splitter.close()
+            return [last] if last is not None else []
+
+        async for items in self._iter_items(splitter.feed, close, parse_item, batch_size):
+            yield items
+
+    async def _iter_items(self, feed: Callable[[bytes], list[Any]], close: Callable[[], list[Any]],
+                          parse_item: Optional[Callable[[Any], Any]],
+                          batch_size: Optional[int]) -> AsyncIterator[Any]:
+        batch: list[Any] = []
+        done: bool = False
+        stream = self.stream()
+        try:
+            while not done:
+                try:
+                    try:
+                        items = feed(await anext(stream))
+                    except StopAsyncIteration:
+                        items = close()
+                        done = True
+                except JsonSplitError as exc:
+                    raise AborterException(str(exc)) from exc
+                for item in items:
+                    if parse_item is not None:
+                        try:
+                            item = parse_item(item)
+                        except ValidationError:
+                            raise
+                        except ValueError as exc:
+                            raise AborterException(f"Invalid json record: {exc}") from exc
+                    if batch_size is None:
+                        yield item
+                        continue
+                    batch.append(item)
+                    if len(batch) >= batch_size:
+                        yield batch
+                        batch = []
+        finally:
+            await stream.aclose()
+        if batch:
+            yield batch
+
+    def _strict_validation(self) -> Optional[bool]:
+        # None keeps the strict setting of the model config
+        return True if self._app.get_conf("STRICT_REQUEST_VALIDATION", False) else None
+
     async def form(self) -> dict[str, Any]:
         if self._form is not None:
             return self._form
@@ -315,64 +389,60 @@ class Request:
             raise RuntimeError("Accept function is available only on websocket requests")
         await self._send({"type": "websocket.accept"})
 
-    async def _parse_multipart(self, content_type: str) -> tuple[dict, dict]:
+    async def send_json(self, data: Any) -> None:
         """
-        Stream the body through python-multipart, collecting fields and files.
+        Sends data as a json text message (websocket requests)
         """
-        raw = await self.body()
-        stream = BytesIO(raw)
-
-        form_data: dict[str, str] = {}
-        files:     dict[str, UploadedFile] = {}
-
-        def on_field(field: Any) -> None:
-            name = field.field_name
-            val  = getattr(field, "value", None)
-
-            if isinstance(name, bytes):
-                name = name.decode("latin1")
-            if isinstance(val, bytes):
-                val = val.decode("utf-8", "replace")
-
-            form_data[name] = cast(str, val)
-
-        def on_file(f: Any) -> None:
-            raw_name = getattr(f, "field_name", b"") or b""
-            raw_fn   = getattr(f, "file_name", b"") or b""
-            name = raw_name.decode("latin1") if isinstance(raw_name, bytes) else raw_name
-            fn   = raw_fn.decode("latin1")   if isinstance(raw_fn,   bytes) else raw_fn
-
-            fileobj = f.file_object
-            fileobj.seek(0)
-            content = fileobj.read()
-
-            part_ct = ""
-            hdrs = getattr(f, "headers", {})
-            if isinstance(hdrs, dict):
-                c = hdrs.get(b"Content-Type") or hdrs.get("Content-Type")
-                if isinstance(c, bytes):
-                    part_ct = c.decode("latin1")
-                elif isinstance(c, str):
-                    part_ct = c
-
-            files[name] = UploadedFile(
-                filename=fn,
-                content=content,
-                content_type=part_ct
-            )
-
-        header_map = {"Content-Type": content_type}
-
-        pm.parse_form(
-            headers=cast(dict[str, bytes], header_map),
-            input_stream=stream,
-            on_field=on_field,
-            on_file=on_file,
-        )
+        await self.send({"type": "websocket.send",
+                         "text": self._app.json_codec.dumps(data).decode("utf-8")})
 
-        return form_data, files
+    async def receive_json(self) -> Any:
+        """
+        Receives the next message and parses it as json (websocket requests).
+        Returns None if the client disconnected.
+        """
+        message = await self.receive()
+        if message["type"] == "websocket.disconnect":
+            return None
+        data = message.get("bytes")
+        if data is None:
+            data = message.get("text", "")
+        return self._app.json_codec.loads(data)
 
-    async def get_data(self, location: str = "json") -> dict[str, Any]|None:
+    async def _parse_multipart(self, content_type: str) -> tuple[dict, dict]:
+        """
+        Streams the body through the multipart parser, collecting fields and files.
+        File parts are spooled to disk above MULTIPART_SPOOL_THRESHOLD bytes.
+        """
+        get_conf = self._app.get_conf
+        parser = StreamingMultipartParser(
+            content_type,
+            spool_threshold=get_conf("MULTIPART_SPOOL_THRESHOLD", None) or 1024 * 1024,
+            max_file_size=get_conf("MULTIPART_MAX_FILE_SIZE", None),
+            max_field_size=get_conf("MULTIPART_MAX_FIELD_SIZE", None),
+            max_fields=get_conf("MULTIPART_MAX_FIELDS", None),
+            max_files=get_conf("MULTIPART_MAX_FILES", None),
+            hash_algorithm=get_conf("MULTIPART_HASH_ALGORITHM", None),
+            spool_dir=get_conf("MULTIPART_SPOOL_DIR", None),
+        )
+        try:
+            async for chunk in self.stream():
+                if parser.spooling_to_disk:
+                    # file writes may block, keep them off the event loop
+                    await executors.run(parser.feed, chunk)
+                else:
+                    parser.feed(chunk)
+        except BaseException:
+            parser.close()
+            raise
+        return parser.finish()
+
+    def close_files(self) -> None:
+        """Closes uploaded files (temporary files are removed)"""
+        for file in (self._files or {}).values():
+            file.close()
+
+    async def get_data(self, location: str = "json") -> Mapping[str, Any]|None:
         if location == "json":
             return await self.json()
         if location == "form":
@@ -387,12 +457,16 @@ class Request:
     
     @property
     def response(self) -> Response:
+        if self._response is None:
+            self._response = self._app.response_class(self._app, self)
         return self._response
 
     @property
     def res(self) -> Response:
-        return self._response
-    
+        return self.response
+
     @property
     def context(self) -> dict[str, Any]:
+        if self._context is None:
+            self._context = {}
         return self._context
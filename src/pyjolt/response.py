@@ -1,21 +1,31 @@
 """
 Response class. Holds all information regarding responses to individual requests
 """
-from collections.abc import AsyncIterable, Iterable
+import os
+from collections.abc import AsyncIterable, Iterable, Mapping
+from datetime import datetime
 from typing import (Any, Optional, TYPE_CHECKING,
                     Self, TypeVar, Generic, Type,
                     cast, AsyncIterator)
 
 from .media_types import MediaType
+from .datastructures import ResponseHeaders
 from .utilities import run_sync_or_async
+from .file_response import prepare_file_response
+from .streaming import Chunk, iterate, record_encoder, encode_ndjson, encode_json_array
+from .sse import Broadcaster, event_stream
+from .conditional.validators import quote_etag, http_date, evaluate_preconditions
 from .http_statuses import HttpStatus
 
 if TYPE_CHECKING:
+    from jinja2 import Environment
     from .pyjolt import PyJolt
     from .request import Request
 
 U = TypeVar("U")
 
+_PRECONDITION_FAILED_BODY: bytes = b'{"status":"error","message":"Precondition failed"}'
+
 class Response(Generic[U]):
     """
     Response class of application. Holds all data (headers, body, status_code of the response)
@@ -24,17 +34,52 @@ class Response(Generic[U]):
     return res.json({"message": "My message", "status": "some status"}).status(200)
     ```
     """
+    __slots__ = ("_app", "_request", "status_code", "_headers", "body",
+                 "_render_engine", "_zero_copy", "_expected_body_type", "_stream", "_coalesce")
+
     def __init__(self, app: "PyJolt", request: "Request") -> None:
         self._app = app
         self._request = request
         self.status_code: int|HttpStatus = HttpStatus.OK #default status code is 200
-        self.headers: dict = {}
+        self._headers: ResponseHeaders = ResponseHeaders()
         self.body: Optional[U] = None
-        self.render_engine = self._app.jinja_environment
+        self._render_engine: Optional["Environment"] = None
         self._zero_copy = None
         self._expected_body_type: Optional[Type[Any]] = None
 
-        self._stream: Optional[AsyncIterable[bytes] | Iterable[bytes]] = None
+        self._stream: Optional[AsyncIterable[Chunk] | Iterable[Chunk]] = None
+        self._coalesce: bool = True
+
+    @property
+    def headers(self) -> ResponseHeaders:
+        """
+        Response headers (pre-encoded, case-insensitive mapping).
+        Use headers.add(name, value) for repeated headers.
+        """
+        return self._headers
+
+    @headers.setter
+    def headers(self, headers: Mapping[str, Any]|Iterable[tuple[Any, Any]]) -> None:
+        self._headers = ResponseHeaders(headers)
+
+    @property
+    def request(self) -> "Request":
+        """Request of the response"""
+        return self._request
+
+    @property
+    def render_engine(self) -> "Environment":
+        """
+        Jinja environment used for rendering templates
+        (the application environment unless set)
+        """
+        if self._render_engine is None:
+            self._render_engine = self._app.jinja_environment
+        return self._render_engine
+
+    @render_engine.setter
+    def render_engine(self, engine: "Environment") -> None:
+        self._render_engine = engine
 
     def status(self, status_code: int|HttpStatus) -> Self:
         """
@@ -62,6 +107,55 @@ class Response(Generic[U]):
         self.body = data
         return self
 
+    def set_etag(self, value: str, weak: bool = False) -> Self:
+        """
+        Sets the ETag header. Unquoted values (i.e. a version number
+        or a hash) are quoted.
+        """
+        self._headers["etag"] = quote_etag(str(value), weak)
+        return self
+
+    def set_last_modified(self, value: datetime|float|int) -> Self:
+        """Sets the Last-Modified header (datetime or timestamp)"""
+        self._headers["last-modified"] = http_date(value)
+        return self
+
+    def check_preconditions(self) -> bool:
+        """
+        Evaluates the conditional headers of the request (If-None-Match, If-Match,
+        If-Modified-Since, If-Unmodified-Since) against the ETag/Last-Modified
+        headers of the response. If a condition fails the response is turned into
+        304 Not Modified (GET/HEAD) or 412 Precondition Failed and True is returned.
+        Handlers can set a cheap validator and return early:
+        ```
+        if req.res.set_etag(f"user-{user_id}-{version}").check_preconditions():
+            return req.res
+        ```
+        """
+        request_headers = self._request.headers
+        status = evaluate_preconditions(
+            self._request.method,
+            self._headers.get("etag"),
+            self._headers.get("last-modified"),
+            request_headers.get("if-match"),
+            request_headers.get("if-none-match"),
+            request_headers.get("if-modified-since"),
+            request_headers.get("if-unmodified-since"),
+        )
+        if status is None:
+            return False
+        self._stream = None
+        self._zero_copy = None
+        if "content-length" in self._headers:
+            del self._headers["content-length"]
+        if status == 304:
+            self.body = None
+        else:
+            self._headers["content-type"] = MediaType.APPLICATION_JSON.value
+            self.body = cast(U, _PRECONDITION_FAILED_BODY)
+        self.status_code = status
+        return True
+
     def no_content(self) -> Self:
         """
         Returns a response with no content (body) and status 204
@@ -131,14 +225,29 @@ class Response(Generic[U]):
         self.status(HttpStatus.OK)
         return self
 
-    def send_file(self, body, headers) -> Self:
+    def send_file(self, body: bytes|str|os.PathLike[str], headers: Optional[Mapping[str, str]] = None, *,
+                  content_type: Optional[str] = None, filename: Optional[str] = None) -> Self:
         """
-        For sending files
-        Sets correct headers and body of the response
+        For sending files.
+        If body is a path the file is sent without reading it into memory:
+        Content-Type (guessed if not provided), Content-Length, ETag and Last-Modified
+        are set, conditional and Range requests are answered (304/206/416).
+        filename sets the Content-Disposition (download) header.
+        If body is bytes it is sent as it is with the provided headers.
+        Raises FileNotFoundError if the path isn't a file.
         """
-        for k, v in headers.items():
+        for k, v in (headers or {}).items():
             self.headers[k] = v
-        self.body = body
+        if isinstance(body, (str, os.PathLike)):
+            prepare_file_response(self, os.fspath(body), content_type=content_type,
+                                  filename=filename,
+                                  range_header=self._request.headers.get("range"))
+            return self
+        if content_type is not None:
+            self.headers["content-type"] = content_type
+        if filename:
+            self.headers["content-disposition"] = f'attachment; filename="{filename}"'
+        self.body = cast(U, body)
         return self
 
     def set_header(self, key: str, value: str) -> Self:
@@ -148,7 +257,7 @@ class Response(Generic[U]):
         key: Header name
         value: Header value
         """
-        self.headers[key.lower()] = value
+        self._headers[key] = value
         return self
     
     def set_headers(self, headers: dict[str, str]) -> Self:
@@ -189,12 +298,8 @@ class Response(Generic[U]):
         if http_only:
             cookie_parts.append("HttpOnly")
 
-        cookie_header = "; ".join(cookie_parts)
-        if "set-cookie" in self.headers:
-            self.headers["set-cookie"] += f", {cookie_header}"
-        else:
-            self.headers["set-cookie"] = cookie_header
-
+        # every cookie is sent in its own set-cookie header
+        self._headers.add("set-cookie", "; ".join(cookie_parts))
         return self
     
     @property
@@ -203,7 +308,7 @@ class Response(Generic[U]):
         Gets the Content-Type header of the response.
         content_type: The MIME type to set as the Content-Type
         """
-        return cast(str, self.headers.get("content-type", None))
+        return cast(str, self._headers.get("content-type", None))
 
     def delete_cookie(self, cookie_name: str,
                       path: str = "/", domain: Optional[str] = None) -> Self:
@@ -219,12 +324,7 @@ class Response(Generic[U]):
         if domain:
             cookie_parts.append(f"Domain={domain}")
 
-        cookie_header = "; ".join(cookie_parts)
-        if "set-cookie" in self.headers:
-            self.headers["set-cookie"] += f", {cookie_header}"
-        else:
-            self.headers["set-cookie"] = cookie_header
-
+        self._headers.add("set-cookie", "; ".join(cookie_parts))
         return self
 
     def set_zero_copy(self, data) -> Self:
@@ -243,15 +343,19 @@ class Response(Generic[U]):
 
     def stream(
         self,
-        iterable: AsyncIterable[bytes] | Iterable[bytes]
+        iterable: AsyncIterable[bytes] | Iterable[bytes],
+        *,
+        coalesce: bool = True
     ) -> Self:
         """
         Method for streaming response
 
-        iterable: async or sync iterable yielding bytes (or bytearray/str)
-        content_type: MIME type of the stream
+        iterable: async or sync iterable yielding bytes (or bytearray/memoryview/str)
+        coalesce: join small chunks into larger messages (STREAM_COALESCE_SIZE/STREAM_FLUSH_INTERVAL).
+        Use False if every chunk must reach the client immediately.
         """
         self._stream = iterable
+        self._coalesce = coalesce
         self.headers["content-type"] = MediaType.APPLICATION_OCTET_STREAM.value
         # Body must be None so the app knows to stream
         self.body = None
@@ -259,32 +363,107 @@ class Response(Generic[U]):
 
     def stream_text(
         self,
-        iterable: AsyncIterable[str] | Iterable[str]
+        iterable: AsyncIterable[str] | Iterable[str],
+        *,
+        coalesce: bool = True
     ) -> Self:
         """
         Method for streaming text response
         """
         async def _aiter() -> AsyncIterator[bytes]:
-            if hasattr(iterable, "__aiter__"):
-                async for chunk in iterable:  # type: ignore[attr-defined]
-                    yield str(chunk).encode("utf-8")
-            else:
-                for chunk in iterable:  # type: ignore[operator]
-                    yield str(chunk).encode("utf-8")
-
-        self._stream = _aiter()
+            async for chunk in iterate(iterable):
+                yield str(chunk).encode("utf-8")
+
+        self.stream(_aiter(), coalesce=coalesce)
         self.headers["content-type"] = MediaType.TEXT_PLAIN.value + "; charset=utf-8"
-        self.body = None
+        return self
+
+    def stream_ndjson(
+        self,
+        records: AsyncIterable[Any] | Iterable[Any],
+        *,
+        coalesce: bool = True
+    ) -> Self:
+        """
+        Streams records (dicts, pydantic models...) as newline delimited json
+        (application/x-ndjson), one line per record.
+        ```
+        return req.res.stream_ndjson(db.stream_rows(query))
+        ```
+        """
+        self.stream(encode_ndjson(records, self._app.json_codec.dumps), coalesce=coalesce)
+        self.headers["content-type"] = MediaType.APPLICATION_X_NDJSON.value
+        return self
+
+    def stream_json_array(
+        self,
+        records: AsyncIterable[Any] | Iterable[Any],
+        *,
+        coalesce: bool = True
+    ) -> Self:
+        """
+        Streams records (dicts, pydantic models...) as the elements
+        of a json array (application/json).
+        """
+        self.stream(encode_json_array(records, self._app.json_codec.dumps), coalesce=coalesce)
+        self.headers["content-type"] = MediaType.APPLICATION_JSON.value
+        return self
+
+    def sse(
+        self,
+        events: "Broadcaster | AsyncIterable[Any] | Iterable[Any]",
+        *,
+        retry: Optional[int] = None,
+        ping_interval: Optional[float] = None
+    ) -> Self:
+        """
+        Server-Sent Events response (text/event-stream). events are ServerSentEvent
+        objects or the data of unnamed events (non str data is encoded as json).
+        A Broadcaster is subscribed to, replaying the events after the Last-Event-ID
+        of the request. retry (milliseconds) defaults to SSE_RETRY, ping_interval
+        (seconds between keep-alive comments, 0 disables them) to SSE_PING_INTERVAL.
+        ```
+        return req.res.sse(notifications) #notifications = Broadcaster()
+        ```
+        """
+        last_event_id: Optional[str] = None
+        if isinstance(events, Broadcaster):
+            last_event_id = self._request.headers.get("last-event-id")
+        if retry is None:
+            retry = self._app.get_conf("SSE_RETRY", None)
+        if ping_interval is None:
+            ping_interval = self._app.get_conf("SSE_PING_INTERVAL", 15.0)
+        self.stream(event_stream(events, record_encoder(self._app.json_codec.dumps),
+                                 retry=retry, ping_interval=ping_interval,
+                                 last_event_id=last_event_id), coalesce=False)
+        self.headers["content-type"] = MediaType.TEXT_EVENT_STREAM.value
+        self.headers["cache-control"] = "no-cache"
+        # disables response buffering of nginx
+        self.headers["x-accel-buffering"] = "no"
         return self
 
     @property
-    def stream_iterable(self) -> Optional[AsyncIterable[bytes] | Iterable[bytes]]:
+    def stream_iterable(self) -> Optional[AsyncIterable[Chunk] | Iterable[Chunk]]:
         return self._stream
 
+    @stream_iterable.setter
+    def stream_iterable(self, iterable: Optional[AsyncIterable[Chunk] | Iterable[Chunk]]) -> None:
+        """Replaces the stream without changing headers (i.e. to wrap it in middleware)"""
+        self._stream = iterable
+
     @property
     def is_streaming(self) -> bool:
         return self._stream is not None
 
+    @property
+    def coalesce(self) -> bool:
+        """If small chunks of the stream are joined before they are sent"""
+        return self._coalesce
+
+    @coalesce.setter
+    def coalesce(self, coalesce: bool) -> None:
+        self._coalesce = coalesce
+
     @property
     def zero_copy(self):
         """Returns zero copy data"""
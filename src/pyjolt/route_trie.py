@@ -0,0 +1,231 @@
+"""
+Compiled segment trie for fast route matching.
+Built once from the registered Werkzeug rules (Router.compile) and used by
+Router.match instead of binding the Werkzeug Map on every request.
+Matching mirrors Werkzeug's state machine matcher: static segments are tried
+before converters, converters are tried by weight and the walk backtracks
+when a branch does not lead to a full match.
+"""
+import re
+import uuid
+from typing import Any, Callable, Iterable, Optional
+
+from werkzeug.exceptions import NotFound, MethodNotAllowed
+
+_RULE_VARIABLE_RE = re.compile(
+    r"^<(?:(?P<converter>[a-zA-Z_][a-zA-Z0-9_]*)(?P<arguments>\(.*\))?:)?"
+    r"(?P<variable>[a-zA-Z_][a-zA-Z0-9_]*)>$"
+)
+_UUID_RE = re.compile(
+    r"[A-Fa-f0-9]{8}-[A-Fa-f0-9]{4}-[A-Fa-f0-9]{4}-[A-Fa-f0-9]{4}-[A-Fa-f0-9]{12}\Z"
+)
+
+#: returned by converters if the path segment does not match
+NO_MATCH = object()
+
+class SlashRequired(Exception):
+    """
+    Raised if the path only matches with an additional trailing slash
+    and the router uses strict slashes (redirect is required).
+    """
+
+class UnsupportedRule(Exception):
+    """
+    Raised for rules that can't be compiled into the trie
+    (converter arguments, custom converters, mixed static/variable segments...).
+    Such rules are matched by the Werkzeug fallback.
+    """
+
+class _Converter:
+    """Base segment converter. Matches a single, non-empty path segment."""
+    weight: int = 100
+    final: bool = False
+
+    def convert(self, part: str) -> Any:
+        return part if part else NO_MATCH
+
+class _StringConverter(_Converter):
+    """Default/string converter (<name> or <string:name>)"""
+
+class _IntConverter(_Converter):
+    """Unsigned integer converter (<int:name>)"""
+    weight = 50
+
+    def convert(self, part: str) -> Any:
+        if part.isdecimal():
+            return int(part)
+        return NO_MATCH
+
+class _FloatConverter(_Converter):
+    """Unsigned float converter (<float:name>)"""
+    weight = 50
+
+    def convert(self, part: str) -> Any:
+        whole, dot, fraction = part.partition(".")
+        if dot and whole.isdecimal() and fraction.isdecimal():
+            return float(part)
+        return NO_MATCH
+
+class _UUIDConverter(_Converter):
+    """UUID converter (<uuid:name>)"""
+
+    def convert(self, part: str) -> Any:
+        if len(part) == 36 and _UUID_RE.match(part):
+            return uuid.UUID(part)
+        return NO_MATCH
+
+class _PathConverter(_Converter):
+    """
+    Path converter (<path:name>). Consumes all remaining segments,
+    therefore it is only supported as the last segment of a rule.
+    """
+    weight = 200
+    final = True
+
+    def convert(self, part: str) -> Any:
+        if part and part[0] != "/":
+            return part
+        return NO_MATCH
+
+_CONVERTERS: dict[str, type[_Converter]] = {
+    "default": _StringConverter,
+    "string": _StringConverter,
+    "int": _IntConverter,
+    "float": _FloatConverter,
+    "uuid": _UUIDConverter,
+    "path": _PathConverter,
+}
+
+class _Node:
+    """Trie node with static children, converter children and a method table"""
+    __slots__ = ("static", "dynamic", "methods")
+
+    def __init__(self) -> None:
+        self.static: dict[str, "_Node"] = {}
+        # (converter_name, converter, child) sorted by converter weight
+        self.dynamic: list[tuple[str, _Converter, "_Node"]] = []
+        # method -> (endpoint, variable names)
+        self.methods: dict[str, tuple[Callable, tuple[str, ...]]] = {}
+
+    def dynamic_child(self, converter_name: str) -> "_Node":
+        for name, _, child in self.dynamic:
+            if name == converter_name:
+                return child
+        child = _Node()
+        self.dynamic.append((converter_name, _CONVERTERS[converter_name](), child))
+        #stable sort keeps registration order for converters with the same weight
+        self.dynamic.sort(key=lambda entry: entry[1].weight)
+        return child
+
+class RouteTrie:
+    """
+    Segment trie with static children, typed converter nodes and
+    per-node method tables.
+    """
+
+    def __init__(self, strict_slashes: bool = False):
+        self._strict_slashes = strict_slashes
+        self._root = _Node()
+        # full static path -> method table (skips the trie walk)
+        self._static_routes: dict[str, dict[str, tuple[Callable, tuple[str, ...]]]] = {}
+
+    def add(self, rule: str, endpoint: Callable, methods: Iterable[str]) -> None:
+        """
+        Adds rule to the trie. Raises UnsupportedRule if the rule
+        must be handled by the Werkzeug fallback.
+        """
+        if not rule.startswith("/"):
+            raise UnsupportedRule(rule)
+        segments = rule[1:].split("/")
+        node = self._root
+        variables: list[str] = []
+        for index, segment in enumerate(segments):
+            if "<" not in segment and ">" not in segment:
+                node = node.static.setdefault(segment, _Node())
+                continue
+            match = _RULE_VARIABLE_RE.match(segment)
+            if match is None or match.group("arguments"):
+                raise UnsupportedRule(rule)
+            converter_name: str = match.group("converter") or "default"
+            converter = _CONVERTERS.get(converter_name)
+            if converter is None:
+                raise UnsupportedRule(rule)
+            if converter.final and index != len(segments) - 1:
+                raise UnsupportedRule(rule)
+            variables.append(match.group("variable"))
+            node = node.dynamic_child(converter_name)
+
+        target = (endpoint, tuple(variables))
+        for method in methods:
+            #first registered rule wins (same as Werkzeug)
+            node.methods.setdefault(method, target)
+        if not variables:
+            self._static_routes[rule] = node.methods
+
+    def match(self, path: str, method: str) -> tuple[Callable, dict[str, Any]]:
+        """
+        Matches path and method. Returns (endpoint, path_variables).
+        Raises NotFound, MethodNotAllowed or SlashRequired.
+        """
+        path = "/" + path.lstrip("/")
+        static_methods = self._static_routes.get(path)
+        if static_methods is not None:
+            target = static_methods.get(method)
+            if target is not None:
+                return target[0], {}
+
+        have_match_for: set[str] = set()
+        parts = path[1:].split("/")
+        rv = self._walk(self._root, parts, 0, method, [], have_match_for)
+        if rv is None:
+            if have_match_for:
+                raise MethodNotAllowed(valid_methods=list(have_match_for))
+            raise NotFound()
+        (endpoint, names), values = rv
+        return endpoint, dict(zip(names, values))
+
+    def _walk(self, node: _Node, parts: list[str], index: int, method: str,
+              values: list[Any], have_match_for: set[str]) -> Optional[tuple]:
+        """
+        Recursively walks the trie. Static children are tried first,
+        then converter children (by weight) with backtracking.
+        """
+        last = len(parts)
+        if index == last:
+            target = node.methods.get(method)
+            if target is not None:
+                return target, values
+            have_match_for.update(node.methods)
+            slash_node = node.static.get("")
+            if slash_node is not None and method in slash_node.methods:
+                if self._strict_slashes:
+                    raise SlashRequired()
+                return slash_node.methods[method], values
+            return None
+
+        part = parts[index]
+        child = node.static.get(part)
+        if child is not None:
+            rv = self._walk(child, parts, index + 1, method, values, have_match_for)
+            if rv is not None:
+                return rv
+
+        for _, converter, child in node.dynamic:
+            if converter.final:
+                value = converter.convert("/".join(parts[index:]))
+                next_index = last
+            else:
+                value = converter.convert(part)
+                next_index = index + 1
+            if value is not NO_MATCH:
+                rv = self._walk(child, parts, next_index, method, values + [value], have_match_for)
+                if rv is not None:
+                    return rv
+
+        # trailing slash on a rule without one (non-strict rules only)
+        if not self._strict_slashes and part == "" and index == last - 1:
+            target = node.methods.get(method)
+            if target is not None:
+                return target, values
+            have_match_for.update(node.methods)
+        return None
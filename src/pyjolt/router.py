@@ -1,18 +1,96 @@
 """
 Router class for application routing. Uses Wrkzeug under the hood.
 """
-from typing import Callable, Any, Mapping
+from collections import OrderedDict
+from typing import Callable, Any, Mapping, Optional
 from werkzeug.routing import Map, Rule
 from werkzeug.exceptions import NotFound, MethodNotAllowed
 
+from .route_trie import RouteTrie, SlashRequired, UnsupportedRule
+
+class RouteMatchCache:
+    """
+    Bounded LRU cache of router match results keyed on (method, path).
+    Stores the matched endpoint and path variables or the NotFound/MethodNotAllowed
+    result. Matches of static rules are always admitted, parameterised paths
+    and misses only until `dynamic_limit` of them are cached. This keeps
+    high-cardinality paths (ids, scanners...) from flushing the hot static paths.
+    """
+    def __init__(self, maxsize: int = 1024, dynamic_limit: int = 256):
+        self._maxsize = maxsize
+        self._dynamic_limit = dynamic_limit
+        # (method, path) -> (endpoint, path_variables, is_dynamic)
+        self._entries: OrderedDict[tuple[str, str],
+                                   tuple[Callable|None, Mapping[str, Any], bool]] = OrderedDict()
+        self._dynamic_count: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get(self, method: str, path: str) -> Optional[tuple[Callable|None, Mapping[str, Any]]]:
+        """Returns cached (endpoint, path_variables) or None"""
+        key = (method, path)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0], dict(entry[1])
+
+    def put(self, method: str, path: str, endpoint: Callable|None,
+            path_variables: Mapping[str, Any]) -> None:
+        """Stores match result if admitted by the cache policy"""
+        # static rules have no path variables, misses carry the exception
+        is_dynamic = bool(path_variables)
+        if is_dynamic:
+            if self._dynamic_count >= self._dynamic_limit:
+                return
+            self._dynamic_count += 1
+        self._entries[(method, path)] = (endpoint, dict(path_variables), is_dynamic)
+        if len(self._entries) > self._maxsize:
+            _, evicted = self._entries.popitem(last=False)
+            if evicted[2]:
+                self._dynamic_count -= 1
+
+    def clear(self) -> None:
+        """Removes all cached entries. Counters are preserved."""
+        self._entries.clear()
+        self._dynamic_count = 0
+
+    def info(self) -> dict[str, Any]:
+        """Cache statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "maxsize": self._maxsize,
+            "dynamic_entries": self._dynamic_count,
+            "dynamic_limit": self._dynamic_limit,
+        }
+
 class Router:
     """
     A Router class that leverages Werkzeug’s Map/Rule system.
+    Once compiled (PyJolt.build) routes are matched with a compiled
+    segment trie. The Werkzeug map is kept for url building and as
+    a fallback for rules the trie does not support.
+    An optional RouteMatchCache can be placed in front of the matcher.
     """
-    def __init__(self, strict_slashes: bool = False):
+    def __init__(self, strict_slashes: bool = False,
+                 match_cache_size: Optional[int] = None,
+                 match_cache_dynamic_limit: int = 256):
         self.url_map = Map(strict_slashes=strict_slashes)
         # endpoint_name -> function
         self.endpoints: dict[str, Callable] = {}
+        self._strict_slashes = strict_slashes
+        self._trie: Optional[RouteTrie] = None
+        self._compile_on_match: bool = False
+        self._has_fallback_rules: bool = False
+        self._match_cache: Optional[RouteMatchCache] = None
+        if match_cache_size:
+            self._match_cache = RouteMatchCache(match_cache_size, match_cache_dynamic_limit)
 
     def add_route(self, path: str, endpoint: Callable, methods: list[str], endpoint_name: str):
         """
@@ -24,12 +102,66 @@ class Router:
         self.endpoints[endpoint_name] = endpoint
         # Add a single Rule that handles the specified methods
         self.url_map.add(Rule(path, endpoint=endpoint_name, methods=methods))
+        # Routes added after compilation invalidate the trie and cached matches
+        self._trie = None
+        if self._match_cache is not None:
+            self._match_cache.clear()
+
+    def compile(self) -> None:
+        """
+        Compiles all registered rules into the route trie.
+        Rules which can't be compiled are matched by Werkzeug.
+        """
+        trie = RouteTrie(self._strict_slashes)
+        has_fallback_rules = False
+        for rule in self.url_map.iter_rules():
+            try:
+                trie.add(rule.rule, self.endpoints[rule.endpoint], rule.methods or [])
+            except UnsupportedRule:
+                has_fallback_rules = True
+        self._has_fallback_rules = has_fallback_rules
+        self._trie = trie
+        self._compile_on_match = True
+        if self._match_cache is not None:
+            self._match_cache.clear()
 
     def match(self, path: str, method: str) -> tuple[Callable|None, Mapping[str, Any]]:
         """
         Matches the path and method against the routing map.
         Returns (endpoint_function, path_variables_dict) if found, otherwise (None, {}).
         """
+        cache = self._match_cache
+        if cache is None:
+            return self._match(path, method)
+        cached = cache.get(method, path)
+        if cached is not None:
+            return cached
+        endpoint, path_variables = self._match(path, method)
+        cache.put(method, path, endpoint, path_variables)
+        return endpoint, path_variables
+
+    def _match(self, path: str, method: str) -> tuple[Callable|None, Mapping[str, Any]]:
+        """
+        Matches with the compiled trie or with Werkzeug if the router is not compiled.
+        """
+        if self._trie is None:
+            if not self._compile_on_match:
+                return self._match_werkzeug(path, method)
+            self.compile()
+        try:
+            return self._trie.match(path, method) # type: ignore[union-attr]
+        except (NotFound, MethodNotAllowed) as exc:
+            if self._has_fallback_rules or "//" in path.lstrip("/"):
+                return self._match_werkzeug(path, method)
+            return None, {"method": method, "path": path, "exc": exc}
+        except SlashRequired:
+            # Werkzeug produces the redirect
+            return self._match_werkzeug(path, method)
+
+    def _match_werkzeug(self, path: str, method: str) -> tuple[Callable|None, Mapping[str, Any]]:
+        """
+        Matches the path and method with the Werkzeug routing map.
+        """
         adapter = self.url_map.bind("", path_info=path)
         try:
             endpoint_name, kwargs = adapter.match(method=method)
@@ -38,3 +170,7 @@ class Router:
         except (NotFound, MethodNotAllowed) as exc:
             return None, {"method": method, "path": path, "exc": exc}
 
+    @property
+    def match_cache(self) -> Optional[RouteMatchCache]:
+        """Match cache (None if disabled)"""
+        return self._match_cache
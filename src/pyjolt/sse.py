@@ -0,0 +1,362 @@
+"""
+Server-Sent Events.
+ServerSentEvent frames events (text/event-stream), event_stream turns
+an iterable of events into the body of an SSE response (with retry hint and
+keep-alive comments) and Broadcaster fans events of one producer out to many
+subscribers through bounded queues, with a replay buffer for reconnects
+(Last-Event-ID).
+"""
+import os
+import re
+import struct
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterable, Iterable
+from typing import Any, AsyncIterator, Callable, Literal, Optional, TYPE_CHECKING
+
+from .json_codec import get_json_codec
+from .streaming import iterate, record_encoder
+
+if TYPE_CHECKING:
+    from .backplane import BaseBackplane
+
+#: keep-alive comment (ignored by clients)
+PING: bytes = b": ping\n\n"
+
+_LINE_BREAK = re.compile(r"\r\n|\r|\n")
+
+# backplane payload: id and event lengths (_NONE_LENGTH: None), id, event, frame
+_BACKPLANE_HEADER = struct.Struct("!HH")
+_NONE_LENGTH = 0xFFFF
+
+class ServerSentEvent:
+    """
+    A single event. data which isn't a str is encoded as json.
+    The encoded frame is cached (events published to many subscribers
+    are encoded only once).
+    """
+    __slots__ = ("data", "event", "id", "retry", "comment", "_encoded")
+
+    def __init__(self, data: Any = None, *, event: Optional[str] = None,
+                 id: Optional[str] = None, retry: Optional[int] = None, #pylint: disable=W0622
+                 comment: Optional[str] = None):
+        for name, value in (("event", event), ("id", id)):
+            if value is not None and (_LINE_BREAK.search(value) or "\0" in value):
+                raise ValueError(f"Event {name} must not contain line breaks or NUL characters")
+        self.data = data
+        self.event = event
+        self.id = id
+        self.retry = retry
+        self.comment = comment
+        self._encoded: Optional[bytes] = None
+
+    def encode(self, dumps: Optional[Callable[[Any], bytes]] = None) -> bytes:
+        """The event frame (dumps encodes non str data, defaults to the stdlib json codec)"""
+        if self._encoded is not None:
+            return self._encoded
+        lines: list[str] = []
+        if self.comment is not None:
+            lines.extend(f": {line}" for line in _LINE_BREAK.split(self.comment))
+        if self.event is not None:
+            lines.append(f"event: {self.event}")
+        if self.id is not None:
+            lines.append(f"id: {self.id}")
+        if self.retry is not None:
+            lines.append(f"retry: {int(self.retry)}")
+        data = self.data
+        if data is not None:
+            if isinstance(data, (bytes, bytearray, memoryview)):
+                data = bytes(data).decode("utf-8")
+            elif not isinstance(data, str):
+                data = (dumps or _default_dumps)(data).decode("utf-8")
+            lines.extend(f"data: {line}" for line in _LINE_BREAK.split(data))
+        self._encoded = ("\n".join(lines) + "\n\n").encode("utf-8")
+        return self._encoded
+
+    def __repr__(self) -> str:
+        return f"<ServerSentEvent event={self.event!r} id={self.id!r}>"
+
+_default_dumps: Callable[[Any], bytes] = record_encoder(get_json_codec("stdlib").dumps)
+
+def _as_event(item: Any) -> ServerSentEvent:
+    return item if isinstance(item, ServerSentEvent) else ServerSentEvent(item)
+
+async def event_stream(events: "Broadcaster | AsyncIterable[Any] | Iterable[Any]",
+                       dumps: Optional[Callable[[Any], bytes]] = None, *,
+                       retry: Optional[int] = None,
+                       ping_interval: Optional[float] = None,
+                       last_event_id: Optional[str] = None) -> AsyncIterator[bytes]:
+    """
+    Encodes events (ServerSentEvent objects or data of unnamed events) as an
+    event stream. Starts with the retry hint (milliseconds) if given and sends
+    a keep-alive comment whenever no event was sent for ping_interval seconds.
+    A Broadcaster is subscribed to (replaying the events after last_event_id)
+    only when the stream starts, so streams which are never sent don't stay subscribed.
+    """
+    if isinstance(events, Broadcaster):
+        events = events.subscribe(last_event_id)
+    if isinstance(events, Subscription):
+        try:
+            if retry is not None:
+                yield ServerSentEvent(retry=retry).encode()
+            while True:
+                try:
+                    event = await events.get(ping_interval or None)
+                except StopAsyncIteration:
+                    break
+                yield PING if event is None else event.encode(dumps)
+        finally:
+            events.close()
+        return
+    if retry is not None:
+        yield ServerSentEvent(retry=retry).encode()
+    iterator = iterate(events)
+    pending: Optional[asyncio.Future] = None
+    try:
+        if not ping_interval:
+            async for item in iterator:
+                yield _as_event(item).encode(dumps)
+            return
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(anext(iterator))
+            done, _ = await asyncio.wait((pending,), timeout=ping_interval)
+            if not done:
+                yield PING
+                continue
+            future, pending = pending, None
+            try:
+                item = future.result()
+            except StopAsyncIteration:
+                break
+            yield _as_event(item).encode(dumps)
+    finally:
+        if pending is not None and not pending.done():
+            pending.cancel()
+            await asyncio.wait((pending,))
+        await iterator.aclose() # type: ignore[attr-defined]
+
+class Subscription:
+    """
+    Events of a broadcaster for a single subscriber (async iterator).
+    Created with Broadcaster.subscribe, ends when it is closed or dropped.
+    """
+    __slots__ = ("_broadcaster", "_queue", "_waiter", "_closed", "_dropped")
+
+    def __init__(self, broadcaster: "Broadcaster"):
+        self._broadcaster = broadcaster
+        self._queue: deque[ServerSentEvent] = deque()
+        self._waiter: Optional[asyncio.Future] = None
+        self._closed: bool = False
+        self._dropped: bool = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def dropped(self) -> bool:
+        """If the subscriber was dropped because it didn't keep up"""
+        return self._dropped
+
+    @property
+    def pending(self) -> int:
+        """Number of queued events"""
+        return len(self._queue)
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> ServerSentEvent:
+        return await self.get() # type: ignore[return-value]
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[ServerSentEvent]:
+        """
+        Returns the next event or None if no event arrived within timeout seconds.
+        Raises StopAsyncIteration once the subscription is closed and its queue is empty.
+        """
+        if not self._queue:
+            if self._closed:
+                raise StopAsyncIteration
+            loop = asyncio.get_running_loop()
+            waiter = self._waiter = loop.create_future()
+            timer = loop.call_later(timeout, _wake, waiter) if timeout else None
+            try:
+                await waiter
+            finally:
+                self._waiter = None
+                if timer is not None:
+                    timer.cancel()
+            if not self._queue:
+                if self._closed:
+                    raise StopAsyncIteration
+                return None
+        return self._queue.popleft()
+
+    def _push(self, event: ServerSentEvent, max_size: int, overflow: str) -> bool:
+        """Queues the event, returns False if the subscriber has to be dropped"""
+        queue = self._queue
+        if len(queue) >= max_size:
+            if overflow == "drop":
+                return False
+            # coalesce: the newest event replaces queued events of the same name
+            for index, queued in enumerate(queue):
+                if queued.event == event.event:
+                    del queue[index]
+                    break
+            else:
+                queue.popleft()
+        queue.append(event)
+        self._wake()
+        return True
+
+    def _wake(self) -> None:
+        if self._waiter is not None:
+            _wake(self._waiter)
+
+    def close(self) -> None:
+        """Unsubscribes (queued events can still be received)"""
+        if self._closed:
+            return
+        self._closed = True
+        self._broadcaster._unsubscribe(self) #pylint: disable=W0212
+        self._wake()
+
+    async def aclose(self) -> None:
+        self.close()
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+class Broadcaster:
+    """
+    Fans events out to all subscribers. publish never blocks: every subscriber
+    has a bounded queue (queue_size) and subscribers which don't keep up are
+    dropped (overflow="drop", they reconnect and catch up from the replay buffer)
+    or their queued events are coalesced (overflow="coalesce", a new event replaces
+    a queued event with the same name, otherwise the oldest queued event is discarded).
+    The last replay_size events with an id are replayed to subscribers which
+    reconnect with a Last-Event-ID. Events get sequential ids unless auto_ids is False.
+    With a backplane (i.e. app.backplane) events are published to the broadcasters
+    with the same channel in all workers; automatic ids are then prefixed with
+    a random worker tag.
+    Must be used from the event loop thread.
+    """
+
+    def __init__(self, *, queue_size: int = 100, replay_size: int = 100,
+                 overflow: Literal["drop", "coalesce"] = "drop", auto_ids: bool = True,
+                 dumps: Optional[Callable[[Any], bytes]] = None,
+                 backplane: Optional["BaseBackplane"] = None, channel: Optional[str] = None):
+        if overflow not in ("drop", "coalesce"):
+            raise ValueError(f"Unknown overflow policy {overflow!r}, use 'drop' or 'coalesce'")
+        if backplane is not None and not channel:
+            raise ValueError("Broadcasters with a backplane need a channel name")
+        self._queue_size = queue_size
+        self._overflow = overflow
+        self._auto_ids = auto_ids
+        self._dumps = record_encoder(dumps) if dumps is not None else _default_dumps
+        self._replay: deque[ServerSentEvent] = deque(maxlen=replay_size)
+        self._subscribers: set[Subscription] = set()
+        self._last_id: int = 0
+        self._closed: bool = False
+        self._backplane = backplane
+        self._channel = f"sse:{channel}"
+        self._id_prefix: str = ""
+        if backplane is not None:
+            self._id_prefix = os.urandom(4).hex() + "."
+            # bound method stored once: the backplane skips the publishing handler
+            self._on_backplane_message: Callable[[bytes], None] = self._receive
+            backplane.subscribe(self._channel, self._on_backplane_message)
+
+    @property
+    def subscribers(self) -> int:
+        """Number of subscribers"""
+        return len(self._subscribers)
+
+    def publish(self, data: Any = None, *, event: Optional[str] = None,
+                id: Optional[str] = None, retry: Optional[int] = None) -> ServerSentEvent: #pylint: disable=W0622
+        """
+        Sends an event (a ServerSentEvent or its data) to all subscribers
+        (in all workers with a backplane). The event is encoded once for all of them.
+        """
+        sse = data if isinstance(data, ServerSentEvent) else ServerSentEvent(
+            data, event=event, id=id, retry=retry)
+        if sse.id is None and self._auto_ids:
+            self._last_id += 1
+            sse.id = f"{self._id_prefix}{self._last_id}"
+        frame = sse.encode(self._dumps)
+        self._deliver(sse)
+        if self._backplane is not None:
+            self._backplane.publish(self._channel, _pack_event(sse, frame),
+                                    source=self._on_backplane_message)
+        return sse
+
+    def _receive(self, payload: bytes) -> None:
+        """Delivers an event published in another worker"""
+        if not self._closed:
+            self._deliver(_unpack_event(payload))
+
+    def _deliver(self, sse: ServerSentEvent) -> None:
+        if sse.id is not None and self._replay.maxlen:
+            self._replay.append(sse)
+        dropped: list[Subscription] = []
+        for subscriber in self._subscribers:
+            if not subscriber._push(sse, self._queue_size, self._overflow): #pylint: disable=W0212
+                dropped.append(subscriber)
+        for subscriber in dropped:
+            subscriber._dropped = True #pylint: disable=W0212
+            subscriber.close()
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Subscription:
+        """
+        New subscription. Events published after last_event_id are replayed
+        if it is still in the replay buffer.
+        """
+        subscription = Subscription(self)
+        if self._closed:
+            subscription._closed = True #pylint: disable=W0212
+            return subscription
+        if last_event_id is not None:
+            replay = self._replay
+            for index in range(len(replay) - 1, -1, -1):
+                if replay[index].id == last_event_id:
+                    subscription._queue.extend(replay[i] for i in range(index + 1, len(replay))) #pylint: disable=W0212
+                    break
+        self._subscribers.add(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def close(self) -> None:
+        """Ends all subscriptions (i.e. on shutdown)"""
+        self._closed = True
+        if self._backplane is not None:
+            self._backplane.unsubscribe(self._channel, self._on_backplane_message)
+        for subscription in list(self._subscribers):
+            subscription.close()
+
+def _pack_event(sse: ServerSentEvent, frame: bytes) -> bytes:
+    event_id = sse.id.encode("utf-8") if sse.id is not None else b""
+    name = sse.event.encode("utf-8") if sse.event is not None else b""
+    return b"".join((
+        _BACKPLANE_HEADER.pack(_NONE_LENGTH if sse.id is None else len(event_id),
+                               _NONE_LENGTH if sse.event is None else len(name)),
+        event_id, name, frame))
+
+def _unpack_event(payload: bytes) -> ServerSentEvent:
+    id_length, name_length = _BACKPLANE_HEADER.unpack_from(payload)
+    offset = _BACKPLANE_HEADER.size
+    event_id: Optional[str] = None
+    name: Optional[str] = None
+    if id_length != _NONE_LENGTH:
+        event_id = payload[offset:offset + id_length].decode("utf-8")
+        offset += id_length
+    if name_length != _NONE_LENGTH:
+        name = payload[offset:offset + name_length].decode("utf-8")
+        offset += name_length
+    sse = ServerSentEvent(event=name, id=event_id)
+    # the frame was encoded by the publishing worker
+    sse._encoded = payload[offset:] #pylint: disable=W0212
+    return sse
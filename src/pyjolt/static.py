@@ -4,44 +4,64 @@ In production, static files should be served directly by a reverse proxy server
 as Nginx. This reverse proxy server approach is more efficient.
 """
 from __future__ import annotations
-import os
-import mimetypes
-from typing import TYPE_CHECKING
-from werkzeug.security import safe_join
+from typing import TYPE_CHECKING, Optional
 
 from .controller import Controller, get
-from .utilities import get_file, get_range_file
+from .utilities import get_range_file
 from .http_statuses import HttpStatus
+from .compression.codecs import negotiate_encoding
+from .file_response import FileSegment
 
 if TYPE_CHECKING:
     from .request import Request
     from .response import Response
+    from .static_cache import StaticFileCache, StaticFileEntry, StaticFileVariant
 
 class Static(Controller):
 
     @get("/<path:filename>")
     async def get(self, req: Request, filename: str) -> Response:
         """
-        Endpoint for static files with HTTP Range support,
-        falling back to get_file for full-content requests.
+        Endpoint for static files with HTTP Range support. File lookups
+        (path, stat, mimetype, validators) and small files are cached
+        in the application static file cache.
         """
-        # Checks if file exists
-        file_path = None
-        candidate = safe_join(req.app.static_files_path, filename)
-        if candidate and os.path.exists(candidate):
-            file_path = candidate
-        if not file_path:
+        cache: StaticFileCache = req.app.static_file_cache
+        entry: Optional[StaticFileEntry] = cache.lookup(filename)
+        if entry is None:
             return req.res.no_content().status(HttpStatus.NOT_FOUND)
 
-        # checks/guesses mimetype
-        guessed, _ = mimetypes.guess_type(file_path)
-        content_type = guessed or "application/octet-stream"
-
         # Checks range header and returns range if header is present
         range_header = req.headers.get("range")
-        if not range_header:
-            status, headers, body = await get_file(file_path, content_type=content_type)
-            headers["Accept-Ranges"] = "bytes"
-            return req.res.send_file(body, headers).status(status)
+        if range_header:
+            return await get_range_file(req.res, entry.file.path, range_header, entry.content_type)
+
+        res = req.res
+        variant: StaticFileVariant = entry.file
+        if entry.encodings:
+            # precompressed siblings (.br, .zst, .gz) are picked by Accept-Encoding
+            res.headers["vary"] = "Accept-Encoding"
+            accept_encoding = req.headers.get("accept-encoding")
+            encoding = negotiate_encoding(accept_encoding, entry.encodings) if accept_encoding else None
+            if encoding is not None:
+                variant = entry.variants[encoding]
+                res.headers["content-encoding"] = encoding
+
+        headers = res.headers
+        headers["content-type"] = entry.content_type
+        headers["accept-ranges"] = "bytes"
+        headers["etag"] = variant.etag
+        headers["last-modified"] = entry.last_modified
+        if entry.cache_control is not None:
+            headers["cache-control"] = entry.cache_control
+        if res.check_preconditions():
+            return res
 
-        return await get_range_file(req.res, file_path, range_header, content_type)
+        data = await cache.read(variant)
+        if data is None:
+            # large files are streamed from disk
+            headers["content-length"] = str(variant.size)
+            return res.set_zero_copy(FileSegment(file_path=variant.path, start=0,
+                                                 length=variant.size)).status(HttpStatus.OK)
+        res.body = data
+        return res.status(HttpStatus.OK)
@@ -0,0 +1,199 @@
+"""
+Static file cache.
+Memoizes resolved paths, stat results, mimetypes, validators and precompressed
+(.br/.gz/.zst) siblings of static files and keeps small files in memory
+(within a byte budget). Entries are revalidated by mtime, at most once per
+check interval, or never in immutable mode.
+"""
+import os
+import re
+import time
+import mimetypes
+from collections import OrderedDict
+from typing import Optional
+
+from werkzeug.security import safe_join
+
+from .executors import executors
+from .conditional.validators import http_date
+from .file_response import file_etag
+
+#: precompressed sibling suffixes (content-encoding -> file suffix)
+PRECOMPRESSED_SUFFIXES: dict[str, str] = {"br": ".br", "zstd": ".zst", "gzip": ".gz"}
+
+#: file names with a content hash (app.3f2a9c1b.js, app-3f2a9c1b.css)
+DEFAULT_FINGERPRINT_PATTERN: str = r"[.-][0-9a-fA-F]{8,}\.[A-Za-z0-9]+$"
+
+class StaticFileVariant:
+    """A file on disk (the original or a precompressed sibling)"""
+    __slots__ = ("path", "size", "mtime_ns", "etag", "data")
+
+    def __init__(self, path: str, stat: os.stat_result, etag_suffix: str = ""):
+        self.path = path
+        self.size: int = stat.st_size
+        self.mtime_ns: int = stat.st_mtime_ns
+        self.etag: str = file_etag(stat, etag_suffix)
+        #: file content if the file is kept in memory
+        self.data: Optional[bytes] = None
+
+class StaticFileEntry:
+    """Cached information about a static file"""
+    __slots__ = ("file", "content_type", "last_modified", "cache_control",
+                 "variants", "encodings", "checked_at")
+
+    def __init__(self, file: StaticFileVariant, content_type: str,
+                 cache_control: Optional[str], variants: dict[str, StaticFileVariant]):
+        self.file = file
+        self.content_type = content_type
+        self.last_modified: str = http_date(file.mtime_ns / 1e9)
+        self.cache_control = cache_control
+        #: content-encoding -> precompressed sibling
+        self.variants = variants
+        self.encodings: tuple[str, ...] = tuple(variants)
+        self.checked_at: float = time.monotonic()
+
+class StaticFileCache:
+    """
+    Cache of static files below the root directory.
+    Files up to max_file_size bytes are kept in memory while the total
+    stays within max_bytes (least recently used files are dropped first).
+    """
+
+    def __init__(self, root: str, max_bytes: int = 32 * 1024 * 1024,
+                 max_file_size: int = 256 * 1024, max_entries: int = 4096,
+                 immutable: bool = False, check_interval: float = 1.0,
+                 max_age: Optional[int] = None, fingerprint_max_age: int = 31536000,
+                 fingerprint_pattern: Optional[str] = DEFAULT_FINGERPRINT_PATTERN):
+        self._root = root
+        self._max_bytes = max_bytes
+        self._max_file_size = max_file_size
+        self._max_entries = max_entries
+        self._immutable = immutable
+        self._check_interval = check_interval
+        self._max_age = max_age
+        self._fingerprint_max_age = fingerprint_max_age
+        self._fingerprint = re.compile(fingerprint_pattern) if fingerprint_pattern else None
+        self._entries: OrderedDict[str, StaticFileEntry] = OrderedDict()
+        # variants whose data is in memory (LRU order)
+        self._in_memory: OrderedDict[int, StaticFileVariant] = OrderedDict()
+        self._memory_bytes: int = 0
+
+    def lookup(self, filename: str) -> Optional[StaticFileEntry]:
+        """
+        Returns the entry of the file (None if it doesn't exist).
+        Entries are revalidated by mtime unless the cache is immutable.
+        """
+        entry = self._entries.get(filename)
+        if entry is not None:
+            if self._immutable or time.monotonic() - entry.checked_at < self._check_interval:
+                self._entries.move_to_end(filename)
+                return entry
+            if self._is_current(entry):
+                entry.checked_at = time.monotonic()
+                self._entries.move_to_end(filename)
+                return entry
+            self._drop(filename)
+        entry = self._load(filename)
+        if entry is not None:
+            self._entries[filename] = entry
+            if len(self._entries) > self._max_entries:
+                oldest, _ = next(iter(self._entries.items()))
+                self._drop(oldest)
+        return entry
+
+    def _is_current(self, entry: StaticFileEntry) -> bool:
+        for variant in (entry.file, *entry.variants.values()):
+            try:
+                stat = os.stat(variant.path)
+            except OSError:
+                return False
+            if stat.st_mtime_ns != variant.mtime_ns or stat.st_size != variant.size:
+                return False
+        # a new precompressed sibling was added
+        for encoding, suffix in PRECOMPRESSED_SUFFIXES.items():
+            if encoding not in entry.variants and os.path.isfile(entry.file.path + suffix):
+                return False
+        return True
+
+    def _load(self, filename: str) -> Optional[StaticFileEntry]:
+        path = safe_join(self._root, filename)
+        if not path:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if not os.path.isfile(path):
+            return None
+        guessed, _ = mimetypes.guess_type(path)
+        variants: dict[str, StaticFileVariant] = {}
+        for encoding, suffix in PRECOMPRESSED_SUFFIXES.items():
+            try:
+                variant_stat = os.stat(path + suffix)
+            except OSError:
+                continue
+            variants[encoding] = StaticFileVariant(path + suffix, variant_stat, f"-{encoding}")
+        return StaticFileEntry(StaticFileVariant(path, stat), guessed or "application/octet-stream",
+                               self._cache_control(filename), variants)
+
+    def _cache_control(self, filename: str) -> Optional[str]:
+        if self._fingerprint is not None and self._fingerprint.search(filename):
+            return f"public, max-age={self._fingerprint_max_age}, immutable"
+        if self._max_age is not None:
+            return f"public, max-age={self._max_age}"
+        return None
+
+    async def read(self, variant: StaticFileVariant) -> Optional[bytes]:
+        """
+        Content of a small file (from memory or read and kept in memory).
+        Returns None for files which are too large to be kept in memory.
+        """
+        if variant.data is not None:
+            self._in_memory.move_to_end(id(variant))
+            return variant.data
+        if variant.size > self._max_file_size or variant.size > self._max_bytes:
+            return None
+        data: bytes = await executors.run(_read_file, variant.path)
+        if len(data) != variant.size:
+            # changed while reading
+            return data
+        if variant.data is not None:
+            # a concurrent read already stored the file (counted once)
+            return variant.data
+        variant.data = data
+        self._in_memory[id(variant)] = variant
+        self._memory_bytes += variant.size
+        while self._memory_bytes > self._max_bytes:
+            _, evicted = self._in_memory.popitem(last=False)
+            self._release(evicted)
+        return data
+
+    def _release(self, variant: StaticFileVariant) -> None:
+        if variant.data is not None:
+            self._memory_bytes -= variant.size
+            variant.data = None
+
+    def _drop(self, filename: str) -> None:
+        entry = self._entries.pop(filename, None)
+        if entry is None:
+            return
+        for variant in (entry.file, *entry.variants.values()):
+            if self._in_memory.pop(id(variant), None) is not None:
+                self._release(variant)
+
+    def clear(self) -> None:
+        """Drops all entries"""
+        for filename in list(self._entries):
+            self._drop(filename)
+
+    def stats(self) -> dict[str, int]:
+        """Number of cached entries, files in memory and their total size"""
+        return {
+            "entries": len(self._entries),
+            "files_in_memory": len(self._in_memory),
+            "memory_bytes": self._memory_bytes,
+        }
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as file:
+        return file.read()
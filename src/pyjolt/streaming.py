@@ -0,0 +1,150 @@
+"""
+Streamed response bodies.
+Normalizes the chunks of response streams, coalesces small chunks into
+larger ASGI messages and encodes streams of records as newline delimited
+json or as a json array.
+"""
+import asyncio
+from collections.abc import AsyncIterable, Iterable
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Optional
+
+from pydantic import BaseModel
+
+Chunk = bytes | bytearray | memoryview
+
+async def iterate(iterable: AsyncIterable[Any] | Iterable[Any]) -> AsyncIterator[Any]:
+    """
+    Iterates a sync or async iterable asynchronously.
+    The iterable (generator) is closed when the iterator is closed.
+    """
+    try:
+        if hasattr(iterable, "__aiter__"):
+            async for item in iterable: # type: ignore[union-attr]
+                yield item
+        else:
+            for item in iterable: # type: ignore[union-attr]
+                yield item
+    finally:
+        await close_stream(iterable)
+
+async def iterate_chunks(iterable: AsyncIterable[Any] | Iterable[Any]) -> AsyncGenerator[Chunk, None]:
+    """
+    Iterates the chunks of a response stream. bytes, bytearray and memoryview
+    chunks are passed on as they are, str chunks are encoded to UTF-8.
+    """
+    async for chunk in iterate(iterable):
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            yield chunk
+        elif isinstance(chunk, str):
+            yield chunk.encode("utf-8")
+        else:
+            raise TypeError(
+                f"Streaming chunks must be bytes, bytearray, memoryview or str, got {type(chunk)!r}"
+            )
+
+def as_bytes(chunk: Chunk) -> bytes:
+    """The chunk as bytes (ASGI message bodies must be bytes), copies only if it isn't"""
+    return chunk if isinstance(chunk, bytes) else bytes(chunk)
+
+def _join(parts: list[Chunk]) -> bytes:
+    return as_bytes(parts[0]) if len(parts) == 1 else b"".join(parts)
+
+async def coalesce_chunks(chunks: AsyncIterable[Chunk], max_size: int,
+                          flush_interval: Optional[float] = None) -> AsyncGenerator[bytes, None]:
+    """
+    Joins small chunks into chunks of about max_size bytes (chunks of at least
+    max_size bytes are passed on without copying). Buffered data is flushed
+    when it reaches max_size, when the stream ends, or flush_interval seconds
+    after the first buffered chunk if the stream didn't produce enough data by then
+    (never if flush_interval is None, i.e. for bulk downloads).
+    """
+    loop = asyncio.get_running_loop()
+    iterator = chunks.__aiter__()
+    parts: list[Chunk] = []
+    buffered: int = 0
+    deadline: float = 0.0
+    # next chunk, while waiting for it with a timeout
+    pending: Optional[asyncio.Future] = None
+    try:
+        while True:
+            try:
+                if parts and flush_interval:
+                    timeout = deadline - loop.time()
+                    if timeout > 0:
+                        if pending is None:
+                            pending = asyncio.ensure_future(anext(iterator))
+                        await asyncio.wait((pending,), timeout=timeout)
+                    if pending is None or not pending.done():
+                        yield _join(parts)
+                        parts = []
+                        buffered = 0
+                        continue
+                if pending is not None:
+                    future, pending = pending, None
+                    chunk = await future
+                else:
+                    chunk = await anext(iterator)
+            except StopAsyncIteration:
+                break
+            size = chunk.nbytes if isinstance(chunk, memoryview) else len(chunk)
+            if not size:
+                continue
+            if not parts:
+                if size >= max_size:
+                    yield as_bytes(chunk)
+                    continue
+                if flush_interval:
+                    deadline = loop.time() + flush_interval
+            parts.append(chunk)
+            buffered += size
+            if buffered >= max_size:
+                yield _join(parts)
+                parts = []
+                buffered = 0
+        if parts:
+            yield _join(parts)
+    finally:
+        if pending is not None and not pending.done():
+            pending.cancel()
+            await asyncio.wait((pending,))
+        await close_stream(chunks)
+
+async def close_stream(iterable: Any) -> None:
+    """Closes a stream which won't be (completely) sent (async/sync generators)"""
+    if iterable is None:
+        return
+    aclose = getattr(iterable, "aclose", None)
+    if aclose is not None:
+        await aclose()
+        return
+    close = getattr(iterable, "close", None)
+    if close is not None:
+        close()
+
+def record_encoder(dumps: Callable[[Any], bytes]) -> Callable[[Any], bytes]:
+    """
+    Encoder of stream records: pydantic models are serialized with their own
+    serializer, everything else with dumps (the json codec of the app).
+    """
+    def encode(record: Any) -> bytes:
+        if isinstance(record, BaseModel):
+            return record.__pydantic_serializer__.to_json(record)
+        return dumps(record)
+    return encode
+
+async def encode_ndjson(records: AsyncIterable[Any] | Iterable[Any],
+                        dumps: Callable[[Any], bytes]) -> AsyncIterator[bytes]:
+    """Encodes records as newline delimited json (one line per record)"""
+    encode = record_encoder(dumps)
+    async for record in iterate(records):
+        yield encode(record) + b"\n"
+
+async def encode_json_array(records: AsyncIterable[Any] | Iterable[Any],
+                            dumps: Callable[[Any], bytes]) -> AsyncIterator[bytes]:
+    """Encodes records as the elements of a json array"""
+    encode = record_encoder(dumps)
+    separator: bytes = b"["
+    async for record in iterate(records):
+        yield separator + encode(record)
+        separator = b","
+    yield b"[]" if separator == b"[" else b"]"
@@ -49,6 +49,9 @@ class PyJoltTestClient:
     async def get(self, path: str, **kwargs):
         return await self.request("GET", path, **kwargs)
 
+    async def head(self, path: str, **kwargs):
+        return await self.request("HEAD", path, **kwargs)
+
     async def post(self, path: str, **kwargs):
         return await self.request("POST", path, **kwargs)
 
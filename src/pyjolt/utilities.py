@@ -12,11 +12,13 @@ import sys
 from pathlib import Path
 from base64 import b64decode
 from asyncio import Future, Task
-from typing import Any, Callable, Optional
+from typing import Any, Awaitable, Callable, Optional, cast
 
 import aiofiles
 
 from .exceptions import StaticAssetNotFound
+from .executors import executors
+from .file_response import prepare_file_response
 
 def to_kebab_case(text: str) -> str:
     """Convert a string into lower-kebab-case."""
@@ -71,17 +73,35 @@ def get_app_root_path(import_name: str) -> str:
 async def run_sync_or_async(func: Callable, *args, **kwargs):
     """
     Support for sync or async methods
-    Runs async method directly or a sync method in a threadpool
+    Runs async method directly or a sync method in the default executor pool
     """
     if inspect.iscoroutinefunction(func):
         return await func(*args, **kwargs)
 
     loop = asyncio.get_running_loop()
     return await loop.run_in_executor(
-        None,
+        executors.get(),
         lambda: func(*args, **kwargs)
     )
 
+def ensure_async(func: Callable) -> Callable[..., Awaitable[Any]]:
+    """
+    Resolves the sync/async decision once (instead of on every call like run_sync_or_async).
+    Async callables are returned as they are, sync callables are wrapped
+    to run in the default executor pool.
+    """
+    # instances with an async __call__ (cast: mypy doesn't allow accessing __call__ of a Callable)
+    if inspect.iscoroutinefunction(func) or inspect.iscoroutinefunction(cast(Any, func).__call__):
+        return func
+
+    async def _run_in_executor(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executors.get(),
+            lambda: func(*args, **kwargs)
+        )
+    return _run_in_executor
+
 def run_in_background(func: Callable[..., Any], *args, **kwargs) -> Task|Future:
     """
     Fire-and-forget a function (async or sync) without awaiting its result.
@@ -97,7 +117,7 @@ def run_in_background(func: Callable[..., Any], *args, **kwargs) -> Task|Future:
         return loop.create_task(func(*args, **kwargs))
 
     # If it's a sync function, run it in the default thread pool executor
-    return loop.run_in_executor(None, func, *args, **kwargs)
+    return loop.run_in_executor(executors.get(), lambda: func(*args, **kwargs))
 
 async def get_file(path: str, filename: Optional[str] = None, content_type: Optional[str] = None):
     """
@@ -106,6 +126,8 @@ async def get_file(path: str, filename: Optional[str] = None, content_type: Opti
     - `content_type` is optional (guess using `mimetypes` if not provided).
     
     Returns a tuple (status_code, headers, body_bytes).
+    The whole file is read into memory. Use req.res.send_file(path) to send
+    files without reading them.
     """
 
     # Guess the MIME type if none is provided
@@ -129,41 +151,16 @@ async def get_file(path: str, filename: Optional[str] = None, content_type: Opti
     return 200, headers, data
 
 async def get_range_file(res, file_path: str, range_header: str, content_type: str):
-    """Returns a ranged response. Useful for large static files, video streaming etc."""
-    total = os.path.getsize(file_path)
-    m = re.match(r"bytes=(\d+)-(\d*)", range_header)
-    if not m:
-        start, end, status = 0, total - 1, 200
-    else:
-        start = int(m.group(1))
-        end   = int(m.group(2)) if m.group(2) else total - 1
-        end   = min(end, total - 1)
-        if start > end:
-            raise StaticAssetNotFound()
-        status = 206
-
-    length = end - start + 1
-    headers = {
-        "Content-Type":   content_type,
-        "Accept-Ranges":  "bytes",
-        "Content-Length": str(length),
-        "Cache-Control":  "public, max-age=300",
-        "ETag": f'"{os.path.getmtime(file_path):.0f}-{length}"'
-    }
-    if status == 206:
-        headers["Content-Range"] = f"bytes {start}-{end}/{total}"
-
-    # **Don’t** read the bytes here.  Just stash info on `res`.  
-    res.status(status)
-    # merge headers onto res.headers
-    res.headers.update(headers)
-    # mark zero-copy parameters
-    res.set_zero_copy({
-        "file_path": file_path,
-        "start":      start,
-        "length":     length
-    })
-    return res
+    """
+    Returns a ranged response. Useful for large static files, video streaming etc.
+    The file isn't read here, it is sent by the application (see file_response).
+    """
+    try:
+        return prepare_file_response(res, file_path, content_type=content_type,
+                                     range_header=range_header)
+    except FileNotFoundError:
+        # pylint: disable-next=W0707,E0710
+        raise StaticAssetNotFound()
 
 def base64_to_bytes(b64_string: str) -> bytes:
     """Turns base64 string to bytes"""
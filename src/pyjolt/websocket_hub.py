@@ -0,0 +1,400 @@
+"""
+Websocket hub.
+Registry of websocket connections with named rooms. Every connection has a
+bounded outbound queue which is sent by its own writer task, so sending and
+broadcasting never wait for slow clients. Broadcast messages are encoded once
+and the same ASGI message is queued for all recipients. With a backplane,
+broadcasts reach the connections of all workers.
+"""
+import struct
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Iterable, Literal, Optional, TYPE_CHECKING
+
+from .json_codec import get_json_codec
+from .streaming import record_encoder
+
+if TYPE_CHECKING:
+    from .request import Request
+    from .backplane import BaseBackplane
+
+OverflowPolicy = Literal["drop_oldest", "disconnect"]
+
+#: close code for connections dropped by the disconnect policy (try again later)
+SLOW_CONSUMER_CLOSE_CODE: int = 1013
+
+# backplane payload: flags, room length, room (utf-8) and the message text (utf-8) or bytes
+_BACKPLANE_HEADER = struct.Struct("!BH")
+_BINARY = 1
+_HAS_ROOM = 2
+
+class WebSocketConnection:
+    """
+    A websocket connection registered with a hub (see WebSocketHub.connect).
+    Use it as an async context manager: the connection is accepted and its writer
+    started on enter, queued messages are sent and the connection closed on exit.
+    """
+    __slots__ = ("_hub", "_req", "_rooms", "_queue", "_waiter", "_writer",
+                 "_closing", "_close_code", "_close_reason", "_disconnected",
+                 "_sent", "_dropped", "state")
+
+    def __init__(self, hub: "WebSocketHub", req: "Request", rooms: Iterable[str] = ()):
+        self._hub = hub
+        self._req = req
+        self._rooms: set[str] = set(rooms)
+        self._queue: deque[dict] = deque()
+        self._waiter: Optional[asyncio.Future] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._closing: bool = False
+        self._close_code: int = 1000
+        self._close_reason: str = ""
+        self._disconnected: bool = False
+        self._sent: int = 0
+        self._dropped: int = 0
+        #: free slot for application state (user id etc.)
+        self.state: Any = None
+
+    @property
+    def request(self) -> "Request":
+        return self._req
+
+    @property
+    def rooms(self) -> frozenset[str]:
+        return frozenset(self._rooms)
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of queued outbound messages"""
+        return len(self._queue)
+
+    @property
+    def sent(self) -> int:
+        """Number of sent messages"""
+        return self._sent
+
+    @property
+    def dropped(self) -> int:
+        """Number of messages dropped by the drop_oldest policy"""
+        return self._dropped
+
+    @property
+    def closed(self) -> bool:
+        """If the connection is closing/closed (nothing can be sent anymore)"""
+        return self._closing or self._disconnected
+
+    async def __aenter__(self) -> "WebSocketConnection":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            # the application closes the connection (code 1011)
+            self._disconnected = True
+        await self.close()
+
+    async def start(self) -> None:
+        """Accepts the connection, registers it and starts its writer"""
+        await self._req.accept()
+        self._hub._register(self) #pylint: disable=W0212
+        self._writer = asyncio.ensure_future(self._write())
+
+    def join(self, room: str) -> None:
+        self._rooms.add(room)
+        self._hub._join(self, room) #pylint: disable=W0212
+
+    def leave(self, room: str) -> None:
+        self._rooms.discard(room)
+        self._hub._leave(self, room) #pylint: disable=W0212
+
+    def send(self, data: Any) -> bool:
+        """
+        Queues a message (str: text, bytes: binary, anything else: json text).
+        Never waits, returns False if the connection is closed.
+        """
+        return self.send_message(self._hub.encode(data))
+
+    def send_message(self, message: dict) -> bool:
+        """Queues an ASGI websocket.send message (i.e. from WebSocketHub.encode)"""
+        if self._closing or self._disconnected:
+            return False
+        queue = self._queue
+        if len(queue) >= self._hub.queue_size:
+            if self._hub.overflow == "disconnect":
+                queue.clear()
+                self._hub._slow_disconnects += 1 #pylint: disable=W0212
+                self._begin_close(SLOW_CONSUMER_CLOSE_CODE, "Send queue overflow")
+                return False
+            queue.popleft()
+            self._dropped += 1
+        queue.append(message)
+        self._wake()
+        return True
+
+    async def receive(self) -> Optional[str | bytes]:
+        """Next text/binary message, None once the client disconnected"""
+        while True:
+            message = await self._req.receive()
+            if message["type"] == "websocket.receive":
+                text = message.get("text")
+                return text if text is not None else message.get("bytes", b"")
+            if message["type"] == "websocket.disconnect":
+                self._disconnected = True
+                self._wake()
+                return None
+
+    async def receive_json(self) -> Any:
+        """Next message parsed as json, None once the client disconnected"""
+        data = await self.receive()
+        if data is None:
+            return None
+        return self._req.app.json_codec.loads(data)
+
+    def __aiter__(self) -> AsyncIterator[str | bytes]:
+        return self._iter_messages()
+
+    async def _iter_messages(self) -> AsyncIterator[str | bytes]:
+        while True:
+            data = await self.receive()
+            if data is None:
+                return
+            yield data
+
+    async def close(self, code: int = 1000, reason: str = "",
+                    timeout: Optional[float] = 5.0) -> None:
+        """
+        Sends the queued messages (within timeout seconds), closes
+        the connection and unregisters it.
+        """
+        self._begin_close(code, reason)
+        writer = self._writer
+        if writer is not None:
+            if self._disconnected:
+                writer.cancel()
+            try:
+                await asyncio.wait((writer,), timeout=timeout)
+            finally:
+                if not writer.done():
+                    writer.cancel()
+        self._hub._unregister(self) #pylint: disable=W0212
+
+    def _begin_close(self, code: int, reason: str) -> None:
+        if self._closing:
+            return
+        self._closing = True
+        self._close_code = code
+        self._close_reason = reason
+        self._hub._unregister(self) #pylint: disable=W0212
+        self._wake()
+
+    def _wake(self) -> None:
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def _write(self) -> None:
+        send = self._req.send
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        try:
+            while not self._disconnected:
+                if queue:
+                    await send(queue.popleft())
+                    self._sent += 1
+                    continue
+                if self._closing:
+                    await send({"type": "websocket.close", "code": self._close_code,
+                                "reason": self._close_reason})
+                    return
+                self._waiter = loop.create_future()
+                try:
+                    await self._waiter
+                finally:
+                    self._waiter = None
+        # pylint: disable-next=W0718
+        except Exception:
+            # the client is gone
+            self._disconnected = True
+            queue.clear()
+            self._hub._unregister(self) #pylint: disable=W0212
+
+    def __repr__(self) -> str:
+        return (f"<WebSocketConnection path={self._req.path!r} rooms={sorted(self._rooms)} "
+                f"queue_depth={len(self._queue)}>")
+
+class WebSocketHub:
+    """
+    Registry of websocket connections and rooms.
+    Outbound messages are queued per connection (queue_size). If the queue of a
+    slow client is full the oldest message is dropped (overflow="drop_oldest")
+    or the connection is closed (overflow="disconnect", close code 1013).
+    With a backplane (i.e. app.backplane) broadcasts are also delivered by the
+    hubs with the same channel in all other workers.
+    Must be used from the event loop thread.
+    """
+
+    def __init__(self, *, queue_size: int = 100, overflow: OverflowPolicy = "drop_oldest",
+                 dumps: Optional[Callable[[Any], bytes]] = None,
+                 backplane: Optional["BaseBackplane"] = None, channel: str = "default"):
+        if overflow not in ("drop_oldest", "disconnect"):
+            raise ValueError(f"Unknown overflow policy {overflow!r}, use 'drop_oldest' or 'disconnect'")
+        self._queue_size = queue_size
+        self._overflow = overflow
+        self._dumps = record_encoder(dumps or get_json_codec("stdlib").dumps)
+        self._connections: set[WebSocketConnection] = set()
+        self._rooms: dict[str, set[WebSocketConnection]] = {}
+        # messages broadcast per room
+        self._room_messages: dict[str, int] = {}
+        self._slow_disconnects: int = 0
+        self._backplane = backplane
+        self._channel = f"ws:{channel}"
+        if backplane is not None:
+            # bound method stored once: the backplane skips the publishing handler
+            self._on_backplane_message: Callable[[bytes], None] = self._receive
+            backplane.subscribe(self._channel, self._on_backplane_message)
+
+    @property
+    def queue_size(self) -> int:
+        return self._queue_size
+
+    @property
+    def overflow(self) -> OverflowPolicy:
+        return self._overflow
+
+    @property
+    def connections(self) -> frozenset[WebSocketConnection]:
+        return frozenset(self._connections)
+
+    def connect(self, req: "Request", rooms: Iterable[str] = ()) -> WebSocketConnection:
+        """
+        Connection for the websocket request, joined to rooms.
+        ```
+        async with hub.connect(req, rooms=["lobby"]) as conn:
+            async for message in conn:
+                hub.broadcast(message, room="lobby")
+        ```
+        """
+        return WebSocketConnection(self, req, rooms)
+
+    def encode(self, data: Any) -> dict:
+        """ASGI message for data (str: text, bytes: binary, anything else: json text)"""
+        if isinstance(data, str):
+            return {"type": "websocket.send", "text": data}
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            return {"type": "websocket.send", "bytes": bytes(data)}
+        return {"type": "websocket.send", "text": self._dumps(data).decode("utf-8")}
+
+    def broadcast(self, data: Any, room: Optional[str] = None, *,
+                  exclude: Optional[WebSocketConnection] = None) -> int:
+        """
+        Queues data for all connections (of the room), in all workers with
+        a backplane. The message is encoded once for all recipients.
+        Returns the number of recipients in this worker.
+        """
+        message = self.encode(data)
+        if self._backplane is not None:
+            self._backplane.publish(self._channel, _pack_message(message, room),
+                                    source=self._on_backplane_message)
+        return self._deliver(message, room, exclude)
+
+    def _receive(self, payload: bytes) -> None:
+        """Delivers a message broadcast in another worker"""
+        message, room = _unpack_message(payload)
+        self._deliver(message, room, None)
+
+    def _deliver(self, message: dict, room: Optional[str],
+                 exclude: Optional[WebSocketConnection]) -> int:
+        if room is None:
+            recipients: Iterable[WebSocketConnection] = self._connections
+        else:
+            recipients = self._rooms.get(room, ())
+            if recipients:
+                self._room_messages[room] = self._room_messages.get(room, 0) + 1
+        count = 0
+        # connections may unregister (overflow) while sending
+        for connection in tuple(recipients):
+            if connection is not exclude and connection.send_message(message):
+                count += 1
+        return count
+
+    def room(self, room: str) -> frozenset[WebSocketConnection]:
+        """Connections in the room"""
+        return frozenset(self._rooms.get(room, ()))
+
+    def rooms(self) -> dict[str, int]:
+        """Rooms with their number of connections"""
+        return {name: len(members) for name, members in self._rooms.items()}
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Counters for capacity planning: connections, queued messages, the
+        deepest queue, dropped messages, slow consumers which were disconnected
+        and per room connections, broadcast messages and queued messages.
+        """
+        depths = [connection.queue_depth for connection in self._connections]
+        return {
+            "connections": len(self._connections),
+            "queued_messages": sum(depths),
+            "max_queue_depth": max(depths, default=0),
+            "dropped_messages": sum(connection.dropped for connection in self._connections),
+            "slow_disconnects": self._slow_disconnects,
+            "rooms": {
+                name: {
+                    "connections": len(members),
+                    "messages": self._room_messages.get(name, 0),
+                    "queued_messages": sum(connection.queue_depth for connection in members),
+                }
+                for name, members in self._rooms.items()
+            },
+        }
+
+    async def close_all(self, code: int = 1001, reason: str = "") -> None:
+        """Closes all connections (i.e. on shutdown, 1001: going away)"""
+        connections = tuple(self._connections)
+        await asyncio.gather(*(connection.close(code, reason) for connection in connections),
+                             return_exceptions=True)
+
+    def _register(self, connection: WebSocketConnection) -> None:
+        self._connections.add(connection)
+        for room in connection.rooms:
+            self._join(connection, room)
+
+    def _unregister(self, connection: WebSocketConnection) -> None:
+        if connection not in self._connections:
+            return
+        self._connections.discard(connection)
+        for room in connection.rooms:
+            self._leave(connection, room)
+
+    def _join(self, connection: WebSocketConnection, room: str) -> None:
+        if connection in self._connections:
+            self._rooms.setdefault(room, set()).add(connection)
+
+    def _leave(self, connection: WebSocketConnection, room: str) -> None:
+        members = self._rooms.get(room)
+        if members is None:
+            return
+        members.discard(connection)
+        if not members:
+            del self._rooms[room]
+            self._room_messages.pop(room, None)
+
+def _pack_message(message: dict, room: Optional[str]) -> bytes:
+    text: Optional[str] = message.get("text")
+    data: bytes = text.encode("utf-8") if text is not None else message["bytes"]
+    flags = 0 if text is not None else _BINARY
+    encoded_room = b""
+    if room is not None:
+        flags |= _HAS_ROOM
+        encoded_room = room.encode("utf-8")
+    return b"".join((_BACKPLANE_HEADER.pack(flags, len(encoded_room)), encoded_room, data))
+
+def _unpack_message(payload: bytes) -> tuple[dict, Optional[str]]:
+    flags, room_length = _BACKPLANE_HEADER.unpack_from(payload)
+    offset = _BACKPLANE_HEADER.size
+    room: Optional[str] = None
+    if flags & _HAS_ROOM:
+        room = payload[offset:offset + room_length].decode("utf-8")
+    data = payload[offset + room_length:]
+    if flags & _BINARY:
+        return {"type": "websocket.send", "bytes": data}, room
+    return {"type": "websocket.send", "text": data.decode("utf-8")}, room